@@ -0,0 +1,312 @@
+"""Asyncio variant of arcor2.rest.
+
+Requests are made directly on the event loop (no thread pool is involved),
+so there might be many outstanding requests at the same time. Connections
+are kept alive and reused.
+"""
+
+import asyncio
+import json
+import os
+import weakref
+from io import BytesIO
+from typing import Dict, List, Type, overload
+
+import aiohttp
+
+from arcor2.rest import (
+    CHUNK_SIZE,
+    DataClass,
+    Method,
+    OptBody,
+    OptCache,
+    OptFiles,
+    OptParams,
+    OptTimeout,
+    Primitive,
+    ResponseCache,
+    RestException,
+    ReturnType,
+    ReturnValue,
+    Timeout,
+    check_call_args,
+    exception_from_content,
+    headers,
+    logger,
+    prepare_body,
+    prepare_params,
+    replaced_file,
+    value_from_json,
+)
+
+# max. number of simultaneous connections per host, further requests wait for a free connection
+limit_per_host: int = int(os.getenv("ARCOR2_AIO_REST_LIMIT_PER_HOST", 100))
+
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+def _session() -> aiohttp.ClientSession:
+    """Returns session for the running event loop."""
+
+    loop = asyncio.get_event_loop()
+
+    try:
+        session = _sessions[loop]
+    except KeyError:
+        pass
+    else:
+        if not session.closed:
+            return session
+
+    session = _sessions[loop] = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=0, limit_per_host=limit_per_host)
+    )
+    return session
+
+
+def _query_params(params: Dict[str, Primitive]) -> Dict[str, str]:
+    """aiohttp accepts only str, int and float values, so values are
+    converted the same way requests does it (e.g. True -> "True")."""
+
+    return {key: str(value) for key, value in params.items()}
+
+
+async def close() -> None:
+    """Closes the session (connections) of the running event loop."""
+
+    session = _sessions.pop(asyncio.get_event_loop(), None)
+
+    if session:
+        await session.close()
+
+
+# overload for no return
+@overload
+async def call(
+    method: Method,
+    url: str,
+    *,
+    body: OptBody = None,
+    params: OptParams = None,
+    files: OptFiles = None,
+    timeout: OptTimeout = None,
+    cache: OptCache = None,
+) -> None:
+    ...
+
+
+# single value-returning overloads
+@overload
+async def call(
+    method: Method,
+    url: str,
+    *,
+    return_type: Type[Primitive],
+    body: OptBody = None,
+    params: OptParams = None,
+    files: OptFiles = None,
+    timeout: OptTimeout = None,
+    cache: OptCache = None,
+) -> Primitive:
+    ...
+
+
+@overload
+async def call(
+    method: Method,
+    url: str,
+    *,
+    return_type: Type[DataClass],
+    body: OptBody = None,
+    params: OptParams = None,
+    files: OptFiles = None,
+    timeout: OptTimeout = None,
+    cache: OptCache = None,
+) -> DataClass:
+    ...
+
+
+@overload
+async def call(
+    method: Method,
+    url: str,
+    *,
+    return_type: Type[BytesIO],
+    body: OptBody = None,
+    params: OptParams = None,
+    files: OptFiles = None,
+    timeout: OptTimeout = None,
+    cache: OptCache = None,
+) -> BytesIO:
+    ...
+
+
+# list-returning overloads
+@overload
+async def call(
+    method: Method,
+    url: str,
+    *,
+    list_return_type: Type[Primitive],
+    body: OptBody = None,
+    params: OptParams = None,
+    files: OptFiles = None,
+    timeout: OptTimeout = None,
+    cache: OptCache = None,
+) -> List[Primitive]:
+    ...
+
+
+@overload
+async def call(
+    method: Method,
+    url: str,
+    *,
+    list_return_type: Type[DataClass],
+    body: OptBody = None,
+    params: OptParams = None,
+    files: OptFiles = None,
+    timeout: OptTimeout = None,
+    cache: OptCache = None,
+) -> List[DataClass]:
+    ...
+
+
+@overload
+async def call(
+    method: Method,
+    url: str,
+    *,
+    list_return_type: Type[BytesIO],
+    body: OptBody = None,
+    params: OptParams = None,
+    files: OptFiles = None,
+    timeout: OptTimeout = None,
+    cache: OptCache = None,
+) -> List[BytesIO]:
+    ...
+
+
+async def call(
+    method: Method,
+    url: str,
+    *,
+    return_type: ReturnType = None,
+    list_return_type: ReturnType = None,
+    body: OptBody = None,
+    params: OptParams = None,
+    files: OptFiles = None,
+    timeout: OptTimeout = None,
+    cache: OptCache = None,
+) -> ReturnValue:
+    """Universal coroutine for calling REST APIs. Same as rest.call.
+
+    :param method: HTTP method.
+    :param url: Resource address.
+    :param return_type: If set, function will try to return one value of a given type.
+    :param list_return_type: If set, function will try to return list of a given type.
+    :param body: Data to be send in the request body.
+    :param params: Path parameters.
+    :param files: Instead of body, it is possible to send files.
+    :param timeout: Specific timeout for a call.
+    :param cache: If set, response of GET request is cached and revalidated next time.
+    :return: Return value/type is given by return_type/list_return_type. If both are None, nothing will be returned.
+    """
+    logger.debug(
+        "%s %s, body: %s, params: %s, files: %s, timeout: %s", method, url, body, params, files is not None, timeout
+    )
+
+    check_call_args(body, files, return_type, list_return_type)
+
+    if return_type is None:
+        return_type = list_return_type
+
+    if timeout is None:
+        timeout = Timeout()
+
+    if method != Method.GET:
+        cache = None
+
+    prepared_params = prepare_params(params)
+    cache_key = ResponseCache.key(url, prepared_params) if cache else ""
+    cached = cache.lookup(cache_key) if cache else None
+
+    kwargs: Dict = {
+        "params": _query_params(prepared_params),
+        "timeout": aiohttp.ClientTimeout(sock_connect=timeout.connect, sock_read=timeout.read),
+    }
+
+    if files:
+        form = aiohttp.FormData()
+        for name, value in files.items():
+            form.add_field(name, value, filename=name)
+        kwargs["data"] = form
+    else:
+        kwargs["data"] = json.dumps(prepare_body(body))
+        kwargs["headers"] = {**headers, **cached.validators()} if cached else headers
+
+    try:
+        async with _session().request(method.value, url, **kwargs) as resp:
+            content = await resp.read()
+            status = resp.status
+            resp_headers = resp.headers
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.debug("Request failed.", exc_info=True)
+        raise RestException("Catastrophic system error.", str(e)) from e
+
+    if cache and cached and status == 304:
+        content = cache.hit(cached)
+    elif status >= 400:
+        raise exception_from_content(content)
+    elif cache:
+        cache.store(cache_key, resp_headers, content)
+
+    if return_type is None:
+        return None
+
+    if issubclass(return_type, BytesIO):
+
+        if list_return_type:
+            raise NotImplementedError
+
+        return BytesIO(content)
+
+    logger.debug("Response text: %r", content)
+
+    try:
+        resp_json = json.loads(content)
+    except ValueError as e:
+        logger.debug("Got invalid JSON in the response: %r", content)
+        raise RestException("Invalid JSON.") from e
+
+    return value_from_json(resp_json, return_type, list_return_type is not None)
+
+
+async def download(url: str, path: str, params: OptParams = None) -> None:
+    """Shortcut for saving a file to disk.
+
+    The body is written into the file as it arrives. The file is replaced
+    only once the whole body is received.
+    """
+
+    logger.debug("%s %s (streamed), params: %s", Method.GET, url, params)
+
+    timeout = Timeout()
+
+    try:
+        async with _session().get(
+            url,
+            params=_query_params(prepare_params(params)),
+            timeout=aiohttp.ClientTimeout(sock_connect=timeout.connect, sock_read=timeout.read),
+        ) as resp:
+
+            if resp.status >= 400:
+                raise exception_from_content(await resp.read())
+
+            with replaced_file(path) as file:
+                async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                    file.write(chunk)
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.debug("Request failed.", exc_info=True)
+        raise RestException("Catastrophic system error.", str(e)) from e
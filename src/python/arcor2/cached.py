@@ -1,7 +1,7 @@
 import copy
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, Iterator, List, Optional, Set, Tuple, ValuesView
+from typing import Dict, Generic, Iterator, List, Optional, Set, Tuple, TypeVar, ValuesView
 
 from arcor2.data import common as cmn
 from arcor2.exceptions import Arcor2Exception
@@ -11,6 +11,92 @@ if __debug__:
 
 # TODO cached ProjectFunction (actions from functions are totally ignored at the moment)
 
+V = TypeVar("V")
+S = TypeVar("S", bound="Items")
+
+
+@dataclass
+class Items(Generic[V]):
+    """Items of a cached scene/project with copy-on-write support.
+
+    When copy_on_write is enabled, items are considered to be shared with someone else (e.g. with a project
+    stored in the cache of the persistent storage client) until they are obtained using `get_mut`. Then, the item
+    is copied (just once), so it can be modified in place without affecting anyone else. Items obtained using
+    `get` are never copied and must be treated as read-only.
+    """
+
+    data: Dict[str, V] = field(default_factory=dict)
+    copy_on_write: bool = False
+    owned: Set[str] = field(default_factory=set)  # ids of items that are not shared
+
+    def get(self, item_id: str) -> V:
+        """Returns item for reading.
+
+        :param item_id:
+        :return:
+        :raises KeyError: When the item does not exist.
+        """
+
+        return self.data[item_id]
+
+    def get_mut(self, item_id: str) -> V:
+        """Returns item which might be modified in place.
+
+        :param item_id:
+        :return:
+        :raises KeyError: When the item does not exist.
+        """
+
+        item = self.data[item_id]
+
+        if self.copy_on_write and item_id not in self.owned:
+            item = copy.deepcopy(item)
+            self.data[item_id] = item
+            self.owned.add(item_id)
+
+        return item
+
+    def put(self, item_id: str, item: V) -> None:
+
+        self.data[item_id] = item
+        self.owned.discard(item_id)  # caller still holds the item
+
+    def pop(self, item_id: str) -> V:
+
+        item = self.data.pop(item_id)
+        self.owned.discard(item_id)
+        return item
+
+    def clear(self) -> None:
+
+        self.data.clear()
+        self.owned.clear()
+
+    def share(self) -> None:
+        """All items become shared (they are going to be referenced from
+        elsewhere)."""
+
+        self.owned.clear()
+
+    def snapshot(self: S) -> S:
+        """Returns a copy that shares all items with the original.
+
+        :return:
+        """
+
+        self.share()
+        ret = copy.copy(self)
+        ret.data = dict(self.data)
+        ret.owned = set()
+        ret._copy_indexes()
+        return ret
+
+    def _copy_indexes(self) -> None:
+        """Called on a shallow copy in order to get own copies of additional
+        index structures."""
+
+        pass
+
 
 class CachedSceneException(Arcor2Exception):
     pass
@@ -26,14 +112,14 @@ class CachedScene:
         self.int_modified: Optional[datetime] = scene.int_modified
 
         # TODO deal with children
-        self._objects: Dict[str, cmn.SceneObject] = {}
+        self._objects: Items[cmn.SceneObject] = Items()
 
         for obj in scene.objects:
 
-            if obj.id in self._objects:
+            if obj.id in self._objects.data:
                 raise CachedSceneException(f"Duplicate object id: {obj.id}.")
 
-            self._objects[obj.id] = obj
+            self._objects.put(obj.id, obj)
 
     @property
     def bare(self) -> cmn.BareScene:
@@ -41,23 +127,31 @@ class CachedScene:
 
     def object_names(self) -> Iterator[str]:
 
-        for obj in self._objects.values():
+        for obj in self._objects.data.values():
             yield obj.name
 
     @property
     def objects(self) -> Iterator[cmn.SceneObject]:
 
-        for obj in self._objects.values():
+        for obj in self._objects.data.values():
             yield obj
 
     @property
     def object_ids(self) -> Set[str]:
-        return set(self._objects.keys())
+        return set(self._objects.data.keys())
 
     def object(self, object_id: str) -> cmn.SceneObject:
 
         try:
-            return self._objects[object_id]
+            return self._objects.get(object_id)
+        except KeyError:
+            raise Arcor2Exception(f"Object ID {object_id} not found.")
+
+    def object_mut(self, object_id: str) -> cmn.SceneObject:
+        """Returns object that might be modified in place."""
+
+        try:
+            return self._objects.get_mut(object_id)
         except KeyError:
             raise Arcor2Exception(f"Object ID {object_id} not found.")
 
@@ -82,8 +176,35 @@ class CachedScene:
 
 
 class UpdateableCachedScene(CachedScene):
+    """Scene that can be modified.
+
+    The scene given to the constructor is not copied. Objects are shared with it until they are obtained
+    using `object_mut` - then they are copied and might be modified in place. Objects returned by other methods
+    (e.g. `object` or `objects`) should be treated as read-only.
+    """
+
     def __init__(self, scene: cmn.Scene):
-        super(UpdateableCachedScene, self).__init__(copy.deepcopy(scene))
+
+        super(UpdateableCachedScene, self).__init__(scene)
+        self._objects.copy_on_write = True
+
+    def snapshot(self) -> "UpdateableCachedScene":
+        """Returns copy of the scene which shares all unchanged objects with
+        the original one.
+
+        :return:
+        """
+
+        ret = copy.copy(self)
+        ret._objects = self._objects.snapshot()
+        return ret
+
+    @property
+    def scene(self) -> cmn.Scene:
+
+        sc = super(UpdateableCachedScene, self).scene
+        self._objects.share()  # objects are now referenced from the returned scene
+        return sc
 
     def update_modified(self) -> None:
         self.int_modified = datetime.now(tz=timezone.utc)
@@ -100,13 +221,13 @@ class UpdateableCachedScene(CachedScene):
 
     def upsert_object(self, obj: cmn.SceneObject) -> None:
 
-        self._objects[obj.id] = obj
+        self._objects.put(obj.id, obj)
         self.update_modified()
 
     def delete_object(self, obj_id: str) -> None:
 
         try:
-            del self._objects[obj_id]
+            self._objects.pop(obj_id)
         except KeyError as e:
             raise Arcor2Exception("Object id not found.") from e
 
@@ -117,25 +238,140 @@ class CachedProjectException(Arcor2Exception):
     pass
 
 
+T = TypeVar("T", cmn.Action, cmn.ProjectRobotJoints, cmn.NamedOrientation)
+
+
 @dataclass
-class Actions:
+class ApChildren(Items[T]):
+    """Items (actions, joints, orientations) belonging to action points.
 
-    data: Dict[str, cmn.Action] = field(default_factory=dict)
-    parent: Dict[str, cmn.BareActionPoint] = field(default_factory=dict)
+    Besides the item data and parent AP, an index of children for each AP is
+    maintained, so listing items of one AP does not require a scan over all
+    the items.
+    """
 
+    parent: Dict[str, str] = field(default_factory=dict)  # item id -> AP id
+    # dict is used as an ordered set, in order to keep items in order they were added
+    children: Dict[str, Dict[str, None]] = field(default_factory=dict)
 
-@dataclass
-class Joints:
+    def add(self, ap_id: str, item: T) -> None:
+
+        self.put(item.id, item)
+        self.parent[item.id] = ap_id
+        self.children.setdefault(ap_id, {})[item.id] = None
 
-    data: Dict[str, cmn.ProjectRobotJoints] = field(default_factory=dict)
-    parent: Dict[str, cmn.BareActionPoint] = field(default_factory=dict)
+    def remove(self, item_id: str) -> T:
+        """Removes the item.
+
+        :param item_id:
+        :return: Removed item.
+        :raises KeyError: When the item does not exist.
+        """
+
+        item = self.pop(item_id)
+        ap_id = self.parent.pop(item_id)
+
+        ap_children = self.children[ap_id]
+        del ap_children[item_id]
+        if not ap_children:
+            del self.children[ap_id]
+
+        return item
+
+    def ap_item_ids(self, ap_id: str) -> List[str]:
+        return list(self.children.get(ap_id, ()))
+
+    def ap_items(self, ap_id: str) -> List[T]:
+        return [self.data[item_id] for item_id in self.children.get(ap_id, ())]
+
+    def ap_items_mut(self, ap_id: str) -> List[T]:
+        return [self.get_mut(item_id) for item_id in self.children.get(ap_id, ())]
+
+    def _copy_indexes(self) -> None:
+
+        self.parent = dict(self.parent)
+        self.children = {ap_id: dict(item_ids) for ap_id, item_ids in self.children.items()}
+
+
+class Actions(ApChildren[cmn.Action]):
+    pass
+
+
+class Joints(ApChildren[cmn.ProjectRobotJoints]):
+    pass
+
+
+class Orientations(ApChildren[cmn.NamedOrientation]):
+    pass
 
 
 @dataclass
-class Orientations:
+class Logic(Items[cmn.LogicItem]):
+    """Logic items together with an adjacency index (inputs and outputs of
+    each action).
+
+    START is treated as a regular node, so the item leading from START
+    can be found among its outputs.
+    """
 
-    data: Dict[str, cmn.NamedOrientation] = field(default_factory=dict)
-    parent: Dict[str, cmn.BareActionPoint] = field(default_factory=dict)
+    # logic item id -> (start action id, end) as it was indexed, items might be modified in place meanwhile
+    edges: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    # dicts are used as ordered sets of logic item ids
+    inputs: Dict[str, Dict[str, None]] = field(default_factory=dict)
+    outputs: Dict[str, Dict[str, None]] = field(default_factory=dict)
+
+    def _unindex(self, item_id: str) -> None:
+
+        start, end = self.edges.pop(item_id)
+
+        for index, node in ((self.outputs, start), (self.inputs, end)):
+            node_items = index[node]
+            del node_items[item_id]
+            if not node_items:
+                del index[node]
+
+    def upsert(self, item: cmn.LogicItem) -> None:
+
+        if item.id in self.edges:
+            self._unindex(item.id)
+
+        start = item.parse_start().start_action_id
+
+        self.put(item.id, item)
+        self.edges[item.id] = start, item.end
+        self.outputs.setdefault(start, {})[item.id] = None
+        self.inputs.setdefault(item.end, {})[item.id] = None
+
+    def remove(self, item_id: str) -> cmn.LogicItem:
+        """Removes the logic item.
+
+        :param item_id:
+        :return: Removed item.
+        :raises KeyError: When the item does not exist.
+        """
+
+        item = self.pop(item_id)
+        self._unindex(item_id)
+        return item
+
+    def clear(self) -> None:
+
+        super(Logic, self).clear()
+        self.edges.clear()
+        self.inputs.clear()
+        self.outputs.clear()
+
+    def node_inputs(self, node_id: str) -> List[cmn.LogicItem]:
+        return [self.data[item_id] for item_id in self.inputs.get(node_id, ())]
+
+    def node_outputs(self, node_id: str) -> List[cmn.LogicItem]:
+        return [self.data[item_id] for item_id in self.outputs.get(node_id, ())]
+
+    def _copy_indexes(self) -> None:
+
+        self.edges = dict(self.edges)
+        self.inputs = {node: dict(item_ids) for node, item_ids in self.inputs.items()}
+        self.outputs = {node: dict(item_ids) for node, item_ids in self.outputs.items()}
 
 
 class CachedProject:
@@ -149,73 +385,69 @@ class CachedProject:
         self.modified: Optional[datetime] = project.modified
         self._int_modified: Optional[datetime] = project.int_modified
 
-        self._action_points: Dict[str, cmn.BareActionPoint] = {}
+        self._action_points: Items[cmn.BareActionPoint] = Items()
 
         self._actions = Actions()
         self._joints = Joints()
         self._orientations = Orientations()
 
-        self._constants: Dict[str, cmn.ProjectConstant] = {}
-        self._logic_items: Dict[str, cmn.LogicItem] = {}
+        self._constants: Items[cmn.ProjectConstant] = Items()
+        self._logic = Logic()
         self._functions: Dict[str, cmn.ProjectFunction] = {}
 
         self.overrides: Dict[str, List[cmn.Parameter]] = {}
 
         for ap in project.action_points:
 
-            if ap.id in self._action_points:
+            if ap.id in self._action_points.data:
                 raise CachedProjectException(f"Duplicate AP id: {ap.id}.")
 
-            bare_ap = cmn.BareActionPoint(ap.id, ap.name, ap.position, ap.parent)
-            self._action_points[ap.id] = bare_ap
+            self._action_points.put(ap.id, cmn.BareActionPoint(ap.id, ap.name, ap.position, ap.parent))
 
             for ac in ap.actions:
 
                 if ac.id in self._actions.data:
                     raise CachedProjectException(f"Duplicate action id: {ac.id}.")
 
-                self._actions.data[ac.id] = ac
-                self._actions.parent[ac.id] = bare_ap
+                self._actions.add(ap.id, ac)
 
             for joints in ap.robot_joints:
 
                 if joints.id in self._joints.data:
                     raise CachedProjectException(f"Duplicate joints id: {joints.id}.")
 
-                self._joints.data[joints.id] = joints
-                self._joints.parent[joints.id] = bare_ap
+                self._joints.add(ap.id, joints)
 
             for orientation in ap.orientations:
 
                 if orientation.id in self._orientations.data:
                     raise CachedProjectException(f"Duplicate orientation id: {orientation.id}.")
 
-                self._orientations.data[orientation.id] = orientation
-                self._orientations.parent[orientation.id] = bare_ap
+                self._orientations.add(ap.id, orientation)
 
         for override in project.object_overrides:
             self.overrides[override.id] = override.parameters
 
         for constant in project.constants:
-            self._constants[constant.id] = constant
+            self._constants.put(constant.id, constant)
 
         for logic_item in project.logic:
-            self._logic_items[logic_item.id] = logic_item
+            self._logic.upsert(logic_item)
 
         for function in project.functions:
             self._functions[function.id] = function
 
     @property
     def logic(self) -> ValuesView[cmn.LogicItem]:
-        return self._logic_items.values()
+        return self._logic.data.values()
 
     @property
     def valid_logic_endpoints(self) -> Set[str]:
-        return {cmn.LogicItem.START, cmn.LogicItem.END} | self._logic_items.keys()
+        return {cmn.LogicItem.START, cmn.LogicItem.END} | self._logic.data.keys()
 
     @property
     def constants(self) -> ValuesView[cmn.ProjectConstant]:
-        return self._constants.values()
+        return self._constants.data.values()
 
     @property
     def functions(self) -> ValuesView[cmn.ProjectFunction]:
@@ -226,12 +458,12 @@ class CachedProject:
 
         proj = cmn.Project.from_bare(self.bare)
 
-        for bare_ap in self._action_points.values():
+        for bare_ap in self._action_points.data.values():
 
             ap = cmn.ActionPoint.from_bare(bare_ap)
-            ap.actions = self.ap_actions(ap.id)
-            ap.robot_joints = self.ap_joints(ap.id)
-            ap.orientations = self.ap_orientations(ap.id)
+            ap.actions = [self._actions.data[ac_id] for ac_id in self._actions.ap_item_ids(ap.id)]
+            ap.robot_joints = [self._joints.data[joints_id] for joints_id in self._joints.ap_item_ids(ap.id)]
+            ap.orientations = [self._orientations.data[ori_id] for ori_id in self._orientations.ap_item_ids(ap.id)]
             proj.action_points.append(ap)
 
         proj.object_overrides = [cmn.SceneObjectOverride(k, v) for k, v in self.overrides.items()]
@@ -246,7 +478,7 @@ class CachedProject:
 
     @property
     def action_points(self) -> ValuesView[cmn.BareActionPoint]:
-        return self._action_points.values()
+        return self._action_points.data.values()
 
     @property
     def action_points_with_parent(self) -> List[cmn.BareActionPoint]:
@@ -255,84 +487,93 @@ class CachedProject:
         :return:
         """
 
-        return [ap for ap in self._action_points.values() if ap.parent]
+        return [ap for ap in self._action_points.data.values() if ap.parent]
 
     @property
     def action_points_names(self) -> Set[str]:
-        return {ap.name for ap in self._action_points.values()}
+        return {ap.name for ap in self._action_points.data.values()}
 
     @property
     def action_points_ids(self) -> Set[str]:
-        return set(self._action_points.keys())
+        return set(self._action_points.data.keys())
 
     def ap_and_joints(self, joints_id: str) -> Tuple[cmn.BareActionPoint, cmn.ProjectRobotJoints]:
 
         try:
-            return self._joints.parent[joints_id], self._joints.data[joints_id]
+            return self.bare_action_point(self._joints.parent[joints_id]), self._joints.get(joints_id)
         except KeyError:
             raise CachedProjectException("Unknown joints.")
 
     def joints(self, joints_id: str) -> cmn.ProjectRobotJoints:
 
         try:
-            return self._joints.data[joints_id]
+            return self._joints.get(joints_id)
+        except KeyError:
+            raise CachedProjectException("Unknown joints.")
+
+    def joints_mut(self, joints_id: str) -> cmn.ProjectRobotJoints:
+
+        try:
+            return self._joints.get_mut(joints_id)
         except KeyError:
             raise CachedProjectException("Unknown joints.")
 
     def bare_ap_and_orientation(self, orientation_id: str) -> Tuple[cmn.BareActionPoint, cmn.NamedOrientation]:
 
         try:
-            return self._orientations.parent[orientation_id], self._orientations.data[orientation_id]
+            return (
+                self.bare_action_point(self._orientations.parent[orientation_id]),
+                self._orientations.get(orientation_id),
+            )
         except KeyError:
             raise CachedProjectException("Unknown orientation.")
 
     def ap_orientations(self, ap_id: str) -> List[cmn.NamedOrientation]:
+        return self._orientations.ap_items(ap_id)
 
-        # TODO come up with something more efficient
-        return [
-            self._orientations.data[ori_id]
-            for ori_id, parent_ap in self._orientations.parent.items()
-            if ap_id == parent_ap.id
-        ]
+    def ap_orientations_mut(self, ap_id: str) -> List[cmn.NamedOrientation]:
+        return self._orientations.ap_items_mut(ap_id)
 
     def ap_joints(self, ap_id: str) -> List[cmn.ProjectRobotJoints]:
-
-        # TODO come up with something more efficient
-        return [
-            self._joints.data[joints_id]
-            for joints_id, parent_ap in self._joints.parent.items()
-            if ap_id == parent_ap.id
-        ]
+        return self._joints.ap_items(ap_id)
 
     def ap_actions(self, ap_id: str) -> List[cmn.Action]:
-
-        # TODO come up with something more efficient
-        return [
-            self._actions.data[action_id]
-            for action_id, parent_ap in self._actions.parent.items()
-            if ap_id == parent_ap.id
-        ]
+        return self._actions.ap_items(ap_id)
 
     def ap_action_ids(self, ap_id: str) -> Set[str]:
-        return {ac.id for ac in self.ap_actions(ap_id)}
+        return set(self._actions.ap_item_ids(ap_id))
 
     def ap_orientation_names(self, ap_id: str) -> Set[str]:
-        return {ori.name for ori in self.ap_orientations(ap_id)}
+        return {self._orientations.data[ori_id].name for ori_id in self._orientations.ap_item_ids(ap_id)}
 
     def ap_joint_names(self, ap_id: str) -> Set[str]:
-        return {joints.name for joints in self.ap_joints(ap_id)}
+        return {self._joints.data[joints_id].name for joints_id in self._joints.ap_item_ids(ap_id)}
 
     def orientation(self, orientation_id: str) -> cmn.NamedOrientation:
 
         try:
-            return self._orientations.data[orientation_id]
+            return self._orientations.get(orientation_id)
+        except KeyError:
+            raise CachedProjectException("Unknown orientation.")
+
+    def orientation_mut(self, orientation_id: str) -> cmn.NamedOrientation:
+
+        try:
+            return self._orientations.get_mut(orientation_id)
         except KeyError:
             raise CachedProjectException("Unknown orientation.")
 
     def action(self, action_id: str) -> cmn.Action:
 
         try:
-            return self._actions.data[action_id]
+            return self._actions.get(action_id)
+        except KeyError:
+            raise CachedProjectException("Action not found")
+
+    def action_mut(self, action_id: str) -> cmn.Action:
+
+        try:
+            return self._actions.get_mut(action_id)
         except KeyError:
             raise CachedProjectException("Action not found")
 
@@ -344,15 +585,8 @@ class CachedProject:
         :return:
         """
 
-        inputs: List[cmn.LogicItem] = []
-        outputs: List[cmn.LogicItem] = []
-
-        for item in self._logic_items.values():
-            parsed_start = item.parse_start()
-            if parsed_start.start_action_id == action_id:
-                outputs.append(item)
-            if item.end == action_id:
-                inputs.append(item)
+        inputs = self._logic.node_inputs(action_id)
+        outputs = self._logic.node_outputs(action_id)
 
         if __debug__:  # make it a bit harder for tests to succeed
             random.shuffle(inputs)
@@ -362,23 +596,20 @@ class CachedProject:
 
     def first_action_id(self) -> str:
 
-        first_action: Optional[str] = None
+        start_items = self._logic.node_outputs(cmn.LogicItem.START)
 
-        for item in self._logic_items.values():
-            if item.start == item.START:
-                if first_action:
-                    raise CachedProjectException("Duplicate start.")
-                first_action = self.action(item.end).id
-
-        if first_action is None:
+        if not start_items:
             raise CachedProjectException("Start action not found.")
 
-        return first_action
+        if len(start_items) > 1:
+            raise CachedProjectException("Duplicate start.")
+
+        return self.action(start_items[0].end).id
 
     def action_point_and_action(self, action_id: str) -> Tuple[cmn.BareActionPoint, cmn.Action]:
 
         try:
-            return self._actions.parent[action_id], self._actions.data[action_id]
+            return self.bare_action_point(self._actions.parent[action_id]), self._actions.get(action_id)
         except KeyError:
             raise CachedProjectException("Action not found")
 
@@ -387,7 +618,7 @@ class CachedProject:
         return list(self._actions.data.values())
 
     def action_ids(self) -> Set[str]:
-        return {action.id for action in self.actions}
+        return set(self._actions.data.keys())
 
     def action_user_names(self) -> Set[str]:
         return {action.name for action in self.actions}
@@ -395,7 +626,14 @@ class CachedProject:
     def bare_action_point(self, action_point_id: str) -> cmn.BareActionPoint:
 
         try:
-            return self._action_points[action_point_id]
+            return self._action_points.get(action_point_id)
+        except KeyError:
+            raise CachedProjectException("Action point not found")
+
+    def bare_action_point_mut(self, action_point_id: str) -> cmn.BareActionPoint:
+
+        try:
+            return self._action_points.get_mut(action_point_id)
         except KeyError:
             raise CachedProjectException("Action point not found")
 
@@ -409,21 +647,75 @@ class CachedProject:
     def logic_item(self, logic_item_id: str) -> cmn.LogicItem:
 
         try:
-            return self._logic_items[logic_item_id]
+            return self._logic.get(logic_item_id)
+        except KeyError:
+            raise CachedProjectException("LogicItem not found.")
+
+    def logic_item_mut(self, logic_item_id: str) -> cmn.LogicItem:
+
+        try:
+            return self._logic.get_mut(logic_item_id)
         except KeyError:
             raise CachedProjectException("LogicItem not found.")
 
     def constant(self, constant_id: str) -> cmn.ProjectConstant:
 
         try:
-            return self._constants[constant_id]
+            return self._constants.get(constant_id)
         except KeyError:
             raise CachedProjectException("Constant not found.")
 
 
 class UpdateableCachedProject(CachedProject):
+    """Project that can be modified.
+
+    The project given to the constructor is not copied. Its items are shared until they are obtained using
+    methods with the `_mut` suffix (e.g. `action_mut`) - then they are copied and might be modified in place.
+    Items returned by other methods (e.g. `action`, `ap_joints` or `logic`) should be treated as read-only.
+    """
+
     def __init__(self, project: cmn.Project):
-        super(UpdateableCachedProject, self).__init__(copy.deepcopy(project))
+
+        super(UpdateableCachedProject, self).__init__(project)
+
+        # overrides are modified in place and there are usually just few of them
+        self.overrides = copy.deepcopy(self.overrides)
+
+        for items in self._items():
+            items.copy_on_write = True
+
+    def _items(self) -> Tuple[Items, ...]:
+        return self._action_points, self._actions, self._joints, self._orientations, self._constants, self._logic
+
+    def snapshot(self) -> "UpdateableCachedProject":
+        """Returns copy of the project which shares all unchanged items with
+        the original one.
+
+        :return:
+        """
+
+        ret = copy.copy(self)
+        ret._action_points = self._action_points.snapshot()
+        ret._actions = self._actions.snapshot()
+        ret._joints = self._joints.snapshot()
+        ret._orientations = self._orientations.snapshot()
+        ret._constants = self._constants.snapshot()
+        ret._logic = self._logic.snapshot()
+        ret._functions = dict(self._functions)
+        ret.overrides = copy.deepcopy(self.overrides)
+        return ret
+
+    @property
+    def project(self) -> cmn.Project:
+
+        proj = super(UpdateableCachedProject, self).project
+        proj.object_overrides = copy.deepcopy(proj.object_overrides)
+
+        # items are now referenced from the returned project
+        for items in self._items():
+            items.share()
+
+        return proj
 
     def update_modified(self) -> None:
         self._int_modified = datetime.now(tz=timezone.utc)
@@ -444,18 +736,16 @@ class UpdateableCachedProject(CachedProject):
         ap = self.bare_action_point(ap_id)
 
         if action.id in self._actions.data:
-            assert self._actions.parent[action.id] == ap
-            self._actions.data[action.id] = action
+            assert self._actions.parent[action.id] == ap.id
+            self._actions.put(action.id, action)
         else:
-            self._actions.data[action.id] = action
-            self._actions.parent[action.id] = ap
+            self._actions.add(ap.id, action)
         self.update_modified()
 
     def remove_action(self, action_id: str) -> cmn.Action:
 
         try:
-            action = self._actions.data.pop(action_id)
-            del self._actions.parent[action_id]  # TODO KeyError here might be probably ignored? (it should not happen)
+            action = self._actions.remove(action_id)
         except KeyError as e:
             raise CachedProjectException("Action not found.") from e
         self.update_modified()
@@ -464,11 +754,27 @@ class UpdateableCachedProject(CachedProject):
     def invalidate_joints(self, ap_id: str) -> None:
 
         for joints in self.ap_joints(ap_id):
-            joints.is_valid = False
+            if joints.is_valid:
+                self.joints_mut(joints.id).is_valid = False
+
+    def update_joints(self, joints_id: str, joints: List[cmn.Joint]) -> cmn.ProjectRobotJoints:
+
+        robot_joints = self.joints_mut(joints_id)
+        robot_joints.joints = joints
+        robot_joints.is_valid = True
+        self.update_modified()
+        return robot_joints
+
+    def update_orientation(self, orientation_id: str, orientation: cmn.Orientation) -> cmn.NamedOrientation:
+
+        ori = self.orientation_mut(orientation_id)
+        ori.orientation = orientation
+        self.update_modified()
+        return ori
 
     def update_ap_position(self, ap_id: str, position: cmn.Position) -> None:
 
-        ap = self.bare_action_point(ap_id)
+        ap = self.bare_action_point_mut(ap_id)
         ap.position = position
         self.invalidate_joints(ap_id)
         self.update_modified()
@@ -478,18 +784,16 @@ class UpdateableCachedProject(CachedProject):
         ap = self.bare_action_point(ap_id)
 
         if orientation.id in self._orientations.data:
-            assert self._orientations.parent[orientation.id] == ap
-            self._orientations.data[orientation.id] = orientation
+            assert self._orientations.parent[orientation.id] == ap.id
+            self._orientations.put(orientation.id, orientation)
         else:
-            self._orientations.data[orientation.id] = orientation
-            self._orientations.parent[orientation.id] = ap
+            self._orientations.add(ap.id, orientation)
         self.update_modified()
 
     def remove_orientation(self, orientation_id: str) -> cmn.NamedOrientation:
 
         try:
-            ori = self._orientations.data.pop(orientation_id)
-            del self._orientations.parent[orientation_id]
+            ori = self._orientations.remove(orientation_id)
         except KeyError as e:
             raise CachedProjectException("Orientation not found.") from e
         self.update_modified()
@@ -500,18 +804,16 @@ class UpdateableCachedProject(CachedProject):
         ap = self.bare_action_point(ap_id)
 
         if joints.id in self._joints.data:
-            assert self._joints.parent[joints.id] == ap
-            self._joints.data[joints.id] = joints
+            assert self._joints.parent[joints.id] == ap.id
+            self._joints.put(joints.id, joints)
         else:
-            self._joints.data[joints.id] = joints
-            self._joints.parent[joints.id] = ap
+            self._joints.add(ap.id, joints)
         self.update_modified()
 
     def remove_joints(self, joints_id: str) -> cmn.ProjectRobotJoints:
 
         try:
-            joints = self._joints.data.pop(joints_id)
-            del self._joints.parent[joints_id]
+            joints = self._joints.remove(joints_id)
         except KeyError as e:
             raise CachedProjectException("Joints not found.") from e
         self.update_modified()
@@ -522,7 +824,7 @@ class UpdateableCachedProject(CachedProject):
     ) -> cmn.BareActionPoint:
 
         try:
-            ap = self.bare_action_point(ap_id)
+            ap = self.bare_action_point_mut(ap_id)
             ap.name = name
             if position != ap.position:
                 self.invalidate_joints(ap_id)
@@ -530,7 +832,7 @@ class UpdateableCachedProject(CachedProject):
             ap.parent = parent
         except CachedProjectException:
             ap = cmn.BareActionPoint(ap_id, name, position, parent)
-            self._action_points[ap_id] = ap
+            self._action_points.put(ap_id, ap)
         self.update_modified()
         return ap
 
@@ -538,28 +840,28 @@ class UpdateableCachedProject(CachedProject):
 
         ap = self.bare_action_point(ap_id)
 
-        for action in self.ap_actions(ap_id):
-            self.remove_action(action.id)
+        for action_id in self._actions.ap_item_ids(ap_id):
+            self.remove_action(action_id)
 
-        for joints in self.ap_joints(ap_id):
-            self.remove_joints(joints.id)
+        for joints_id in self._joints.ap_item_ids(ap_id):
+            self.remove_joints(joints_id)
 
-        for ori in self.ap_orientations(ap_id):
-            self.remove_orientation(ori.id)
+        for ori_id in self._orientations.ap_item_ids(ap_id):
+            self.remove_orientation(ori_id)
 
-        del self._action_points[ap_id]
+        self._action_points.pop(ap_id)
         self.update_modified()
         return ap
 
     def upsert_logic_item(self, logic_item: cmn.LogicItem) -> None:
 
-        self._logic_items[logic_item.id] = logic_item
+        self._logic.upsert(logic_item)
         self.update_modified()
 
     def remove_logic_item(self, logic_item_id: str) -> cmn.LogicItem:
 
         try:
-            logic_item = self._logic_items.pop(logic_item_id)
+            logic_item = self._logic.remove(logic_item_id)
         except KeyError as e:
             raise CachedProjectException("Logic item not found.") from e
         self.update_modified()
@@ -567,11 +869,11 @@ class UpdateableCachedProject(CachedProject):
 
     def clear_logic(self) -> None:
 
-        self._logic_items.clear()
+        self._logic.clear()
         self.update_modified()
 
     def upsert_constant(self, const: cmn.ProjectConstant) -> None:
-        self._constants[const.id] = const
+        self._constants.put(const.id, const)
         self.update_modified()
 
     def remove_constant(self, const_id: str) -> cmn.ProjectConstant:
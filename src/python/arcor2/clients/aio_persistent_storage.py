@@ -1,89 +1,209 @@
+import asyncio
 from datetime import datetime
+from typing import Dict, Iterable, List
 
-from arcor2.clients import persistent_storage
-from arcor2.clients.persistent_storage import ProjectServiceException  # noqa
+from arcor2 import aio_rest
+from arcor2.clients import persistent_storage as ps
+from arcor2.clients.persistent_storage import ProjectServiceException
 from arcor2.data.common import IdDescList, Project, ProjectSources, Scene
-from arcor2.data.object_type import Mesh, MeshList, Model, Model3dType, ObjectType
-from arcor2.helpers import run_in_executor
-
-
+from arcor2.data.object_type import (
+    MODEL_MAPPING,
+    Mesh,
+    MeshList,
+    MetaModel3d,
+    Model,
+    Model3dType,
+    ObjectModel,
+    ObjectType,
+)
+from arcor2.exceptions.helpers import handle
+from arcor2.rest import Method, RestException, logger
+
+
+@handle(ProjectServiceException, message="Failed to get the mesh.")
 async def get_mesh(mesh_id: str) -> Mesh:
-    return await run_in_executor(persistent_storage.get_mesh, mesh_id)
+    return await aio_rest.call(Method.GET, f"{ps.URL}/models/{mesh_id}/mesh", return_type=Mesh, cache=ps.cache)
 
 
+@handle(ProjectServiceException, message="Failed to get list of meshes.")
 async def get_meshes() -> MeshList:
-    return await run_in_executor(persistent_storage.get_meshes)
+    return await aio_rest.call(Method.GET, f"{ps.URL}/models/meshes", list_return_type=Mesh)
 
 
+@handle(ProjectServiceException, message="Failed to get the model type.")
 async def get_model(model_id: str, model_type: Model3dType) -> Model:
-    return await run_in_executor(persistent_storage.get_model, model_id, model_type)
+    return await aio_rest.call(
+        Method.GET,
+        f"{ps.URL}/models/{model_id}/{model_type.value.lower()}",
+        return_type=MODEL_MAPPING[model_type],
+        cache=ps.cache,
+    )
 
 
+@handle(ProjectServiceException, message="Failed to add or update the model.")
 async def put_model(model: Model) -> None:
-    await run_in_executor(persistent_storage.put_model, model)
+    await aio_rest.call(Method.PUT, f"{ps.URL}/models/{model.__class__.__name__.lower()}", body=model)
 
 
+@handle(ProjectServiceException, message="Failed to delete the model.")
 async def delete_model(model_id: str) -> None:
-    await run_in_executor(persistent_storage.delete_model, model_id)
+    await aio_rest.call(Method.DELETE, f"{ps.URL}/models/{model_id}")
 
 
+@handle(ProjectServiceException, message="Failed to list projects.")
 async def get_projects() -> IdDescList:
-    return await run_in_executor(persistent_storage.get_projects)
+    return await aio_rest.call(Method.GET, f"{ps.URL}/projects", return_type=IdDescList)
 
 
+@handle(ProjectServiceException, message="Failed to list scenes.")
 async def get_scenes() -> IdDescList:
-    return await run_in_executor(persistent_storage.get_scenes)
+    return await aio_rest.call(Method.GET, f"{ps.URL}/scenes", return_type=IdDescList)
 
 
+@handle(ProjectServiceException, message="Failed to get the project.")
 async def get_project(project_id: str) -> Project:
-    return await run_in_executor(persistent_storage.get_project, project_id)
+    return await aio_rest.call(Method.GET, f"{ps.URL}/project/{project_id}", return_type=Project, cache=ps.cache)
 
 
+@handle(ProjectServiceException, message="Failed to get the project sources.")
 async def get_project_sources(project_id: str) -> ProjectSources:
-    return await run_in_executor(persistent_storage.get_project_sources, project_id)
+    return await aio_rest.call(
+        Method.GET, f"{ps.URL}/project/{project_id}/sources", return_type=ProjectSources, cache=ps.cache
+    )
 
 
+@handle(ProjectServiceException, message="Failed to get the scene.")
 async def get_scene(scene_id: str) -> Scene:
-    return await run_in_executor(persistent_storage.get_scene, scene_id)
+    return await aio_rest.call(Method.GET, f"{ps.URL}/scene/{scene_id}", return_type=Scene, cache=ps.cache)
 
 
+@handle(ProjectServiceException, message="Failed to get the object type.")
 async def get_object_type(object_type_id: str) -> ObjectType:
-    return await run_in_executor(persistent_storage.get_object_type, object_type_id)
+    return await aio_rest.call(
+        Method.GET, f"{ps.URL}/object_types/{object_type_id}", return_type=ObjectType, cache=ps.cache
+    )
 
 
+@handle(ProjectServiceException, message="Failed to list object types.")
 async def get_object_type_ids() -> IdDescList:
-    return await run_in_executor(persistent_storage.get_object_type_ids)
+    return await aio_rest.call(Method.GET, f"{ps.URL}/object_types", return_type=IdDescList)
+
+
+@handle(ProjectServiceException, message="Failed to get object types.")
+async def get_object_types(object_type_ids: Iterable[str]) -> List[ObjectType]:
+    """Gets many ObjectTypes using one request. When the service does not
+    support it, ObjectTypes are obtained using concurrent requests.
+
+    :param object_type_ids: Ids of ObjectTypes.
+    :return: ObjectTypes, in the order of (unique) ids.
+    """
+
+    ids = ps.bulk_ids(object_type_ids)
+
+    if not ids:
+        return []
+
+    try:
+        found = {
+            obj.id: obj
+            for obj in await aio_rest.call(
+                Method.GET, f"{ps.URL}/bulk/object_types", list_return_type=ObjectType, params={"ids": ",".join(ids)}
+            )
+        }
+    except RestException:
+        logger.debug("Bulk request failed, getting object types one by one.", exc_info=True)
+        found = {}
+
+    # the missing ones (if any) are obtained separately, which raises a proper exception if they really don't exist
+    missing = [obj_id for obj_id in ids if obj_id not in found]
+    found.update(zip(missing, await asyncio.gather(*[get_object_type(obj_id) for obj_id in missing])))
+
+    return [found[obj_id] for obj_id in ids]
+
+
+@handle(ProjectServiceException, message="Failed to get models.")
+async def get_models(metamodels: Iterable[MetaModel3d]) -> List[Model]:
+    """Gets many models using one request. When the service does not support
+    it, models are obtained using concurrent requests.
+
+    :param metamodels: Ids and types of models.
+    :return: Models, in the order of (unique) ids.
+    """
 
+    mms = {mm.id: mm for mm in metamodels}
 
+    if not mms:
+        return []
+
+    found: Dict[str, Model] = {}
+
+    try:
+        for obj_model in await aio_rest.call(
+            Method.GET, f"{ps.URL}/bulk/models", list_return_type=ObjectModel, params={"ids": ",".join(mms)}
+        ):
+            model = obj_model.model()
+            found[model.id] = model
+    except RestException:
+        logger.debug("Bulk request failed, getting models one by one.", exc_info=True)
+
+    missing = [mm for mm in mms.values() if mm.id not in found]
+    found.update(zip((mm.id for mm in missing), await asyncio.gather(*[get_model(mm.id, mm.type) for mm in missing])))
+
+    return [found[model_id] for model_id in mms]
+
+
+@handle(ProjectServiceException, message="Failed to add or update the project.")
 async def update_project(project: Project) -> datetime:
-    return await run_in_executor(persistent_storage.update_project, project)
+
+    assert project.id
+    return datetime.fromisoformat(await aio_rest.call(Method.PUT, f"{ps.URL}/project", return_type=str, body=project))
 
 
+@handle(ProjectServiceException, message="Failed to add or update the scene.")
 async def update_scene(scene: Scene) -> datetime:
-    return await run_in_executor(persistent_storage.update_scene, scene)
 
+    assert scene.id
+    return datetime.fromisoformat(await aio_rest.call(Method.PUT, f"{ps.URL}/scene", return_type=str, body=scene))
 
+
+@handle(ProjectServiceException, message="Failed to add or update the project sources.")
 async def update_project_sources(project_sources: ProjectSources) -> None:
-    await run_in_executor(persistent_storage.update_project_sources, project_sources)
+
+    assert project_sources.id
+    await aio_rest.call(Method.POST, f"{ps.URL}/project/sources", body=project_sources)
 
 
+@handle(ProjectServiceException, message="Failed to add or update the object type.")
 async def update_object_type(object_type: ObjectType) -> None:
-    await run_in_executor(persistent_storage.update_object_type, object_type)
+
+    assert object_type.id
+    await aio_rest.call(Method.PUT, f"{ps.URL}/object_type", body=object_type)
 
 
+@handle(ProjectServiceException, message="Failed to delete the object type.")
 async def delete_object_type(object_type_id: str) -> None:
-    await run_in_executor(persistent_storage.delete_object_type, object_type_id)
+    await aio_rest.call(Method.DELETE, f"{ps.URL}/object_type/{object_type_id}")
 
 
+@handle(ProjectServiceException, message="Failed to delete the scene.")
 async def delete_scene(scene_id: str) -> None:
-    await run_in_executor(persistent_storage.delete_scene, scene_id)
+    await aio_rest.call(Method.DELETE, f"{ps.URL}/scene/{scene_id}")
 
 
+@handle(ProjectServiceException, message="Failed to delete the project.")
 async def delete_project(project_id: str) -> None:
-    await run_in_executor(persistent_storage.delete_project, project_id)
+    await aio_rest.call(Method.DELETE, f"{ps.URL}/project/{project_id}")
 
 
+@handle(ProjectServiceException, message="Failed to get the mesh.")
 async def save_mesh_file(mesh_id: str, path: str) -> None:
     """Saves mesh file to a given path."""
 
-    await run_in_executor(persistent_storage.save_mesh_file, mesh_id, path)
+    await aio_rest.download(f"{ps.URL}/models/{mesh_id}/mesh/file", path)
+
+
+@handle(ProjectServiceException, message="Failed to upload the mesh.")
+async def upload_mesh_file(mesh_id: str, file_content: bytes) -> None:
+    """Upload a mesh file."""
+
+    await aio_rest.call(Method.PUT, f"{ps.URL}/models/{mesh_id}/mesh/file", files={"file": file_content})
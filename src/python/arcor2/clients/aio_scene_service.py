@@ -1,40 +1,54 @@
 import asyncio
-from typing import Set
+from typing import Optional, Set
 
-from arcor2.clients import scene_service
-from arcor2.clients.scene_service import SceneServiceException
+from arcor2 import aio_rest
+from arcor2.clients import scene_service as ss
+from arcor2.clients.scene_service import MeshParameters, SceneServiceException, collision_params
 from arcor2.data.common import Pose
 from arcor2.data.object_type import Models
 from arcor2.data.scene import MeshFocusAction
-from arcor2.helpers import run_in_executor
+from arcor2.exceptions.helpers import handle
+from arcor2.rest import Method
 
 
-async def upsert_collision(model: Models, pose: Pose) -> None:
-    await run_in_executor(scene_service.upsert_collision, model, pose)
+@handle(SceneServiceException, message="Failed to add or update the collision model.")
+async def upsert_collision(model: Models, pose: Pose, mesh_parameters: Optional[MeshParameters] = None) -> None:
+    await aio_rest.call(
+        Method.PUT,
+        f"{ss.URL}/collisions/{model.type().value.lower()}",
+        body=pose,
+        params=collision_params(model, mesh_parameters),
+    )
 
 
+@handle(SceneServiceException, message="Failed to delete the collision.")
 async def delete_collision_id(collision_id: str) -> None:
-    await run_in_executor(scene_service.delete_collision_id, collision_id)
+    await aio_rest.call(Method.DELETE, f"{ss.URL}/collisions/{collision_id}")
 
 
+@handle(SceneServiceException, message="Failed to list collisions.")
 async def collision_ids() -> Set[str]:
-    return await run_in_executor(scene_service.collision_ids)
+    return set(await aio_rest.call(Method.GET, f"{ss.URL}/collisions", list_return_type=str))
 
 
+@handle(SceneServiceException, message="Failed to focus the object.")
 async def focus(mfa: MeshFocusAction) -> Pose:
-    return await run_in_executor(scene_service.focus, mfa)
+    return await aio_rest.call(Method.PUT, f"{ss.URL}/utils/focus", body=mfa, return_type=Pose)
 
 
+@handle(SceneServiceException, message="Failed to start the scene.")
 async def start() -> None:
-    await run_in_executor(scene_service.start)
+    await aio_rest.call(Method.PUT, f"{ss.URL}/system/start")
 
 
+@handle(SceneServiceException, message="Failed to stop the scene.")
 async def stop() -> None:
-    await run_in_executor(scene_service.stop)
+    await aio_rest.call(Method.PUT, f"{ss.URL}/system/stop")
 
 
+@handle(SceneServiceException, message="Failed to get scene state.")
 async def started() -> bool:
-    return await run_in_executor(scene_service.started)
+    return await aio_rest.call(Method.GET, f"{ss.URL}/system/running", return_type=bool)
 
 
 async def delete_all_collisions() -> None:
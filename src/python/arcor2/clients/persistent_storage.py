@@ -1,16 +1,37 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Callable, Dict, Iterable, List, TypeVar
 
 from arcor2 import rest
 from arcor2.data.common import IdDescList, Project, ProjectSources, Scene
-from arcor2.data.object_type import MODEL_MAPPING, Mesh, MeshList, Model, Model3dType, ObjectType
+from arcor2.data.object_type import (
+    MODEL_MAPPING,
+    Mesh,
+    MeshList,
+    MetaModel3d,
+    Model,
+    Model3dType,
+    ObjectModel,
+    ObjectType,
+)
 from arcor2.exceptions import Arcor2Exception
 from arcor2.exceptions.helpers import handle
+from arcor2.rest import RestException, logger
 
 URL = os.getenv("ARCOR2_PERSISTENT_STORAGE_URL", "http://0.0.0.0:11000")
 
+# responses to reads of particular items are revalidated instead of being downloaded again
+cache = rest.ResponseCache(int(os.getenv("ARCOR2_PERSISTENT_STORAGE_CACHE_SIZE", 256)))
+
+# max. number of concurrent requests for particular items when the service does not support bulk requests
+fallback_workers = int(os.getenv("ARCOR2_PERSISTENT_STORAGE_FALLBACK_WORKERS", 8))
+
 # TODO thread to poll changes? how to "detect" changes?
 
+T = TypeVar("T")
+U = TypeVar("U")
+
 
 class ProjectServiceException(Arcor2Exception):
     pass
@@ -18,7 +39,7 @@ class ProjectServiceException(Arcor2Exception):
 
 @handle(ProjectServiceException, message="Failed to get the mesh.")
 def get_mesh(mesh_id: str) -> Mesh:
-    return rest.call(rest.Method.GET, f"{URL}/models/{mesh_id}/mesh", return_type=Mesh)
+    return rest.call(rest.Method.GET, f"{URL}/models/{mesh_id}/mesh", return_type=Mesh, cache=cache)
 
 
 @handle(ProjectServiceException, message="Failed to get list of meshes.")
@@ -29,7 +50,10 @@ def get_meshes() -> MeshList:
 @handle(ProjectServiceException, message="Failed to get the model type.")
 def get_model(model_id: str, model_type: Model3dType) -> Model:
     return rest.call(
-        rest.Method.GET, f"{URL}/models/{model_id}/{model_type.value.lower()}", return_type=MODEL_MAPPING[model_type]
+        rest.Method.GET,
+        f"{URL}/models/{model_id}/{model_type.value.lower()}",
+        return_type=MODEL_MAPPING[model_type],
+        cache=cache,
     )
 
 
@@ -55,22 +79,22 @@ def get_scenes() -> IdDescList:
 
 @handle(ProjectServiceException, message="Failed to get the project.")
 def get_project(project_id: str) -> Project:
-    return rest.call(rest.Method.GET, f"{URL}/project/{project_id}", return_type=Project)
+    return rest.call(rest.Method.GET, f"{URL}/project/{project_id}", return_type=Project, cache=cache)
 
 
 @handle(ProjectServiceException, message="Failed to get the project sources.")
 def get_project_sources(project_id: str) -> ProjectSources:
-    return rest.call(rest.Method.GET, f"{URL}/project/{project_id}/sources", return_type=ProjectSources)
+    return rest.call(rest.Method.GET, f"{URL}/project/{project_id}/sources", return_type=ProjectSources, cache=cache)
 
 
 @handle(ProjectServiceException, message="Failed to get the scene.")
 def get_scene(scene_id: str) -> Scene:
-    return rest.call(rest.Method.GET, f"{URL}/scene/{scene_id}", return_type=Scene)
+    return rest.call(rest.Method.GET, f"{URL}/scene/{scene_id}", return_type=Scene, cache=cache)
 
 
 @handle(ProjectServiceException, message="Failed to get the object type.")
 def get_object_type(object_type_id: str) -> ObjectType:
-    return rest.call(rest.Method.GET, f"{URL}/object_types/{object_type_id}", return_type=ObjectType)
+    return rest.call(rest.Method.GET, f"{URL}/object_types/{object_type_id}", return_type=ObjectType, cache=cache)
 
 
 @handle(ProjectServiceException, message="Failed to list object types.")
@@ -78,6 +102,84 @@ def get_object_type_ids() -> IdDescList:
     return rest.call(rest.Method.GET, f"{URL}/object_types", return_type=IdDescList)
 
 
+def bulk_ids(ids: Iterable[str]) -> List[str]:
+    """Unique ids, in the original order."""
+
+    return list(dict.fromkeys(ids))
+
+
+def _fetch_all(func: Callable[[T], U], args: List[T]) -> List[U]:
+
+    if len(args) < 2:
+        return [func(arg) for arg in args]
+
+    with ThreadPoolExecutor(min(fallback_workers, len(args))) as executor:
+        return list(executor.map(func, args))
+
+
+@handle(ProjectServiceException, message="Failed to get object types.")
+def get_object_types(object_type_ids: Iterable[str]) -> List[ObjectType]:
+    """Gets many ObjectTypes using one request. When the service does not
+    support it, ObjectTypes are obtained using concurrent requests.
+
+    :param object_type_ids: Ids of ObjectTypes.
+    :return: ObjectTypes, in the order of (unique) ids.
+    """
+
+    ids = bulk_ids(object_type_ids)
+
+    if not ids:
+        return []
+
+    try:
+        found = {
+            obj.id: obj
+            for obj in rest.call(
+                rest.Method.GET, f"{URL}/bulk/object_types", list_return_type=ObjectType, params={"ids": ",".join(ids)}
+            )
+        }
+    except RestException:
+        logger.debug("Bulk request failed, getting object types one by one.", exc_info=True)
+        found = {}
+
+    # the missing ones (if any) are obtained separately, which raises a proper exception if they really don't exist
+    missing = [obj_id for obj_id in ids if obj_id not in found]
+    found.update(zip(missing, _fetch_all(get_object_type, missing)))
+
+    return [found[obj_id] for obj_id in ids]
+
+
+@handle(ProjectServiceException, message="Failed to get models.")
+def get_models(metamodels: Iterable[MetaModel3d]) -> List[Model]:
+    """Gets many models using one request. When the service does not support
+    it, models are obtained using concurrent requests.
+
+    :param metamodels: Ids and types of models.
+    :return: Models, in the order of (unique) ids.
+    """
+
+    mms = {mm.id: mm for mm in metamodels}
+
+    if not mms:
+        return []
+
+    found: Dict[str, Model] = {}
+
+    try:
+        for obj_model in rest.call(
+            rest.Method.GET, f"{URL}/bulk/models", list_return_type=ObjectModel, params={"ids": ",".join(mms)}
+        ):
+            model = obj_model.model()
+            found[model.id] = model
+    except RestException:
+        logger.debug("Bulk request failed, getting models one by one.", exc_info=True)
+
+    missing = [mm for mm in mms.values() if mm.id not in found]
+    found.update(zip((mm.id for mm in missing), _fetch_all(lambda mm: get_model(mm.id, mm.type), missing)))
+
+    return [found[model_id] for model_id in mms]
+
+
 @handle(ProjectServiceException, message="Failed to add or update the project.")
 def update_project(project: Project) -> datetime:
 
@@ -133,3 +235,10 @@ def upload_mesh_file(mesh_id: str, file_content: bytes) -> None:
     """Upload a mesh file."""
 
     rest.call(rest.Method.PUT, f"{URL}/models/{mesh_id}/mesh/file", files={"file": file_content})
+
+
+@handle(ProjectServiceException, message="Failed to upload the mesh.")
+def upload_mesh_file_from_path(mesh_id: str, path: str) -> None:
+    """Upload a mesh file, without reading it into memory."""
+
+    rest.upload(rest.Method.PUT, f"{URL}/models/{mesh_id}/mesh/file", "file", path)
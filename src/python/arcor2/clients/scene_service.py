@@ -1,7 +1,7 @@
 import os
 import time
 from dataclasses import dataclass
-from typing import Optional, Set
+from typing import Any, Dict, Optional, Set
 
 from dataclasses_jsonschema import JsonSchemaMixin
 
@@ -41,6 +41,20 @@ def wait_for(timeout: float = 10.0) -> None:
     raise SceneServiceException("Failed to contact Scene service.")
 
 
+def collision_params(model: Models, mesh_parameters: Optional[MeshParameters] = None) -> Dict[str, Any]:
+    """Prepares query parameters describing the collision model."""
+
+    model_id = model.id
+    params = model.to_dict()
+    del params["id"]
+    params[model.__class__.__name__.lower() + "Id"] = model_id
+
+    if model.type() == Model3dType.MESH and mesh_parameters:
+        params.update(mesh_parameters.to_dict())
+
+    return params
+
+
 @handle(SceneServiceException, message="Failed to add or update the collision model.")
 def upsert_collision(model: Models, pose: Pose, mesh_parameters: Optional[MeshParameters] = None) -> None:
     """Adds arbitrary collision model to the collision scene.
@@ -58,15 +72,12 @@ def upsert_collision(model: Models, pose: Pose, mesh_parameters: Optional[MeshPa
     >>> scene_service.upsert_collision(box, Pose(Position(1, 0, 0), Orientation(0, 0, 0, 1)))
     """
 
-    model_id = model.id
-    params = model.to_dict()
-    del params["id"]
-    params[model.__class__.__name__.lower() + "Id"] = model_id
-
-    if model.type() == Model3dType.MESH and mesh_parameters:
-        params.update(mesh_parameters.to_dict())
-
-    rest.call(rest.Method.PUT, f"{URL}/collisions/{model.type().value.lower()}", body=pose, params=params)
+    rest.call(
+        rest.Method.PUT,
+        f"{URL}/collisions/{model.type().value.lower()}",
+        body=pose,
+        params=collision_params(model, mesh_parameters),
+    )
 
 
 @handle(SceneServiceException, message="Failed to delete the collision.")
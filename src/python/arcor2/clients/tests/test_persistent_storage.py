@@ -0,0 +1,110 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Union
+from urllib.parse import parse_qs, urlsplit
+
+import humps
+import pytest
+
+from arcor2 import aio_rest
+from arcor2.clients import aio_persistent_storage as aio_ps
+from arcor2.clients import persistent_storage as ps
+from arcor2.data.object_type import Box, MetaModel3d, Model3dType, ObjectModel, ObjectType
+
+OBJECT_TYPES = {f"Type{idx}": ObjectType(f"Type{idx}", "source") for idx in range(5)}
+BOXES = {f"Type{idx}": Box(f"Type{idx}", 1, 1, 1) for idx in range(5)}
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    bulk = True
+    paths: List[str] = []
+
+    def _respond(self, code: int, data: Union[Dict, List]) -> None:
+
+        body = json.dumps(humps.camelize(data)).encode()  # like the real service
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        url = urlsplit(self.path)
+        self.paths.append(url.path)
+        parts = url.path.strip("/").split("/")
+        ids = [id for id in parse_qs(url.query).get("ids", [""])[0].split(",") if id]
+
+        if parts[0] == "bulk" and not self.bulk:
+            self._respond(404, {"message": "Not found."})
+        elif parts == ["bulk", "object_types"]:
+            self._respond(200, [OBJECT_TYPES[id].to_dict() for id in ids if id in OBJECT_TYPES])
+        elif parts == ["bulk", "models"]:
+            self._respond(200, [ObjectModel(Model3dType.BOX, box=BOXES[id]).to_dict() for id in ids if id in BOXES])
+        elif parts[0] == "object_types" and parts[1] in OBJECT_TYPES:
+            self._respond(200, OBJECT_TYPES[parts[1]].to_dict())
+        elif parts[0] == "models" and parts[1] in BOXES:
+            self._respond(200, BOXES[parts[1]].to_dict())
+        else:
+            self._respond(404, {"message": "Not found."})
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture(params=[True, False], ids=["bulk", "fallback"])
+def handler(request, monkeypatch) -> Iterator[Dict]:
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(Handler, "bulk", request.param)
+    monkeypatch.setattr(Handler, "paths", [])
+    monkeypatch.setattr(ps, "URL", f"http://127.0.0.1:{server.server_address[1]}")
+    ps.cache.invalidate()
+
+    yield {"bulk": request.param}
+
+    server.shutdown()
+    server.server_close()
+
+
+IDS = ["Type3", "Type1", "Type3", "Type0"]
+
+
+def test_get_object_types(handler: Dict) -> None:
+
+    assert [obj.id for obj in ps.get_object_types(IDS)] == ["Type3", "Type1", "Type0"]
+    assert len(Handler.paths) == (1 if handler["bulk"] else 4)
+
+    with pytest.raises(ps.ProjectServiceException):
+        ps.get_object_types(["Type1", "Unknown"])
+
+
+def test_get_models(handler: Dict) -> None:
+
+    models = ps.get_models(MetaModel3d(id, Model3dType.BOX) for id in IDS)
+    assert models == [BOXES["Type3"], BOXES["Type1"], BOXES["Type0"]]
+    assert len(Handler.paths) == (1 if handler["bulk"] else 4)
+
+
+def test_aio_get_object_types_and_models(handler: Dict) -> None:
+    async def get() -> None:
+        try:
+            assert [obj.id for obj in await aio_ps.get_object_types(IDS)] == ["Type3", "Type1", "Type0"]
+            assert await aio_ps.get_models([MetaModel3d("Type2", Model3dType.BOX)]) == [BOXES["Type2"]]
+
+            with pytest.raises(ps.ProjectServiceException):
+                await aio_ps.get_object_types(["Unknown"])
+        finally:
+            await aio_rest.close()
+
+    asyncio.run(get())
+    assert len(Handler.paths) == (4 if handler["bulk"] else 8)
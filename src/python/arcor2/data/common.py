@@ -1,10 +1,10 @@
 import math
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from enum import Enum, unique
 from json import JSONEncoder
-from typing import Any, ClassVar, Iterator, List, NamedTuple, Optional, Set, cast
+from typing import Any, ClassVar, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, cast
 
 import numpy as np
 import quaternion
@@ -62,9 +62,21 @@ class DataClassEncoder(JSONEncoder):
 
 @dataclass
 class IterableIndexable(JsonSchemaMixin):
+
+    _field_names: ClassVar[Dict[type, Tuple[str, ...]]] = {}  # cache (per class) of names of fields, in order
+
+    @classmethod
+    def _names(cls) -> Tuple[str, ...]:
+
+        try:
+            return cls._field_names[cls]
+        except KeyError:
+            names = cls._field_names[cls] = tuple(f.name for f in fields(cls))
+            return names
+
     def __getitem__(self, item: int) -> float:
 
-        attr = getattr(self, tuple(self.__dict__.keys())[item])
+        attr = getattr(self, self._names()[item])
         assert isinstance(attr, float)
         return attr
 
@@ -87,7 +99,7 @@ class Position(IterableIndexable):
         if inverse:
             q = q.inverse()
 
-        rotated_vector = quaternion.rotate_vectors([q], [list(self)])[0][0]
+        rotated_vector = quaternion.rotate_vectors(q, (self.x, self.y, self.z)).tolist()
         return Position(rotated_vector[0], rotated_vector[1], rotated_vector[2])
 
     def __eq__(self, other: object) -> bool:
@@ -109,6 +121,8 @@ class Orientation(IterableIndexable):
     z: float = 0.0
     w: float = 1.0
 
+    _UNIT_TOLERANCE: ClassVar[float] = 1e-12
+
     @staticmethod
     def _normalized(q: quaternion.quaternion) -> quaternion.quaternion:
 
@@ -149,7 +163,17 @@ class Orientation(IterableIndexable):
 
         return cast(bool, quaternion.isclose(self.as_quaternion(), other.as_quaternion(), rtol=1.0e-8)[0])
 
-    def __post_init__(self):
+    def __post_init__(self) -> None:
+
+        sq_norm = self.x * self.x + self.y * self.y + self.z * self.z + self.w * self.w
+
+        # already normalized (e.g. coming from another Orientation), just make sure to have floats
+        if math.isclose(sq_norm, 1.0, rel_tol=self._UNIT_TOLERANCE):
+            self.x = float(self.x)
+            self.y = float(self.y)
+            self.z = float(self.z)
+            self.w = float(self.w)
+            return
 
         nq = self.as_quaternion()  # in order to get normalized quaternion
 
@@ -0,0 +1,333 @@
+"""Fast-path JSON (de)serialization of dataclasses (events, RPCs).
+
+JsonSchemaMixin.to_json() resolves an encoder for every field of every
+instance on each call. Here, an encoder is generated once per dataclass type
+and cached. Types that can't be compiled (unions, custom field encoders,
+discriminators) are delegated to JsonSchemaMixin, so the output is always the
+same as of to_dict().
+
+JsonSchemaMixin.from_dict() validates the data against JSON schema, which is
+expensive and unnecessary for data coming from trusted producers (e.g. the
+main script). Therefore, from_dict() here supports several validation modes.
+"""
+
+import json
+import os
+from collections import Counter
+from dataclasses import MISSING, is_dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List, Tuple, Type, TypeVar, Union, get_args, get_origin
+
+from dataclasses_jsonschema import NULL, JsonSchemaMixin, ValidationError
+
+from arcor2.data import DataException
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional dependency
+    orjson = None  # type: ignore
+
+Encoder = Callable[[Any], Any]
+ObjEncoder = Callable[[JsonSchemaMixin], Dict[str, Any]]
+
+_PRIMITIVES = (str, int, float, bool)
+
+_ENCODERS: Dict[Type[JsonSchemaMixin], ObjEncoder] = {}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _encode_dataclass(value: JsonSchemaMixin) -> Dict[str, Any]:
+    # runtime type is used as the value might be an instance of a subclass of the declared type
+    try:
+        return _ENCODERS[type(value)](value)
+    except KeyError:
+        return encoder(type(value))(value)
+
+
+def _field_encoder(owner: Type[JsonSchemaMixin], field_type: Any) -> Encoder:
+    """Returns encoder for a value of the given type or delegates to
+    JsonSchemaMixin where the type is not simple enough."""
+
+    def fallback(value: Any) -> Any:
+        return owner._encode_field(field_type, value, True)
+
+    try:
+        if field_type in owner._field_encoders:
+            return fallback
+    except TypeError:  # unhashable type
+        return fallback
+
+    if field_type in _PRIMITIVES or field_type is Any:
+        return _identity
+
+    if isinstance(field_type, type):
+        if issubclass(field_type, Enum):
+            return lambda value: value.value
+        if issubclass(field_type, JsonSchemaMixin) and is_dataclass(field_type):
+            return _encode_dataclass
+        return fallback
+
+    origin = get_origin(field_type)
+    args = get_args(field_type)
+
+    if origin is Union:
+        not_none = [arg for arg in args if arg is not type(None)]  # noqa: E721
+        if len(not_none) != 1:
+            return fallback
+        enc = _field_encoder(owner, not_none[0])
+        return lambda value: None if value is None else enc(value)
+
+    if origin in (list, set, frozenset) or (origin is tuple and len(args) == 2 and args[1] is Ellipsis):
+        item_enc = _field_encoder(owner, args[0]) if args else _identity
+        if item_enc is _identity:
+            return list
+        return lambda value: [None if item is None else item_enc(item) for item in value]
+
+    if origin is dict and args:
+        key_enc = _field_encoder(owner, args[0])
+        val_enc = _field_encoder(owner, args[1])
+        if key_enc is _identity and val_enc is _identity:
+            return dict
+        return lambda value: {key_enc(k): None if v is None else val_enc(v) for k, v in value.items()}
+
+    return fallback
+
+
+def _compile(cls: Type[JsonSchemaMixin]) -> ObjEncoder:
+
+    if cls._discriminator() is not None:  # type: ignore
+        return lambda obj: obj.to_dict()
+
+    fields = [(f.field.name, f.mapped_name, _field_encoder(cls, f.field.type)) for f in cls._get_fields()]
+
+    def encode(obj: JsonSchemaMixin) -> Dict[str, Any]:
+
+        data: Dict[str, Any] = {}
+
+        for name, mapped_name, enc in fields:
+            value = getattr(obj, name)
+            if value is None:
+                continue
+            if value is NULL:
+                data[mapped_name] = None
+                continue
+            data[mapped_name] = enc(value)
+
+        return data
+
+    return encode
+
+
+def encoder(cls: Type[JsonSchemaMixin]) -> ObjEncoder:
+    """Returns (cached) function converting instances of cls into JSON
+    encodable dicts.
+
+    :param cls: JsonSchemaMixin dataclass.
+    :return: Equivalent of cls.to_dict().
+    """
+
+    try:
+        return _ENCODERS[cls]
+    except KeyError:
+        enc = _ENCODERS[cls] = _compile(cls)
+        return enc
+
+
+def to_dict(obj: JsonSchemaMixin) -> Dict[str, Any]:
+    """Fast equivalent of obj.to_dict()."""
+
+    return _encode_dataclass(obj)
+
+
+def _dumps_std(data: Any) -> str:
+    return json.dumps(data)
+
+
+def _dumps_orjson(data: Any) -> str:
+    try:
+        return orjson.dumps(data).decode()
+    except TypeError:  # e.g. int out of 64-bit range or unsupported subclass - let the standard library deal with it
+        return json.dumps(data)
+
+
+dumps: Callable[[Any], str] = _dumps_std if orjson is None else _dumps_orjson
+BACKEND = "json" if orjson is None else "orjson"
+
+
+def to_json(obj: JsonSchemaMixin) -> str:
+    """Fast equivalent of obj.to_json(). Output is semantically the same,
+    whitespace might differ based on the JSON backend in use.
+
+    :param obj: Event, RPC response or any other JsonSchemaMixin dataclass.
+    :return: JSON string.
+    """
+
+    return dumps(_encode_dataclass(obj))
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+class ValidationMode(Enum):
+    """How thoroughly inbound data are checked before being decoded."""
+
+    FULL = "full"  # validation against JSON schema
+    STRUCTURAL = "structural"  # presence of required fields, types of values, enum values
+    TRUSTED = "trusted"  # no checks, only errors during decoding are reported
+
+
+T = TypeVar("T", bound=JsonSchemaMixin)
+Checker = Callable[[Any, str], None]
+
+_CHECKERS: Dict[Type[JsonSchemaMixin], List[Tuple[str, bool, Checker]]] = {}
+
+STATS: Counter = Counter()  # how many messages were decoded using each validation mode
+
+
+def validation_mode(env_var: str, default: ValidationMode = ValidationMode.FULL) -> ValidationMode:
+    """Gets validation mode from an environment variable.
+
+    :param env_var: Name of the variable (value: full, structural or trusted).
+    :param default: Used when the variable is not set.
+    :return:
+    """
+
+    try:
+        return ValidationMode(os.getenv(env_var, default.value).lower())
+    except ValueError as e:
+        raise DataException(f"Invalid value of {env_var}.") from e
+
+
+def validation_stats() -> Dict[str, int]:
+    return {mode.value: STATS[mode] for mode in ValidationMode}
+
+
+def _no_check(value: Any, path: str) -> None:
+    pass
+
+
+def _type_checker(types: Tuple[type, ...], name: str) -> Checker:
+    def check(value: Any, path: str) -> None:
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            raise ValidationError(f"{path}: {value!r} is not of type '{name}'.")
+
+    return check
+
+
+def _checker(field_type: Any) -> Checker:
+
+    if field_type is str:
+        return _type_checker((str,), "string")
+    if field_type is bool:
+        return _type_checker((bool,), "boolean")
+    if field_type is int:
+        return _type_checker((int,), "integer")
+    if field_type is float:
+        return _type_checker((int, float), "number")
+
+    if isinstance(field_type, type):
+
+        if issubclass(field_type, Enum):
+            values = {member.value for member in field_type}
+
+            def check_enum(value: Any, path: str) -> None:
+                if value not in values:
+                    raise ValidationError(f"{path}: {value!r} is not one of {sorted(values)}.")
+
+            return check_enum
+
+        if issubclass(field_type, JsonSchemaMixin) and is_dataclass(field_type):
+            return lambda value, path: _check_structure(field_type, value, path)
+
+        return _no_check
+
+    origin = get_origin(field_type)
+    args = get_args(field_type)
+
+    if origin is Union:
+        not_none = [arg for arg in args if arg is not type(None)]  # noqa: E721
+        if len(not_none) != 1:
+            return _no_check
+        inner = _checker(not_none[0])
+        return lambda value, path: None if value is None else inner(value, path)
+
+    if origin in (list, set, frozenset, tuple):
+        check_list = _type_checker((list,), "array")
+        item = _checker(args[0]) if origin is not tuple and args else _no_check
+
+        def check_items(value: Any, path: str) -> None:
+            check_list(value, path)
+            if item is not _no_check:
+                for idx, val in enumerate(value):
+                    item(val, f"{path}[{idx}]")
+
+        return check_items
+
+    if origin is dict:
+        check_dict = _type_checker((dict,), "object")
+        val_check = _checker(args[1]) if args else _no_check
+
+        def check_values(value: Any, path: str) -> None:
+            check_dict(value, path)
+            if val_check is not _no_check:
+                for key, val in value.items():
+                    val_check(val, f"{path}.{key}")
+
+        return check_values
+
+    return _no_check
+
+
+def _check_structure(cls: Type[JsonSchemaMixin], data: Any, path: str) -> None:
+
+    if not isinstance(data, dict):
+        raise ValidationError(f"{path}: {data!r} is not of type 'object'.")
+
+    try:
+        checkers = _CHECKERS[cls]
+    except KeyError:
+        checkers = _CHECKERS[cls] = []  # assigned first as there might be a recursive type
+        for f in cls._get_fields():
+            required = (
+                f.field.default is MISSING
+                and f.field.default_factory is MISSING  # type: ignore
+                and not (get_origin(f.field.type) is Union and type(None) in get_args(f.field.type))
+            )
+            checkers.append((f.mapped_name, required, _checker(f.field.type)))
+
+    for name, required, check in checkers:
+        try:
+            value = data[name]
+        except KeyError:
+            if required:
+                raise ValidationError(f"{path}: '{name}' is a required property.")
+            continue
+        if value is not None:
+            check(value, f"{path}.{name}")
+
+
+def from_dict(cls: Type[T], data: Dict[str, Any], mode: ValidationMode = ValidationMode.FULL) -> T:
+    """Creates instance of cls from the data, checked according to the mode.
+
+    :param cls: JsonSchemaMixin dataclass.
+    :param data: Decoded JSON.
+    :param mode: Validation mode.
+    :return: Instance of cls.
+    :raises: ValidationError
+    """
+
+    STATS[mode] += 1
+
+    if mode == ValidationMode.FULL:
+        return cls.from_dict(data)
+
+    if mode == ValidationMode.STRUCTURAL:
+        _check_structure(cls, data, cls.__name__)
+
+    try:
+        return cls.from_dict(data, validate=False)
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise ValidationError(f"{cls.__name__}: {e}") from e
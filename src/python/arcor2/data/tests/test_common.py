@@ -1,6 +1,6 @@
 import pytest
 
-from arcor2.data.common import Orientation
+from arcor2.data.common import Orientation, Position
 from arcor2.exceptions import Arcor2Exception
 
 
@@ -22,3 +22,23 @@ def test_invalid_orientation() -> None:
 
     with pytest.raises(Arcor2Exception):
         o.as_quaternion()
+
+
+def test_orientation_normalization() -> None:
+
+    o = Orientation(0, 0, 0, 2)
+    assert (o.x, o.y, o.z, o.w) == (0.0, 0.0, 0.0, 1.0)
+
+    o = Orientation(0, 0, 0, 1)
+    assert all(isinstance(val, float) for val in o)
+
+    unit = Orientation(0.0, 0.0, 0.7071067811865476, 0.7071067811865476)
+    assert list(unit) == [0.0, 0.0, 0.7071067811865476, 0.7071067811865476]
+    assert unit[2] == 0.7071067811865476
+
+
+def test_position_indexing() -> None:
+
+    p = Position(1.0, 2.0, 3.0)
+    assert [p[0], p[1], p[2]] == [1.0, 2.0, 3.0]
+    assert list(p) == [1.0, 2.0, 3.0]
@@ -0,0 +1,108 @@
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pytest
+from dataclasses_jsonschema import JsonSchemaMixin, ValidationError
+
+from arcor2.data import common, events
+from arcor2.data import serialization as ser
+from arcor2.data.rpc.common import RPC
+
+
+@dataclass
+class JointsEvent(events.Event):
+    @dataclass
+    class Data(JsonSchemaMixin):
+        robot_id: str
+        joints: List[common.Joint]
+        state: Optional[events.PackageState.Data.StateEnum] = None
+        extra: Dict[str, common.Pose] = field(default_factory=dict)
+
+    data: Data
+
+
+@dataclass
+class PoseResponse(RPC.Response):
+    data: Optional[List[common.Pose]] = None
+
+
+def _check(obj: JsonSchemaMixin) -> None:
+
+    assert ser.to_dict(obj) == obj.to_dict()
+    assert json.loads(ser.to_json(obj)) == json.loads(obj.to_json())
+
+
+def test_event() -> None:
+
+    evt = JointsEvent(
+        JointsEvent.Data(
+            "robot",
+            [common.Joint(f"j{idx}", idx * 0.1) for idx in range(6)],
+            events.PackageState.Data.StateEnum.RUNNING,
+            {"eef": common.Pose(common.Position(1, 2, 3), common.Orientation(0, 0, 1, 0))},
+        )
+    )
+    evt.change_type = events.Event.Type.UPDATE
+    _check(evt)
+
+    evt.data.state = None  # omitted
+    _check(evt)
+    assert "parent_id" not in ser.to_dict(evt)
+
+
+def test_response() -> None:
+
+    _check(PoseResponse(1, False, ["error"]))
+    _check(PoseResponse(2, data=[common.Pose(), common.Pose(common.Position(0.1, 0.2, 0.3))]))
+
+
+def test_nested_subclass() -> None:
+
+    scene = common.Scene("s1", "scene")
+    scene.objects.append(common.SceneObject("o1", "obj", "Type", common.Pose()))
+    project = common.Project("p1", "project", "s1")
+    ap = common.ActionPoint("ap1", "ap", common.Position(), "o1")
+    ap.orientations.append(common.NamedOrientation("o1", "default", common.Orientation()))
+    project.action_points.append(ap)
+
+    _check(events.PackageInfo(events.PackageInfo.Data("pkg", "package", scene, project)))
+
+
+def test_encoder_is_cached() -> None:
+
+    assert ser.encoder(common.Pose) is ser.encoder(common.Pose)
+
+
+@pytest.mark.parametrize("mode", list(ser.ValidationMode))
+def test_from_dict(mode: ser.ValidationMode) -> None:
+
+    evt = JointsEvent(JointsEvent.Data("robot", [common.Joint("j1", 1.0)], events.PackageState.Data.StateEnum.PAUSED))
+    before = ser.validation_stats()[mode.value]
+
+    assert ser.from_dict(JointsEvent, evt.to_dict(), mode) == evt
+    assert ser.validation_stats()[mode.value] == before + 1
+
+
+@pytest.mark.parametrize("mode", [ser.ValidationMode.FULL, ser.ValidationMode.STRUCTURAL])
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"event": "JointsEvent"},  # missing data
+        {"event": "JointsEvent", "data": {"robot_id": "robot"}},  # missing joints
+        {"event": "JointsEvent", "data": {"robot_id": 1, "joints": []}},
+        {"event": "JointsEvent", "data": {"robot_id": "robot", "joints": {}}},
+        {"event": "JointsEvent", "data": {"robot_id": "robot", "joints": [{"name": "j1", "value": "1"}]}},
+        {"event": "JointsEvent", "data": {"robot_id": "robot", "joints": [], "state": "unknown"}},
+    ],
+)
+def test_from_dict_invalid(mode: ser.ValidationMode, data: Dict) -> None:
+
+    with pytest.raises(ValidationError):
+        ser.from_dict(JointsEvent, data, mode)
+
+
+def test_from_dict_trusted_invalid() -> None:
+
+    with pytest.raises(ValidationError):
+        ser.from_dict(JointsEvent, {"event": "JointsEvent", "data": "robot"}, ser.ValidationMode.TRUSTED)
@@ -1,4 +1,5 @@
 import functools
+import inspect
 from typing import Any, Callable, Optional, Type, TypeVar, cast
 
 from arcor2.exceptions import Arcor2Exception
@@ -11,17 +12,33 @@ def handle(
     except_type: Type[Arcor2Exception] = Arcor2Exception,
     message: Optional[str] = None,
 ) -> Callable[[F], F]:
+    def _raise(e: Arcor2Exception) -> None:
+        if message is not None:
+            raise raise_type(message) from e
+        else:
+            raise raise_type(str(e)) from e
+
     def _handle_exceptions(func: F) -> F:
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+
+                try:
+                    return await func(*args, **kwargs)
+                except except_type as e:
+                    _raise(e)
+
+            return cast(F, async_wrapper)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
 
             try:
                 return func(*args, **kwargs)
             except except_type as e:
-                if message is not None:
-                    raise raise_type(message) from e
-                else:
-                    raise raise_type(str(e)) from e
+                _raise(e)
 
         return cast(F, wrapper)
 
@@ -3,7 +3,8 @@ from dataclasses import dataclass
 
 from arcor2.data.common import Parameter, StrEnum
 from arcor2.object_types.abstract import Generic, Settings
-from arcor2.object_types.utils import settings_from_params
+from arcor2.object_types.utils import base_from_ast, base_from_source, settings_from_params
+from arcor2.source.utils import parse
 
 
 class MyEnum(StrEnum):
@@ -51,3 +52,12 @@ def test_settings_from_params() -> None:
     )
 
     assert isinstance(settings, TestObjectSettings)
+
+
+def test_base_from_ast() -> None:
+
+    source = "class MyType(Mixin, Generic):\n    pass\n\n\nclass Other:\n    pass\n"
+
+    assert base_from_ast(parse(source), "MyType") == "Generic"
+    assert base_from_ast(parse(source), "Other") is None
+    assert base_from_source(source, "MyType") == "Generic"
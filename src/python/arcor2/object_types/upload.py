@@ -1,6 +1,6 @@
 import os
+import tempfile
 import zipfile
-from io import BytesIO
 from typing import List, NamedTuple, Optional, Type
 
 from arcor2.clients import persistent_storage as storage
@@ -61,13 +61,15 @@ def upload_def(type_def: Type[Generic], model: Optional[Models] = None, urdf: Op
 
         prefix = os.path.commonpath(paths)
 
-        mem_zip = BytesIO()
-        with zipfile.ZipFile(mem_zip, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for root, _, files in os.walk(urdf.path_to_directory):
-                for filename in files:
-                    path = os.path.join(root, filename)
-                    # in the archive, the path will be without the prefix
-                    zf.write(path, os.path.relpath(path, prefix))
+        with tempfile.TemporaryDirectory() as tmp_dir:
 
-        mem_zip.seek(0)
-        storage.upload_mesh_file(urdf.archive_name, mem_zip.getvalue())
+            path_to_zip = os.path.join(tmp_dir, urdf.archive_name)
+
+            with zipfile.ZipFile(path_to_zip, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for root, _, files in os.walk(urdf.path_to_directory):
+                    for filename in files:
+                        path = os.path.join(root, filename)
+                        # in the archive, the path will be without the prefix
+                        zf.write(path, os.path.relpath(path, prefix))
+
+            storage.upload_mesh_file_from_path(urdf.archive_name, path_to_zip)
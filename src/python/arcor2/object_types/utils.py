@@ -5,13 +5,13 @@ from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Ty
 
 import typing_inspect
 from dataclasses_jsonschema import JsonSchemaMixin, ValidationError
-from typed_ast.ast3 import Name
+from typed_ast.ast3 import AST, Name
 
 import arcor2
 from arcor2.data.common import ActionMetadata, Parameter
 from arcor2.exceptions import Arcor2Exception
 from arcor2.object_types.abstract import Generic, Settings
-from arcor2.source.utils import find_class_def, parse
+from arcor2.source.utils import find_class_def, parse_cached
 
 
 class ObjectTypeException(Arcor2Exception):
@@ -42,7 +42,7 @@ def check_object_type(type_def: Type[Generic]) -> None:
 
     # it might happen that the code is ok, but can't be parsed e.g. due to unsupported placement of comment
     # parse_def is not enough here - there might be something unparseable outside of the ObjectType class itself
-    parse(get_containing_module_sources(type_def))
+    parse_cached(get_containing_module_sources(type_def))
 
     # TODO some more (simple) checks here?
 
@@ -164,8 +164,12 @@ def get_settings_def(type_def: Type[Generic]) -> Type[Settings]:
 
 
 def base_from_source(source: str, cls_name: str) -> Optional[str]:
+    return base_from_ast(parse_cached(source, comments=False), cls_name)
 
-    cls_def = find_class_def(cls_name, parse(source))
+
+def base_from_ast(tree: AST, cls_name: str) -> Optional[str]:
+
+    cls_def = find_class_def(cls_name, tree)
     if not cls_def.bases:
         return None
 
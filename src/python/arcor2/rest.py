@@ -1,16 +1,40 @@
 import json
 import logging
 import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
 from enum import Enum
-from functools import partial
+from functools import lru_cache
 from io import BytesIO
-from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Type, TypeVar, Union, overload
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    IO,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
+from urllib.parse import urlencode, urlsplit
 
 import humps
 import requests
 from dataclasses_jsonschema import JsonSchemaMixin, ValidationError
 from PIL import Image, UnidentifiedImageError
+from requests.adapters import HTTPAdapter
 
+from arcor2.data.serialization import from_dict, to_dict, validation_mode
 from arcor2.exceptions import Arcor2Exception
 from arcor2.logging import get_logger
 
@@ -34,11 +58,11 @@ class RestException(Arcor2Exception):
 class Method(Enum):
     """Enumeration of supported HTTP methods."""
 
-    GET = partial(requests.get)
-    POST = partial(requests.post)
-    PUT = partial(requests.put)
-    DELETE = partial(requests.delete)
-    PATCH = partial(requests.patch)
+    GET = "GET"
+    POST = "POST"
+    PUT = "PUT"
+    DELETE = "DELETE"
+    PATCH = "PATCH"
 
 
 class Timeout(NamedTuple):
@@ -64,19 +88,218 @@ class Timeout(NamedTuple):
 OptTimeout = Optional[Timeout]
 
 
+class CacheStats(NamedTuple):
+
+    hits: int  # responses served from the cache after successful revalidation
+    misses: int  # responses (re)downloaded
+    size: int  # number of cached responses
+
+
+class ResponseCache:
+    """Cache of bodies of GET responses, revalidated using ETag/Last-Modified
+    validators provided by the server.
+
+    The cache is thread-safe, so it might be shared by sync and async
+    clients. Responses without validators are not cached.
+    """
+
+    class Entry(NamedTuple):
+
+        etag: Optional[str]
+        last_modified: Optional[str]
+        content: bytes
+
+        def validators(self) -> Dict[str, str]:
+            """Headers to make the request conditional."""
+
+            ret: Dict[str, str] = {}
+            if self.etag:
+                ret["If-None-Match"] = self.etag
+            if self.last_modified:
+                ret["If-Modified-Since"] = self.last_modified
+            return ret
+
+    def __init__(self, max_size: int = 256) -> None:
+
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, ResponseCache.Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(url: str, params: Dict[str, Primitive]) -> str:
+        return f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+    def lookup(self, key: str) -> Optional["ResponseCache.Entry"]:
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def hit(self, entry: "ResponseCache.Entry") -> bytes:
+
+        with self._lock:
+            self._hits += 1
+        return entry.content
+
+    def store(self, key: str, resp_headers: Mapping[str, str], content: bytes) -> None:
+
+        etag = resp_headers.get("ETag")
+        last_modified = resp_headers.get("Last-Modified")
+
+        with self._lock:
+
+            self._misses += 1
+
+            if not etag and not last_modified:
+                self._entries.pop(key, None)
+                return
+
+            self._entries[key] = self.Entry(etag, last_modified, content)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, prefix: str = "") -> None:
+        """Forgets all responses for URLs starting with the prefix."""
+
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def stats(self) -> CacheStats:
+
+        with self._lock:
+            return CacheStats(self._hits, self._misses, len(self._entries))
+
+
+OptCache = Optional[ResponseCache]
+
+
+class PoolStats(NamedTuple):
+    """Statistics of the connection pool for one host."""
+
+    size: int  # max. number of kept-alive connections
+    connections: int  # number of connections opened so far
+    requests: int  # number of requests made
+    idle: int  # number of connections ready to be reused
+
+
 # module-level variables
 debug: bool = bool(os.getenv("ARCOR2_REST_DEBUG", False))
+validation = validation_mode("ARCOR2_REST_VALIDATION")
+pool_size: int = int(os.getenv("ARCOR2_REST_POOL_SIZE", 10))  # default size of the pool (per host)
 headers = {"accept": "application/json", "content-type": "application/json"}
-session = requests.session()
+CHUNK_SIZE = 64 * 1024  # for streamed transfers
+KEY_CACHE_SIZE = 4096  # max. number of cached camelCase <-> snake_case conversions of keys
 logger = get_logger(__name__, logging.DEBUG if debug else logging.INFO)
 
+# Connection pools (adapters) are shared by all threads, while each thread has its own session as
+# requests.Session is not guaranteed to be thread-safe.
+_adapters: Dict[str, HTTPAdapter] = {}
+_pool_sizes: Dict[str, int] = {}
+_adapters_lock = threading.Lock()
+_local = threading.local()
+
+
+def _host(url: str) -> str:
+
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+def set_pool_size(url: str, size: int) -> None:
+    """Sets maximal number of kept-alive connections to a host.
+
+    Should be called before the first request to the host is made, otherwise
+    the existing pool is discarded.
+
+    :param url: Any URL of the host (only scheme and location are taken into account).
+    :param size: Size of the pool.
+    :return:
+    """
+
+    if size < 1:
+        raise RestException("Invalid pool size.")
+
+    host = _host(url)
+
+    with _adapters_lock:
+        _pool_sizes[host] = size
+        adapter = _adapters.pop(host, None)
+
+    if adapter:
+        adapter.close()
+
+
+def _adapter(host: str) -> HTTPAdapter:
+
+    with _adapters_lock:
+        try:
+            return _adapters[host]
+        except KeyError:
+            size = _pool_sizes.get(host, pool_size)
+            adapter = _adapters[host] = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+            return adapter
+
+
+def _session(url: str) -> requests.Session:
+    """Returns session of the current thread, with a shared connection pool
+    for the URL's host mounted."""
+
+    try:
+        session: requests.Session = _local.session
+        mounted: Dict[str, HTTPAdapter] = _local.mounted
+    except AttributeError:
+        session = _local.session = requests.Session()
+        mounted = _local.mounted = {}
+
+    host = _host(url)
+    adapter = _adapter(host)
+
+    if mounted.get(host) is not adapter:
+        session.mount(host, adapter)
+        mounted[host] = adapter
+
+    return session
+
+
+def pool_stats() -> Dict[str, PoolStats]:
+    """Returns statistics of connection pools, per host."""
+
+    with _adapters_lock:
+        adapters = dict(_adapters)
+
+    stats: Dict[str, PoolStats] = {}
+
+    for host, adapter in adapters.items():
+
+        connections = reqs = idle = 0
+
+        for key in adapter.poolmanager.pools.keys():
+            pool = adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            reqs += pool.num_requests
+            if pool.pool:
+                idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+
+        stats[host] = PoolStats(adapter._pool_maxsize, connections, reqs, idle)  # type: ignore
+
+    return stats
+
 
 def dataclass_from_json(resp_json: Dict[str, Any], return_type: Type[DataClass]) -> DataClass:
 
     try:
-        return return_type.from_dict(resp_json)
+        return from_dict(return_type, resp_json, validation)
     except ValidationError as e:
-        logger.debug(f'{return_type.__name__}: validation error "{e}" while parsing "{resp_json}".')
+        logger.debug('%s: validation error "%s" while parsing "%s".', return_type.__name__, e, resp_json)
         raise RestException("Invalid data.", str(e)) from e
 
 
@@ -85,7 +308,7 @@ def primitive_from_json(resp_json: Primitive, return_type: Type[Primitive]) -> P
     try:
         return return_type(resp_json)
     except ValueError as e:
-        logger.debug(f'{return_type.__name__}: error  "{e}" while parsing "{resp_json}".')
+        logger.debug('%s: error "%s" while parsing "%s".', return_type.__name__, e, resp_json)
         raise RestException(e) from e
 
 
@@ -99,6 +322,7 @@ def call(
     params: OptParams = None,
     files: OptFiles = None,
     timeout: OptTimeout = None,
+    cache: OptCache = None,
 ) -> None:
     ...
 
@@ -114,6 +338,7 @@ def call(
     params: OptParams = None,
     files: OptFiles = None,
     timeout: OptTimeout = None,
+    cache: OptCache = None,
 ) -> Primitive:
     ...
 
@@ -128,6 +353,7 @@ def call(
     params: OptParams = None,
     files: OptFiles = None,
     timeout: OptTimeout = None,
+    cache: OptCache = None,
 ) -> DataClass:
     ...
 
@@ -142,6 +368,7 @@ def call(
     params: OptParams = None,
     files: OptFiles = None,
     timeout: OptTimeout = None,
+    cache: OptCache = None,
 ) -> BytesIO:
     ...
 
@@ -157,6 +384,7 @@ def call(
     params: OptParams = None,
     files: OptFiles = None,
     timeout: OptTimeout = None,
+    cache: OptCache = None,
 ) -> List[Primitive]:
     ...
 
@@ -171,6 +399,7 @@ def call(
     params: OptParams = None,
     files: OptFiles = None,
     timeout: OptTimeout = None,
+    cache: OptCache = None,
 ) -> List[DataClass]:
     ...
 
@@ -185,6 +414,7 @@ def call(
     params: OptParams = None,
     files: OptFiles = None,
     timeout: OptTimeout = None,
+    cache: OptCache = None,
 ) -> List[BytesIO]:
     ...
 
@@ -199,6 +429,7 @@ def call(
     params: OptParams = None,
     files: OptFiles = None,
     timeout: OptTimeout = None,
+    cache: OptCache = None,
 ) -> ReturnValue:
     """Universal function for calling REST APIs.
 
@@ -210,52 +441,53 @@ def call(
     :param params: Path parameters.
     :param files: Instead of body, it is possible to send files.
     :param timeout: Specific timeout for a call.
+    :param cache: If set, response of GET request is cached and revalidated next time.
     :return: Return value/type is given by return_type/list_return_type. If both are None, nothing will be returned.
     """
-    logger.debug(f"{method} {url}, body: {body}, params: {params}, files: {files is not None}, timeout: {timeout}")
-
-    if body and files:
-        raise RestException("Can't send data and files at the same time.")
+    logger.debug(
+        "%s %s, body: %s, params: %s, files: %s, timeout: %s", method, url, body, params, files is not None, timeout
+    )
 
-    if return_type and list_return_type:
-        raise RestException("Only one argument from 'return_type' and 'list_return_type' can be used.")
+    check_call_args(body, files, return_type, list_return_type)
 
     if return_type is None:
         return_type = list_return_type
 
-    # prepare data into dict
-    if isinstance(body, JsonSchemaMixin):
-        d = humps.camelize(body.to_dict())
-    elif isinstance(body, list):
-        d = []
-        for dd in body:
-            if isinstance(dd, JsonSchemaMixin):
-                d.append(humps.camelize(dd.to_dict()))
-            else:
-                d.append(dd)
-    elif body is not None:
-        raise RestException("Unsupported type of data.")
-    else:
-        d = {}
-
-    if params:
-        params = humps.camelize(params)
-    else:
-        params = {}
+    d = prepare_body(body)
+    params = prepare_params(params)
 
     if timeout is None:
         timeout = Timeout()
 
+    if method != Method.GET:
+        cache = None
+
+    cache_key = ResponseCache.key(url, params) if cache else ""
+    cached = cache.lookup(cache_key) if cache else None
+
     try:
         if files:
-            resp = method.value(url, files=files, timeout=timeout, params=params)
+            resp = _session(url).request(method.value, url, files=files, timeout=timeout, params=params)
         else:
-            resp = method.value(url, data=json.dumps(d), timeout=timeout, headers=headers, params=params)
+            resp = _session(url).request(
+                method.value,
+                url,
+                data=json.dumps(d),
+                timeout=timeout,
+                headers={**headers, **cached.validators()} if cached else headers,
+                params=params,
+            )
     except requests.exceptions.RequestException as e:
         logger.debug("Request failed.", exc_info=True)
         raise RestException("Catastrophic system error.", str(e)) from e
 
-    _handle_response(resp)
+    if cache and cached and resp.status_code == requests.codes.not_modified:
+        content = cache.hit(cached)
+    else:
+        _handle_response(resp)
+        content = resp.content
+        if cache:
+            cache.store(cache_key, resp.headers, content)
 
     if return_type is None:
         return None
@@ -265,52 +497,159 @@ def call(
         if list_return_type:
             raise NotImplementedError
 
-        return BytesIO(resp.content)
+        return BytesIO(content)
 
-    logger.debug(f"Response text: {resp.text}")
+    logger.debug("Response content: %r", content)
 
     try:
-        resp_json = resp.json()
+        resp_json = json.loads(content)
     except ValueError as e:
-        logger.debug(f"Got invalid JSON in the response: {resp.text}")
+        logger.debug("Got invalid JSON in the response: %r", content)
         raise RestException("Invalid JSON.") from e
 
-    logger.debug(f"Response json: {resp_json}")
+    return value_from_json(resp_json, return_type, list_return_type is not None)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _camelize_key(key: Any) -> Any:
+    return humps.camelize(key)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _decamelize_key(key: Any) -> Any:
+    return humps.decamelize(key)
+
+
+def _convert_keys(obj: Any, convert: Callable[[Any], Any]) -> Any:
+
+    if isinstance(obj, list):
+        return [_convert_keys(item, convert) for item in obj]
+    if isinstance(obj, dict):
+        return {convert(key): _convert_keys(value, convert) for key, value in obj.items()}
+    return obj
+
+
+def camelize_keys(obj: Any) -> Any:
+    """Same as humps.camelize(obj) for dicts/lists, but conversions of keys are
+    cached (there is usually just a limited set of them)."""
+
+    return _convert_keys(obj, _camelize_key)
+
+
+def decamelize_keys(obj: Any) -> Any:
+    """Same as humps.decamelize(obj) for dicts/lists, with cached conversions
+    of keys."""
+
+    return _convert_keys(obj, _decamelize_key)
+
+
+def check_call_args(body: OptBody, files: OptFiles, return_type: ReturnType, list_return_type: ReturnType) -> None:
+
+    if body and files:
+        raise RestException("Can't send data and files at the same time.")
+
+    if return_type and list_return_type:
+        raise RestException("Only one argument from 'return_type' and 'list_return_type' can be used.")
+
+
+def prepare_body(body: OptBody) -> Union[Dict[str, Any], List[Any]]:
+    """Converts body into a JSON-serializable object with camel-cased keys."""
+
+    if isinstance(body, JsonSchemaMixin):
+        return camelize_keys(to_dict(body))
+    elif isinstance(body, list):
+        d: List[Any] = []
+        for dd in body:
+            if isinstance(dd, JsonSchemaMixin):
+                d.append(camelize_keys(to_dict(dd)))
+            else:
+                d.append(dd)
+        return d
+    elif body is not None:
+        raise RestException("Unsupported type of data.")
+
+    return {}
+
+
+def prepare_params(params: OptParams) -> Dict[str, Primitive]:
+
+    if params:
+        return camelize_keys(params)
+    return {}
+
+
+def value_from_json(resp_json: Any, return_type: ReturnType, is_list: bool) -> ReturnValue:
+    """Converts (already parsed) JSON response into the return type.
+
+    :param resp_json: Parsed response.
+    :param return_type: Type of the return value or type of list items.
+    :param is_list: True if list of return_type is expected.
+    :return:
+    """
+
+    assert return_type is not None
+
+    logger.debug("Response json: %s", resp_json)
     if isinstance(resp_json, (dict, list)):
-        resp_json = humps.decamelize(resp_json)
-    logger.debug(f"Decamelized json: {resp_json}")
+        resp_json = decamelize_keys(resp_json)
+    logger.debug("Decamelized json: %s", resp_json)
 
-    if list_return_type and not isinstance(resp_json, list):
-        logger.debug(f"Expected list of type {return_type}, but got {resp_json}.")
+    if is_list and not isinstance(resp_json, list):
+        logger.debug("Expected list of type %s, but got %s.", return_type, resp_json)
         raise RestException("Response is not a list.")
 
     if issubclass(return_type, JsonSchemaMixin):
 
-        if list_return_type:
-            return [dataclass_from_json(item, return_type) for item in resp_json]
+        if is_list:
+            return [dataclass_from_json(_box_workaround(item, return_type), return_type) for item in resp_json]
 
         else:
             assert not isinstance(resp_json, list)
-
-            # TODO temporary workaround for bug in humps (https://github.com/nficano/humps/issues/127)
-            from arcor2.data.object_type import Box
-
-            if return_type is Box:
-                resp_json["size_x"] = resp_json["sizex"]
-                resp_json["size_y"] = resp_json["sizey"]
-                resp_json["size_z"] = resp_json["sizez"]
-
-            return dataclass_from_json(resp_json, return_type)
+            return dataclass_from_json(_box_workaround(resp_json, return_type), return_type)
 
     else:  # probably a primitive
 
-        if list_return_type:
+        if is_list:
             return [primitive_from_json(item, return_type) for item in resp_json]
         else:
             assert not isinstance(resp_json, list)
             return primitive_from_json(resp_json, return_type)
 
 
+def _box_workaround(data: Dict[str, Any], return_type: Type[JsonSchemaMixin]) -> Dict[str, Any]:
+
+    # TODO temporary workaround for bug in humps (https://github.com/nficano/humps/issues/127)
+    from arcor2.data.object_type import Box, ObjectModel
+
+    if return_type is ObjectModel:
+        box = data.get("box")
+    elif return_type is Box:
+        box = data
+    else:
+        return data
+
+    if isinstance(box, dict) and "sizex" in box:
+        box["size_x"] = box.pop("sizex")
+        box["size_y"] = box.pop("sizey")
+        box["size_z"] = box.pop("sizez")
+
+    return data
+
+
+def exception_from_content(content: bytes) -> RestException:
+    """Creates exception from a body of an unsuccessful response."""
+
+    try:
+        resp_body = json.loads(content)
+    except json.JSONDecodeError:
+        return RestException(content.decode("utf-8"))
+
+    try:
+        return RestException(resp_body["message"])
+    except (KeyError, TypeError):  # TypeError is for case when resp_body is just string
+        return RestException(str(resp_body))
+
+
 def _handle_response(resp: requests.Response) -> None:
     """Raises exception if there is something wrong with the response.
 
@@ -321,31 +660,191 @@ def _handle_response(resp: requests.Response) -> None:
     try:
         resp.raise_for_status()
     except requests.exceptions.RequestException as e:
+        raise exception_from_content(resp.content) from e
 
-        try:
-            resp_body = json.loads(resp.content)
-        except json.JSONDecodeError:
-            raise RestException(resp.content.decode("utf-8")) from e
 
+@contextmanager
+def _stream(method: Method, url: str, params: OptParams, timeout: OptTimeout, **kwargs) -> Iterator[requests.Response]:
+    """Makes request, without reading body of the response."""
+
+    logger.debug("%s %s (streamed), params: %s, timeout: %s", method, url, params, timeout)
+
+    if timeout is None:
+        timeout = Timeout()
+
+    try:
+        resp = _session(url).request(
+            method.value, url, params=prepare_params(params), timeout=timeout, stream=True, **kwargs
+        )
+    except requests.exceptions.RequestException as e:
+        logger.debug("Request failed.", exc_info=True)
+        raise RestException("Catastrophic system error.", str(e)) from e
+
+    with resp:  # returns the connection to the pool even if the body was not read completely
+        _handle_response(resp)
+        yield resp
+
+
+def iter_content(
+    url: str, params: OptParams = None, chunk_size: int = CHUNK_SIZE, timeout: OptTimeout = None
+) -> Iterator[bytes]:
+    """Yields body of the response in chunks, as they arrive.
+
+    :param url: Resource address.
+    :param params: Path parameters.
+    :param chunk_size: Max. size of one chunk.
+    :param timeout: Specific timeout for a call.
+    :return:
+    """
+
+    with _stream(Method.GET, url, params, timeout) as resp:
         try:
-            raise RestException(resp_body["message"]) from e
-        except (KeyError, TypeError):  # TypeError is for case when resp_body is just string
-            raise RestException(str(resp_body)) from e
+            yield from resp.iter_content(chunk_size)
+        except requests.exceptions.RequestException as e:
+            raise RestException("Failed to read the response.", str(e)) from e
+
+
+def download_into(url: str, buffer: Union[bytearray, memoryview], params: OptParams = None) -> int:
+    """Reads body of the response into a pre-allocated buffer.
+
+    :param url: Resource address.
+    :param buffer: Writable buffer, large enough to hold the whole body.
+    :param params: Path parameters.
+    :return: Number of bytes written into the buffer.
+    """
+
+    view = memoryview(buffer).cast("B")
+    pos = 0
+
+    for chunk in iter_content(url, params):
+        end = pos + len(chunk)
+        if end > len(view):
+            raise RestException("Buffer is too small.")
+        view[pos:end] = chunk
+        pos = end
+
+    return pos
 
 
 def get_image(url: str) -> Image.Image:
     """Shortcut for getting an image."""
 
+    buff = BytesIO()
+
+    for chunk in iter_content(url):
+        buff.write(chunk)
+
+    buff.seek(0)
+
     # TODO check content type?
     try:
-        return Image.open(call(Method.GET, url, return_type=BytesIO))
+        return Image.open(buff)
     except (UnidentifiedImageError, TypeError) as e:
         raise RestException("Invalid image.") from e
 
 
+@contextmanager
+def replaced_file(path: str) -> Iterator[IO[bytes]]:
+    """Yields a temporary file which replaces the file at path once the block
+    finishes without an exception.
+
+    On failure, the temporary file is removed and the original file (if any) is kept intact.
+    """
+
+    file = tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or None, delete=False)
+
+    try:
+        with file:
+            yield file
+        os.replace(file.name, path)
+    except BaseException:
+        os.unlink(file.name)
+        raise
+
+
 def download(url: str, path: str, params: OptParams = None) -> None:
-    """Shortcut for saving a file to disk."""
+    """Shortcut for saving a file to disk.
+
+    The body is written into the file as it arrives, so memory consumption
+    does not depend on its size. The file is replaced only once the whole body
+    is received.
+    """
+
+    with replaced_file(path) as file:
+        for chunk in iter_content(url, params):
+            file.write(chunk)
+
+
+class MultipartStream:
+    """File-like object producing multipart/form-data body with one file, read
+    lazily from the underlying file object."""
+
+    def __init__(self, field: str, file: BinaryIO, size: int, filename: Optional[str] = None) -> None:
+
+        self.boundary = uuid.uuid4().hex
+
+        preamble = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename or field}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        epilogue = f"\r\n--{self.boundary}--\r\n".encode()
+
+        self._parts: List[BinaryIO] = [BytesIO(preamble), file, BytesIO(epilogue)]
+        self._len = len(preamble) + size + len(epilogue)
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._len
+
+    def read(self, size: int = -1) -> bytes:
+
+        if size is None or size < 0:
+            return b"".join(part.read() for part in self._parts)
+
+        chunks: List[bytes] = []
+        while self._parts and size > 0:
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+
+def upload(
+    method: Method,
+    url: str,
+    field: str,
+    file: Union[str, BinaryIO],
+    params: OptParams = None,
+    timeout: OptTimeout = None,
+) -> None:
+    """Uploads a file as multipart/form-data, without reading it into memory.
+
+    :param method: HTTP method.
+    :param url: Resource address.
+    :param field: Name of the form field.
+    :param file: Path to the file or a file object (opened in binary mode).
+    :param params: Path parameters.
+    :param timeout: Specific timeout for a call.
+    :return:
+    """
+
+    with ExitStack() as stack:
+
+        if isinstance(file, str):
+            file = stack.enter_context(open(file, "rb"))
+
+        pos = file.tell()
+        size = file.seek(0, os.SEEK_END) - pos
+        file.seek(pos)
+
+        stream = MultipartStream(field, file, size, os.path.basename(getattr(file, "name", field)))
 
-    with call(Method.GET, url, return_type=BytesIO, params=params) as buff:
-        with open(path, "wb") as file:
-            file.write(buff.getvalue())
+        with _stream(method, url, params, timeout, data=stream, headers={"content-type": stream.content_type}):
+            pass
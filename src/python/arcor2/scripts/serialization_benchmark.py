@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import argparse
+import timeit
+from dataclasses import dataclass
+from typing import Callable, List
+
+from dataclasses_jsonschema import JsonSchemaMixin
+
+from arcor2.data import common, events
+from arcor2.data import serialization as ser
+
+
+@dataclass
+class RobotState(events.Event):
+    """Mimics the shape of RobotJoints/RobotEef events streamed to UIs."""
+
+    @dataclass
+    class Data(JsonSchemaMixin):
+        robot_id: str
+        joints: List[common.Joint]
+        eef_poses: List[common.Pose]
+
+    data: Data
+
+
+def _package_info(aps: int) -> events.PackageInfo:
+
+    scene = common.Scene("scene", "scene")
+    project = common.Project("project", "project", scene.id)
+
+    for idx in range(aps):
+        ap = common.ActionPoint(f"ap{idx}", f"ap{idx}", common.Position(idx, idx, idx))
+        ap.orientations.append(common.NamedOrientation(f"ori{idx}", "default", common.Orientation()))
+        ap.robot_joints.append(
+            common.ProjectRobotJoints(f"j{idx}", "default", "robot", [common.Joint(str(j), j) for j in range(6)])
+        )
+        project.action_points.append(ap)
+
+    return events.PackageInfo(events.PackageInfo.Data("pkg", "pkg", scene, project))
+
+
+def _report(name: str, obj: JsonSchemaMixin, iterations: int) -> None:
+    def measure(func: Callable[[], str]) -> float:
+        return iterations / min(timeit.repeat(func, number=iterations, repeat=3))
+
+    ref = measure(obj.to_json)
+    fast = measure(lambda: ser.to_json(obj))
+
+    print(f"{name:<12} to_json: {ref:>10.0f}/s  fast ({ser.BACKEND}): {fast:>10.0f}/s  speedup: {fast / ref:.1f}x")
+
+
+def main() -> None:
+
+    parser = argparse.ArgumentParser(description="Compares throughput of to_json() and the fast-path serializer.")
+    parser.add_argument("-i", "--iterations", type=int, default=10000)
+    args = parser.parse_args()
+
+    robot_state = RobotState(
+        RobotState.Data(
+            "robot", [common.Joint(f"joint_{idx}", idx * 0.1) for idx in range(7)], [common.Pose() for _ in range(2)]
+        )
+    )
+
+    _report("RobotState", robot_state, args.iterations)
+    _report("PackageInfo", _package_info(50), max(args.iterations // 100, 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import pytest
+
+from arcor2.source import SourceException
+from arcor2.source.utils import find_class_def, parse, parse_cached
+
+SOURCE = """
+class MyType(Generic):  # comment
+    pass
+"""
+
+
+def test_parse_cached() -> None:
+
+    parse_cached.cache_clear()
+
+    tree = parse_cached(SOURCE)
+    assert parse_cached(SOURCE) is tree
+    assert parse_cached(SOURCE, comments=False) is not tree
+    assert parse_cached.cache_info().hits == 1
+
+    assert find_class_def("MyType", parse_cached(SOURCE, comments=False))
+
+
+def test_parse_invalid() -> None:
+
+    with pytest.raises(SourceException):
+        parse("class :")
+
+    with pytest.raises(SourceException):
+        parse_cached("class :", comments=False)
@@ -1,10 +1,13 @@
 import importlib
 import inspect
+import os
+from functools import lru_cache
 from typing import List, Optional, Type, Union
 
 import autopep8
 import horast
 import typed_astunparse
+from typed_ast import ast3
 from typed_ast.ast3 import (
     AST,
     Assert,
@@ -29,18 +32,41 @@ from typed_ast.ast3 import (
 
 from arcor2.source import SourceException
 
+# max. number of trees kept by parse_cached
+AST_CACHE_SIZE = int(os.getenv("ARCOR2_AST_CACHE_SIZE", 256))
 
-def parse(source: str) -> AST:
+
+def parse(source: str, comments: bool = True) -> AST:
+    """Parses the source code.
+
+    :param source: Python code.
+    :param comments: Whether to keep comments. Parsing without them is much faster.
+    :return:
+    """
 
     try:
-        return horast.parse(source)
+        return horast.parse(source) if comments else ast3.parse(source)
     except (AssertionError, NotImplementedError, SyntaxError, ValueError) as e:
         raise SourceException("Failed to parse the code.") from e
 
 
+@lru_cache(maxsize=AST_CACHE_SIZE)
+def parse_cached(source: str, comments: bool = True) -> AST:
+    """Same as parse, but trees of recently parsed sources are kept and
+    reused (the least recently used ones are evicted).
+
+    The trees are shared, so they must not be modified!
+    """
+
+    return parse(source, comments)
+
+
 def parse_def(type_def: Type) -> AST:
+    """Parses the source of the type. The tree comes from parse_cached, so it
+    must not be modified."""
+
     try:
-        return parse(inspect.getsource(type_def))
+        return parse_cached(inspect.getsource(type_def))
     except OSError as e:
         raise SourceException("Failed to get the source code.") from e
 
@@ -0,0 +1,153 @@
+import pytest
+
+from arcor2.cached import CachedProjectException, UpdateableCachedProject, UpdateableCachedScene
+from arcor2.data.common import (
+    Action,
+    ActionPoint,
+    LogicItem,
+    NamedOrientation,
+    Orientation,
+    Position,
+    Project,
+    ProjectRobotJoints,
+    Scene,
+    SceneObject,
+)
+
+
+def test_ap_children() -> None:
+
+    project = Project("p1", "p1", "s1")
+    ap1 = ActionPoint("ap1", "ap1", Position())
+    ap1.actions.append(Action("ac1", "ac1", "Test/test"))
+    ap1.orientations.append(NamedOrientation("o1", "o1", Orientation()))
+    ap1.robot_joints.append(ProjectRobotJoints("j1", "j1", "robot", []))
+    project.action_points.append(ap1)
+    project.action_points.append(ActionPoint("ap2", "ap2", Position()))
+
+    cached = UpdateableCachedProject(project)
+
+    assert cached.ap_action_ids("ap1") == {"ac1"}
+    assert cached.ap_orientation_names("ap1") == {"o1"}
+    assert cached.ap_joint_names("ap1") == {"j1"}
+    assert not cached.ap_actions("ap2")
+
+    cached.upsert_action("ap2", Action("ac2", "ac2", "Test/test"))
+    cached.upsert_action("ap1", Action("ac3", "ac3", "Test/test"))
+    assert [ac.id for ac in cached.ap_actions("ap1")] == ["ac1", "ac3"]
+    assert cached.ap_action_ids("ap2") == {"ac2"}
+
+    cached.remove_action("ac1")
+    assert cached.ap_action_ids("ap1") == {"ac3"}
+
+    cached.upsert_orientation("ap2", NamedOrientation("o2", "o2", Orientation()))
+    cached.remove_orientation("o1")
+    assert not cached.ap_orientations("ap1")
+    assert cached.ap_orientation_names("ap2") == {"o2"}
+
+    cached.remove_action_point("ap1")
+    assert not cached.ap_actions("ap1")
+    assert not cached.ap_joints("ap1")
+    assert cached.action_ids() == {"ac2"}
+
+    proj = cached.project
+    assert len(proj.action_points) == 1
+    assert [ac.id for ac in proj.action_points[0].actions] == ["ac2"]
+    assert [ori.id for ori in proj.action_points[0].orientations] == ["o2"]
+
+
+def test_logic_index() -> None:
+
+    project = Project("p1", "p1", "s1")
+    ap1 = ActionPoint("ap1", "ap1", Position())
+    for idx in range(1, 4):
+        ap1.actions.append(Action(f"ac{idx}", f"ac{idx}", "Test/test"))
+    project.action_points.append(ap1)
+    project.logic.append(LogicItem("l1", LogicItem.START, "ac1"))
+    project.logic.append(LogicItem("l2", "ac1/default", "ac2"))
+
+    cached = UpdateableCachedProject(project)
+
+    assert cached.first_action_id() == "ac1"
+    inputs, outputs = cached.action_io("ac1")
+    assert [inp.id for inp in inputs] == ["l1"]
+    assert [out.id for out in outputs] == ["l2"]
+
+    # item modified in place has to be re-inserted
+    item = cached.logic_item_mut("l2")
+    item.start = "ac3"
+    cached.upsert_logic_item(item)
+    assert not cached.action_io("ac1")[1]
+    assert [out.id for out in cached.action_io("ac3")[1]] == ["l2"]
+
+    cached.upsert_logic_item(LogicItem("l3", LogicItem.START, "ac2"))
+    with pytest.raises(CachedProjectException):
+        cached.first_action_id()
+
+    cached.remove_logic_item("l1")
+    assert cached.first_action_id() == "ac2"
+    assert not cached.action_io("ac1")[0]
+
+    cached.clear_logic()
+    assert not cached.logic
+    with pytest.raises(CachedProjectException):
+        cached.first_action_id()
+
+
+def test_project_copy_on_write() -> None:
+
+    project = Project("p1", "p1", "s1")
+    ap1 = ActionPoint("ap1", "ap1", Position())
+    ap1.actions.append(Action("ac1", "ac1", "Test/test"))
+    ap1.robot_joints.append(ProjectRobotJoints("j1", "j1", "robot", [], is_valid=True))
+    project.action_points.append(ap1)
+
+    cached = UpdateableCachedProject(project)
+    assert cached.actions[0] is ap1.actions[0]  # nothing is copied until needed
+
+    cached.action_mut("ac1").name = "renamed"
+    cached.update_ap_position("ap1", Position(1, 0, 0))
+    assert ap1.actions[0].name == "ac1"
+    assert ap1.robot_joints[0].is_valid
+    assert ap1.position == Position()
+
+    snapshot = cached.snapshot()
+    snapshot.action_mut("ac1").name = "renamed_in_snapshot"
+    snapshot.remove_action_point("ap1")
+    assert cached.action("ac1").name == "renamed"
+    assert cached.action_points_ids == {"ap1"}
+
+    saved = cached.project
+
+    # reading does not copy anything, even after the project was saved
+    assert cached.action("ac1") is saved.action_points[0].actions[0]
+    assert cached.ap_joints("ap1")[0] is saved.action_points[0].robot_joints[0]
+    assert cached.bare_action_point("ap1") is cached.bare_action_point("ap1")
+
+    cached.action_mut("ac1").name = "renamed_again"
+    assert saved.action_points[0].actions[0].name == "renamed"
+    assert saved.action_points[0].position == Position(1, 0, 0)
+
+    cached.update_joints("j1", [])
+    assert cached.joints("j1").is_valid
+    assert not saved.action_points[0].robot_joints[0].is_valid
+
+
+def test_scene_copy_on_write() -> None:
+
+    scene = Scene("s1", "s1")
+    scene.objects.append(SceneObject("id1", "name1", "Type"))
+
+    cached = UpdateableCachedScene(scene)
+    assert cached.object("id1") is scene.objects[0]
+    cached.object_mut("id1").name = "renamed"
+    assert scene.objects[0].name == "name1"
+
+    saved = cached.scene
+    assert cached.object("id1") is saved.objects[0]
+
+    snapshot = cached.snapshot()
+    snapshot.object_mut("id1").name = "renamed_in_snapshot"
+    cached.object_mut("id1").name = "renamed_again"
+    assert saved.objects[0].name == "renamed"
+    assert snapshot.object("id1").name == "renamed_in_snapshot"
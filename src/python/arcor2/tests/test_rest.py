@@ -0,0 +1,253 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, List
+
+import humps
+import pytest
+
+from arcor2 import aio_rest, rest
+from arcor2.data.common import Position
+
+DATA = bytes(range(256)) * 1000
+ETAG = '"v1"'
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+    uploaded: List[bytes] = []
+
+    def _respond(self, code: int, body: bytes, etag: str = "") -> None:
+
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))  # rest.call always sends a body
+
+        if self.path.startswith("/error"):
+            self._respond(404, json.dumps({"message": "Not found."}).encode())
+        elif self.path.startswith("/data"):
+            self._respond(200, DATA)
+        elif self.path.startswith("/truncated"):  # connection drops in the middle of the body
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(DATA)))
+            self.end_headers()
+            self.wfile.write(DATA[: len(DATA) // 2])
+            self.close_connection = True
+        elif self.path.startswith("/cached"):
+            if self.headers.get("If-None-Match") == ETAG:
+                self._respond(304, b"", ETAG)
+            else:
+                self._respond(200, json.dumps({"x": 1.0, "y": 2.0, "z": 3.0}).encode(), ETAG)
+        elif self.path.startswith("/query"):  # query string is sent back
+            self._respond(200, json.dumps(self.path.partition("?")[2]).encode())
+        elif self.path.startswith("/positions"):
+            self._respond(200, json.dumps([{"x": 1.0, "y": 2.0, "z": 3.0}] * 2).encode())
+        else:
+            self._respond(200, json.dumps({"x": 1.0, "y": 2.0, "z": 3.0}).encode())
+
+    def do_PUT(self) -> None:  # noqa: N802
+
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+
+        if self.path.startswith("/upload"):
+            assert self.headers["Content-Type"].startswith("multipart/form-data; boundary=")
+            self.uploaded.append(body)
+
+        self._respond(200, body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture()
+def url() -> Iterator[str]:
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_keep_alive(url: str) -> None:
+
+    for _ in range(5):
+        assert rest.call(rest.Method.GET, f"{url}/position", return_type=Position) == Position(1, 2, 3)
+
+    stats = rest.pool_stats()[f"{url}/"]
+    assert stats.connections == 1
+    assert stats.requests == 5
+    assert stats.idle == 1
+
+
+def test_pool_size(url: str) -> None:
+
+    rest.set_pool_size(url, 2)
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(lambda _: rest.call(rest.Method.GET, url, return_type=Position), range(20)))
+
+    assert all(res == Position(1, 2, 3) for res in results)
+
+    stats = rest.pool_stats()[f"{url}/"]
+    assert stats.size == 2
+    assert stats.requests == 20
+    assert stats.idle <= 2
+
+    with pytest.raises(rest.RestException):
+        rest.set_pool_size(url, 0)
+
+
+def test_aio_call(url: str) -> None:
+    async def calls() -> None:
+
+        pos = Position(1, 2, 3)
+
+        assert await aio_rest.call(rest.Method.GET, url, return_type=Position) == pos
+        assert await aio_rest.call(rest.Method.GET, f"{url}/positions", list_return_type=Position) == [pos, pos]
+        assert await aio_rest.call(rest.Method.PUT, url, body=Position(4, 5, 6), return_type=Position) == Position(
+            4, 5, 6
+        )
+        assert len(await asyncio.gather(*[aio_rest.call(rest.Method.GET, url) for _ in range(50)])) == 50
+
+        with pytest.raises(rest.RestException, match="Not found."):
+            await aio_rest.call(rest.Method.GET, f"{url}/error")
+
+        await aio_rest.close()
+
+    asyncio.run(calls())
+
+
+def test_aio_params(url: str) -> None:
+
+    params = {"flag": True, "some_value": 1.5, "name": "x"}
+    query = rest.call(rest.Method.GET, f"{url}/query", params=params, return_type=str)
+    assert query == "flag=True&someValue=1.5&name=x"
+
+    async def call() -> str:
+        try:
+            return await aio_rest.call(rest.Method.GET, f"{url}/query", params=params, return_type=str)
+        finally:
+            await aio_rest.close()
+
+    assert asyncio.run(call()) == query
+
+
+def test_download(url: str, tmp_path: Path) -> None:
+
+    path = str(tmp_path / "data.bin")
+    rest.download(f"{url}/data", path)
+
+    with open(path, "rb") as file:
+        assert file.read() == DATA
+
+    assert b"".join(rest.iter_content(f"{url}/data", chunk_size=1000)) == DATA
+
+    buffer = bytearray(len(DATA) + 10)
+    assert rest.download_into(f"{url}/data", buffer) == len(DATA)
+    assert buffer[: len(DATA)] == DATA
+
+    with pytest.raises(rest.RestException):
+        rest.download_into(f"{url}/data", bytearray(10))
+
+    path = str(tmp_path / "aio_data.bin")
+
+    async def aio_download() -> None:
+        await aio_rest.download(f"{url}/data", path)
+        await aio_rest.close()
+
+    asyncio.run(aio_download())
+
+    with open(path, "rb") as file:
+        assert file.read() == DATA
+
+
+def test_failed_download(url: str, tmp_path: Path) -> None:
+
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"original")
+
+    with pytest.raises(rest.RestException, match="Not found."):
+        rest.download(f"{url}/error", str(path))
+
+    with pytest.raises(rest.RestException):
+        rest.download(f"{url}/truncated", str(path))
+
+    async def aio_downloads() -> None:
+
+        with pytest.raises(rest.RestException, match="Not found."):
+            await aio_rest.download(f"{url}/error", str(path))
+
+        with pytest.raises(rest.RestException):
+            await aio_rest.download(f"{url}/truncated", str(path))
+
+        await aio_rest.close()
+
+    asyncio.run(aio_downloads())
+
+    # neither the original file was damaged nor temporary files were left behind
+    assert path.read_bytes() == b"original"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_upload(url: str, tmp_path: Path) -> None:
+
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+
+    Handler.uploaded.clear()
+    rest.upload(rest.Method.PUT, f"{url}/upload", "file", str(path))
+
+    body = Handler.uploaded[0]
+    assert b'name="file"; filename="data.bin"' in body
+    assert DATA in body
+
+
+def test_convert_keys() -> None:
+
+    data = {"action_points": [{"robot_joints": [{"is_valid": True, "joints": [1, 2]}], "parent": None}], "id": "x"}
+
+    assert rest.camelize_keys(data) == humps.camelize(data)
+    assert rest.decamelize_keys(rest.camelize_keys(data)) == humps.decamelize(humps.camelize(data)) == data
+    assert rest.camelize_keys(["snake_case"]) == ["snake_case"]  # only keys are converted
+
+
+def test_cache(url: str) -> None:
+
+    cache = rest.ResponseCache()
+
+    for _ in range(3):
+        assert rest.call(rest.Method.GET, f"{url}/cached", return_type=Position, cache=cache) == Position(1, 2, 3)
+
+    assert cache.stats() == rest.CacheStats(hits=2, misses=1, size=1)
+
+    async def aio_call() -> Position:
+        try:
+            return await aio_rest.call(rest.Method.GET, f"{url}/cached", return_type=Position, cache=cache)
+        finally:
+            await aio_rest.close()
+
+    assert asyncio.run(aio_call()) == Position(1, 2, 3)
+    assert cache.stats().hits == 3
+
+    # responses without validators are not cached
+    rest.call(rest.Method.GET, f"{url}/position", return_type=Position, cache=cache)
+    assert cache.stats().size == 1
+
+    cache.invalidate(f"{url}/cached")
+    assert cache.stats().size == 0
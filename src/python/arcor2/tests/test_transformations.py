@@ -1,20 +1,31 @@
 # -*- coding: utf-8 -*-
 
 import copy
+from typing import List
 
+import numpy as np
 import pytest
 import quaternion
 
 from arcor2.cached import CachedProject, CachedScene
-from arcor2.data.common import ActionPoint, Orientation, Pose, Position, Project, Scene, SceneObject
+from arcor2.data.common import ActionPoint, NamedOrientation, Orientation, Pose, Position, Project, Scene, SceneObject
 from arcor2.exceptions import Arcor2Exception
 from arcor2.transformations import (
+    abs_action_points,
+    abs_orientations,
+    abs_pose_from_ap_orientation,
     make_global_ap_relative,
     make_orientation_abs,
     make_orientation_rel,
     make_pose_abs,
     make_pose_rel,
+    make_pose_rel_to_parent,
+    make_poses_abs,
+    make_poses_abs_arrays,
+    make_poses_rel,
+    make_poses_rel_arrays,
     make_relative_ap_global,
+    poses_to_arrays,
 )
 
 
@@ -140,3 +151,80 @@ def test_make_relative_ap_global_and_relative_again() -> None:
 
     with pytest.raises(Arcor2Exception):
         make_relative_ap_global(cached_scene, cached_project, ap3)
+
+
+def test_abs_poses_nested_aps() -> None:
+
+    scene = Scene("s1", "s1")
+    scene.objects.append(SceneObject("so1", "so1", "WhatEver", Pose(Position(3, 0, 0), Orientation(0, 0, 1, 0))))
+    cached_scene = CachedScene(scene)
+
+    project = Project("p1", "p1", "s1")
+    project.action_points.append(ActionPoint("ap1", "ap1", Position(-1, 0, 0), parent="so1"))
+    ap2 = ActionPoint("ap2", "ap2", Position(0, 1, 0), parent="ap1")
+    ap2.orientations.append(NamedOrientation("ori1", "ori1", Orientation()))
+    project.action_points.append(ap2)
+    cached_project = CachedProject(project)
+
+    # rotation of the object applies to the whole chain
+    assert abs_pose_from_ap_orientation(cached_scene, cached_project, "ori1") == Pose(
+        Position(4, -1, 0), Orientation(0, 0, 1, 0)
+    )
+    assert abs_action_points(cached_scene, cached_project) == {"ap1": Position(4, 0, 0), "ap2": Position(4, -1, 0)}
+    assert abs_orientations(cached_scene, cached_project) == {"ori1": Pose(Position(4, -1, 0), Orientation(0, 0, 1, 0))}
+    assert make_pose_rel_to_parent(
+        cached_scene, cached_project, Pose(Position(4, -1, 0), Orientation(0, 0, 1, 0)), "ap2"
+    ) == Pose(Position(), Orientation())
+
+    # change of the parent pose has to be reflected
+    cached_scene.object_mut("so1").pose = Pose(Position(3, 0, 0), Orientation())
+    assert abs_action_points(cached_scene, cached_project)["ap2"] == Position(2, 1, 0)
+
+    make_relative_ap_global(cached_scene, cached_project, cached_project.bare_action_point_mut("ap2"))
+    assert cached_project.bare_action_point("ap2").position == Position(2, 1, 0)
+
+
+def test_make_poses_abs_and_rel_batch() -> None:
+
+    parent = Pose(Position(-1, 2, 0.5), Orientation())
+    parent.orientation.set_from_quaternion(quaternion.from_euler_angles(0.3, -1.2, 2.1))
+
+    children: List[Pose] = []
+
+    for idx in range(10):
+        child = Pose(Position(idx, -idx * 0.5, 1), Orientation())
+        child.orientation.set_from_quaternion(quaternion.from_euler_angles(idx * 0.1, 0.5, -idx * 0.2))
+        children.append(child)
+
+    def assert_same(poses: List[Pose], other_poses: List[Pose]) -> None:
+
+        for arr, other_arr in zip(poses_to_arrays(poses), poses_to_arrays(other_poses)):
+            assert np.allclose(arr, other_arr)
+
+    abs_poses = make_poses_abs(parent, children)
+    assert_same(abs_poses, [make_pose_abs(parent, child) for child in children])
+
+    rel_poses = make_poses_rel(parent, abs_poses)
+    assert_same(rel_poses, [make_pose_rel(parent, abs_pose) for abs_pose in abs_poses])
+    assert_same(rel_poses, children)
+
+    assert make_poses_abs(parent, []) == []
+
+
+def test_make_poses_arrays_single_pose() -> None:
+
+    parent = Pose(Position(-1, 2, 0.5), Orientation(0, 0, 1, 0))
+    child = Pose(Position(1, 2, 3), Orientation(0, 1, 0, 0))
+
+    position, orientation = poses_to_arrays([child])
+
+    # a single pose might be given as 1D arrays
+    abs_position, abs_orientation = make_poses_abs_arrays(parent, position[0], orientation[0])
+    assert abs_position.shape == (1, 3)
+    assert abs_orientation.shape == (1, 4)
+    assert np.allclose(abs_position, poses_to_arrays([make_pose_abs(parent, child)])[0])
+    assert np.allclose(abs_orientation, poses_to_arrays([make_pose_abs(parent, child)])[1])
+
+    rel_position, rel_orientation = make_poses_rel_arrays(parent, abs_position[0], abs_orientation[0])
+    assert np.allclose(rel_position, position)
+    assert np.allclose(rel_orientation, orientation)
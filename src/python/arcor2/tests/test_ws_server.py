@@ -0,0 +1,191 @@
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional
+
+from aiologger.levels import LogLevel
+
+from arcor2.data.rpc.common import Version
+from arcor2.ws_server import EventQueue, server
+
+
+class Client:
+    def __init__(self) -> None:
+        self.frames: List[str] = []
+
+    async def send(self, data: str) -> None:
+        self.frames.append(data)
+
+
+def test_event_queue() -> None:
+
+    client = Client()
+
+    async def run() -> None:
+
+        queue = EventQueue(client, window=0.01)  # type: ignore
+
+        queue.put('{"event": "A", "data": 1}', "a")
+        queue.put('{"event": "B"}')
+        queue.put('{"event": "A", "data": 2}', "a")  # supersedes the first one
+        assert not client.frames
+
+        await asyncio.sleep(0.05)
+        assert client.frames == ['{"event": "B"}', '{"event": "A", "data": 2}']
+        assert queue.superseded == 1
+
+        queue.batching = True
+        queue.put('{"event": "C"}')
+        await queue.send_now('{"event": "D"}')  # pending events go first
+        assert json.loads(client.frames[-1]) == [{"event": "C"}, {"event": "D"}]
+
+        queue.put('{"event": "E"}')
+        queue.close()
+        await asyncio.sleep(0.05)
+        assert len(client.frames) == 3
+
+    asyncio.run(run())
+
+
+def test_event_queue_rate() -> None:
+
+    client = Client()
+
+    async def run() -> None:
+
+        queue = EventQueue(client, window=0, max_rate=10)  # type: ignore
+        queue.batching = True
+
+        for idx in range(5):
+            queue.put(json.dumps({"event": "A", "data": idx}))
+            await asyncio.sleep(0.01)
+
+        await asyncio.sleep(0.15)
+
+        # the first event is sent immediately, the rest waits for the next allowed time slot
+        assert [len(json.loads(frame)) if frame.startswith("[") else 1 for frame in client.frames] == [1, 4]
+
+    asyncio.run(run())
+
+
+def test_event_queue_unthrottled() -> None:
+
+    client = Client()
+
+    async def run() -> None:
+
+        queue = EventQueue(client, window=0.005, max_rate=10)  # type: ignore
+
+        queue.put('{"event": "A"}')
+        await asyncio.sleep(0.02)
+        assert len(client.frames) == 1
+
+        # rate of the stream (30 Hz) is higher than max_rate of the queue, but no event is superseded
+        for idx in range(15):
+            queue.put(json.dumps({"event": "Stream", "data": idx}), "stream", throttled=False)
+            await asyncio.sleep(1 / 30)
+
+        await asyncio.sleep(0.02)
+        assert [json.loads(frame)["data"] for frame in client.frames[1:]] == list(range(15))
+        assert queue.superseded == 0
+
+    asyncio.run(run())
+
+
+def test_event_queue_overflow() -> None:
+    class StalledClient(Client):
+        def __init__(self) -> None:
+            super().__init__()
+            self.closed = False
+
+        async def send(self, data: str) -> None:
+            await asyncio.sleep(10)
+
+        async def close(self, code: int = 1000, reason: str = "") -> None:
+            self.closed = True
+
+    client = StalledClient()
+
+    async def run() -> None:
+
+        queue = EventQueue(client, window=0, max_rate=None, max_size=3)  # type: ignore
+
+        queue.put('{"event": "A"}')
+        await asyncio.sleep(0.01)  # the writer is now stuck on sending A
+
+        queue.put('{"event": "Joints", "data": 1}', "joints", droppable=True)
+        queue.put('{"event": "Joints", "data": 2}', "joints", droppable=True)  # latest value
+        queue.put('{"event": "Eef", "data": 1}', droppable=True)
+        queue.put('{"event": "Eef", "data": 2}', droppable=True)
+        assert queue.superseded == 1
+        assert queue.dropped == 0
+
+        queue.put('{"event": "B"}')  # the oldest droppable event is dropped
+        assert queue.dropped == 1
+        assert not queue.disconnected
+
+        queue.put('{"event": "Eef", "data": 3}', droppable=True)
+        queue.put('{"event": "Eef", "data": 4}', droppable=True)
+        assert queue.dropped == 3
+
+        queue.put('{"event": "C"}')
+        queue.put('{"event": "D"}')
+        assert queue.dropped == 5
+        assert not queue.disconnected
+
+        queue.put('{"event": "E"}')  # no more droppable events
+        await asyncio.sleep(0)
+
+        assert queue.disconnected
+        assert client.closed
+
+    asyncio.run(run())
+
+
+def test_events_before_response() -> None:
+    class RpcClient(Client):
+        async def __aiter__(self) -> AsyncIterator[str]:
+            yield json.dumps({"request": "Version", "id": 1})
+
+    class Logger:
+        level = LogLevel.INFO
+
+        def warn(self, msg: str) -> None:
+            pass
+
+    client = RpcClient()
+
+    async def run() -> None:
+
+        queue = EventQueue(client, window=1)  # type: ignore
+
+        async def broadcast() -> None:
+            queue.put('{"event": "A"}')
+
+        async def version_cb(req: Version.Request, ui: RpcClient) -> Optional[Version.Response]:
+
+            queue.put('{"event": "B"}')
+            asyncio.ensure_future(broadcast())  # as RPC callbacks usually do
+            return None
+
+        async def nop(client: RpcClient) -> None:
+            pass
+
+        async def flush(client: RpcClient) -> None:
+            await queue.flush()
+
+        await server(
+            client,
+            "",
+            Logger(),
+            nop,
+            nop,
+            {"Version": (Version, version_cb)},  # type: ignore
+            flush=flush,
+        )
+
+        queue.close()
+
+    asyncio.run(run())
+
+    assert client.frames[:2] == ['{"event": "B"}', '{"event": "A"}']
+    assert json.loads(client.frames[2])["response"] == "Version"
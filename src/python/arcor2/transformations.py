@@ -1,8 +1,23 @@
+import copy
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import quaternion
+
 from arcor2.cached import CachedProject as CProject
 from arcor2.cached import CachedScene as CScene
 from arcor2.data.common import BareActionPoint, Orientation, Pose, Position
 from arcor2.exceptions import Arcor2Exception
 
+# poses as tuples, in order to be usable as keys
+PositionTuple = Tuple[float, float, float]
+OrientationTuple = Tuple[float, float, float, float]
+PoseTuple = Tuple[PositionTuple, OrientationTuple]
+PoseChain = Tuple[PoseTuple, ...]
+
+_IDENTITY: OrientationTuple = (0.0, 0.0, 0.0, 1.0)
+
 
 def make_position_rel(parent: Position, child: Position) -> Position:
 
@@ -64,9 +79,203 @@ def make_pose_abs(parent: Pose, child: Pose) -> Pose:
     return p
 
 
+def _normalized_quaternions(orientations: np.ndarray) -> np.ndarray:
+    """Converts Nx4 array (or a single orientation) of (x, y, z, w) into
+    array of unit quaternions."""
+
+    float_arr = np.asarray(orientations, dtype=float).reshape(-1, 4)[:, [3, 0, 1, 2]]
+    norms = np.linalg.norm(float_arr, axis=1)
+
+    if not np.all(norms > 0):
+        raise Arcor2Exception("Invalid quaternion.")
+
+    return quaternion.as_quat_array(float_arr / norms[:, np.newaxis])
+
+
+def _orientations_array(quaternions: np.ndarray) -> np.ndarray:
+    """Converts array of quaternions into Nx4 array of normalized (x, y, z,
+    w)."""
+
+    float_arr = quaternion.as_float_array(quaternions)
+    float_arr /= np.linalg.norm(float_arr, axis=1)[:, np.newaxis]
+    return float_arr[:, [1, 2, 3, 0]]
+
+
+def make_poses_abs_arrays(
+    parent: Pose, positions: np.ndarray, orientations: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized variant of make_pose_abs for many children of the same
+    parent.
+
+    :param parent: e.g. scene object
+    :param positions: Nx3 array of child positions (x, y, z).
+    :param orientations: Nx4 array of child orientations (x, y, z, w).
+    :return: Absolute positions (Nx3) and orientations (Nx4).
+    """
+
+    parent_q = parent.orientation.as_quaternion()
+
+    abs_positions = quaternion.rotate_vectors(parent_q, np.asarray(positions, dtype=float).reshape(-1, 3))
+    abs_positions += list(parent.position)
+
+    abs_orientations = _normalized_quaternions(orientations) * parent_q.conjugate().inverse()
+
+    return abs_positions, _orientations_array(abs_orientations)
+
+
+def make_poses_rel_arrays(
+    parent: Pose, positions: np.ndarray, orientations: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized variant of make_pose_rel for many children of the same
+    parent.
+
+    :param parent: e.g. scene object
+    :param positions: Nx3 array of child positions (x, y, z).
+    :param orientations: Nx4 array of child orientations (x, y, z, w).
+    :return: Relative positions (Nx3) and orientations (Nx4).
+    """
+
+    parent_q = parent.orientation.as_quaternion()
+
+    rel_positions = np.asarray(positions, dtype=float).reshape(-1, 3) - list(parent.position)
+    rel_positions = quaternion.rotate_vectors(parent_q.inverse(), rel_positions)
+
+    rel_orientations = _normalized_quaternions(orientations) / parent_q
+
+    return rel_positions, _orientations_array(rel_orientations)
+
+
+def poses_to_arrays(poses: Sequence[Pose]) -> Tuple[np.ndarray, np.ndarray]:
+    """Converts poses into Nx3 array of positions and Nx4 array of
+    orientations."""
+
+    positions = np.array([(p.position.x, p.position.y, p.position.z) for p in poses], dtype=float).reshape(-1, 3)
+    orientations = np.array(
+        [(p.orientation.x, p.orientation.y, p.orientation.z, p.orientation.w) for p in poses], dtype=float
+    ).reshape(-1, 4)
+    return positions, orientations
+
+
+def poses_from_arrays(positions: np.ndarray, orientations: np.ndarray) -> List[Pose]:
+    """Inverse of poses_to_arrays."""
+
+    return [Pose(Position(*pos), Orientation(*ori)) for pos, ori in zip(positions.tolist(), orientations.tolist())]
+
+
+def make_poses_abs(parent: Pose, children: Sequence[Pose]) -> List[Pose]:
+    """The same as make_pose_abs, for many children at once.
+
+    :param parent: e.g. scene object
+    :param children: e.g. action points
+    :return: absolute poses
+    """
+
+    if not children:
+        return []
+
+    return poses_from_arrays(*make_poses_abs_arrays(parent, *poses_to_arrays(children)))
+
+
+def make_poses_rel(parent: Pose, children: Sequence[Pose]) -> List[Pose]:
+    """The same as make_pose_rel, for many children at once.
+
+    :param parent: e.g. scene object
+    :param children: e.g. action points
+    :return: relative poses
+    """
+
+    if not children:
+        return []
+
+    return poses_from_arrays(*make_poses_rel_arrays(parent, *poses_to_arrays(children)))
+
+
+def _pose_tuple(position: Position, orientation: Optional[Orientation] = None) -> PoseTuple:
+
+    if orientation is None:
+        return (position.x, position.y, position.z), _IDENTITY
+
+    return (position.x, position.y, position.z), (orientation.x, orientation.y, orientation.z, orientation.w)
+
+
+def _pose_from_tuple(pose: PoseTuple) -> Pose:
+
+    pos, ori = pose
+    return Pose(Position(*pos), Orientation(*ori))
+
+
+def parent_chain(scene: CScene, project: CProject, parent_id: str) -> PoseChain:
+    """Returns relative poses of all parents (object -> AP -> AP...), starting
+    with the root one.
+
+    The chain fully determines the resulting absolute pose, so it serves as a key for caching.
+
+    :param scene:
+    :param project:
+    :param parent_id: Object or AP.
+    :return:
+    """
+
+    chain: List[PoseTuple] = []
+    next_parent_id: Optional[str] = parent_id
+
+    while next_parent_id:
+
+        try:
+            parent_obj = scene.object(next_parent_id)
+        except Arcor2Exception:
+            pass
+        else:
+            if not parent_obj.pose:
+                raise Arcor2Exception("Parent object does not have pose!")
+            chain.append(_pose_tuple(parent_obj.pose.position, parent_obj.pose.orientation))
+            break
+
+        try:
+            parent_ap = project.bare_action_point(next_parent_id)
+        except Arcor2Exception:
+            raise Arcor2Exception("Unknown parent_id.")
+
+        chain.append(_pose_tuple(parent_ap.position))
+        next_parent_id = parent_ap.parent
+
+    chain.reverse()
+    return tuple(chain)
+
+
+@lru_cache(maxsize=1024)
+def _chain_pose(chain: PoseChain) -> PoseTuple:
+    """Absolute pose of a frame given by the chain of relative poses.
+
+    As the key contains all the poses, any change of object pose or AP position/parent leads to a different key.
+    Prefixes of the chain are cached as well, so siblings (e.g. APs with the same parent) share the work.
+    """
+
+    pose = _pose_from_tuple(chain[-1])
+
+    if len(chain) > 1:
+        pose = make_pose_abs(_pose_from_tuple(_chain_pose(chain[:-1])), pose)
+
+    return _pose_tuple(pose.position, pose.orientation)
+
+
+def parent_pose(scene: CScene, project: CProject, parent_id: str) -> Pose:
+    """Returns absolute pose of a parent (object or AP).
+
+    :param scene:
+    :param project:
+    :param parent_id:
+    :return:
+    """
+
+    return _pose_from_tuple(_chain_pose(parent_chain(scene, project, parent_id)))
+
+
 def make_relative_ap_global(scene: CScene, project: CProject, ap: BareActionPoint) -> None:
     """Transforms (in place) relative AP into a global one.
 
+    The AP has to be obtained using `bare_action_point_mut`.
+
     :param scene:
     :param project:
     :param ap:
@@ -76,26 +285,12 @@ def make_relative_ap_global(scene: CScene, project: CProject, ap: BareActionPoin
     if not ap.parent:
         return
 
-    if ap.parent in scene.object_ids:
-        parent_obj = scene.object(ap.parent)
-        if not parent_obj.pose:
-            raise Arcor2Exception("Parent object does not have pose!")
-        old_parent_pose = parent_obj.pose
-    elif ap.parent in project.action_points_ids:
-        old_parent_pose = Pose(project.bare_action_point(ap.parent).position, Orientation())
-    else:
-        raise Arcor2Exception("AP has unknown parent_id.")
+    old_parent_pose = parent_pose(scene, project, ap.parent)
 
     ap.position = make_pose_abs(old_parent_pose, Pose(ap.position, Orientation())).position
-    for ori in project.ap_orientations(ap.id):
+    for ori in project.ap_orientations_mut(ap.id):
         ori.orientation = make_orientation_abs(old_parent_pose.orientation, ori.orientation)
 
-    if ap.parent in project.action_points_ids:
-        parent_ap = project.bare_action_point(ap.parent)
-        if parent_ap.parent:
-            ap.parent = parent_ap.parent
-            make_relative_ap_global(scene, project, ap)
-
     ap.parent = None
 
 
@@ -103,6 +298,8 @@ def make_global_ap_relative(scene: CScene, project: CProject, ap: BareActionPoin
     """Transforms (in place) global AP into a relative one with given parent
     (can be object or another AP).
 
+    The AP has to be obtained using `bare_action_point_mut`.
+
     :param scene:
     :param project:
     :param ap:
@@ -112,25 +309,10 @@ def make_global_ap_relative(scene: CScene, project: CProject, ap: BareActionPoin
 
     assert project.scene_id == scene.id
 
-    if parent_id in scene.object_ids:
-        parent_obj = scene.object(parent_id)
-        if not parent_obj.pose:
-            raise Arcor2Exception("Parent object does not have pose!")
-        new_parent_pose = parent_obj.pose
-    elif parent_id in project.action_points_ids:
-
-        parent_ap = project.bare_action_point(parent_id)
-
-        if parent_ap.parent:
-            make_global_ap_relative(scene, project, ap, parent_ap.parent)
-
-        new_parent_pose = Pose(parent_ap.position, Orientation())
-
-    else:
-        raise Arcor2Exception("Unknown parent_id.")
+    new_parent_pose = parent_pose(scene, project, parent_id)
 
     ap.position = make_pose_rel(new_parent_pose, Pose(ap.position, Orientation())).position
-    for ori in project.ap_orientations(ap.id):
+    for ori in project.ap_orientations_mut(ap.id):
         ori.orientation = make_orientation_rel(new_parent_pose.orientation, ori.orientation)
 
     ap.parent = parent_id
@@ -147,60 +329,84 @@ def make_pose_rel_to_parent(scene: CScene, project: CProject, pose: Pose, parent
     :return:
     """
 
-    if parent_id in scene.object_ids:
-        parent_obj = scene.object(parent_id)
-        if not parent_obj.pose:
-            raise Arcor2Exception("Parent object does not have pose!")
-        parent_pose = parent_obj.pose
-    elif parent_id in project.action_points_ids:
+    return make_pose_rel(parent_pose(scene, project, parent_id), pose)
 
-        parent_ap = project.bare_action_point(parent_id)
 
-        if parent_ap.parent:
-            pose = make_pose_rel_to_parent(scene, project, pose, parent_ap.parent)
+def abs_pose_from_ap_orientation(scene: CScene, project: CProject, orientation_id: str) -> Pose:
+    """Returns absolute Pose without modifying anything within the project.
 
-        parent_pose = Pose(parent_ap.position, Orientation())
+    :param orientation_id:
+    :return:
+    """
 
-    else:
-        raise Arcor2Exception("Unknown parent_id.")
+    ap, ori = project.bare_ap_and_orientation(orientation_id)
+    pose = Pose(ap.position, ori.orientation)
 
-    return make_pose_rel(parent_pose, pose)
+    if not ap.parent:
+        return pose
 
+    return make_pose_abs(parent_pose(scene, project, ap.parent), pose)
 
-# TODO mostly duplicate of make_pose_rel_to_parent
-def _abs_pose_from_ap_orientation(scene: CScene, project: CProject, pose: Pose, parent_id: str) -> Pose:
 
-    if parent_id in scene.object_ids:
-        parent_obj = scene.object(parent_id)
-        if not parent_obj.pose:
-            raise Arcor2Exception("Parent object does not have pose!")
-        parent_pose = parent_obj.pose
-    elif parent_id in project.action_points_ids:
+def abs_action_points(scene: CScene, project: CProject) -> Dict[str, Position]:
+    """Returns absolute positions of all action points (without modifying
+    anything within the project).
 
-        parent_ap = project.bare_action_point(parent_id)
+    APs with the same parent are transformed at once.
 
-        if parent_ap.parent:
-            pose = _abs_pose_from_ap_orientation(scene, project, pose, parent_ap.parent)
+    :param scene:
+    :param project:
+    :return: AP id -> position.
+    """
 
-        parent_pose = Pose(parent_ap.position, Orientation())
+    ret: Dict[str, Position] = {}
+    by_parent: Dict[str, List[BareActionPoint]] = {}
 
-    else:
-        raise Arcor2Exception("Unknown parent_id.")
+    for ap in project.action_points:
 
-    return make_pose_abs(parent_pose, pose)
+        if ap.parent:
+            by_parent.setdefault(ap.parent, []).append(ap)
+        else:
+            ret[ap.id] = Position(ap.position.x, ap.position.y, ap.position.z)
 
+    for parent_id, aps in by_parent.items():
 
-def abs_pose_from_ap_orientation(scene: CScene, project: CProject, orientation_id: str) -> Pose:
-    """Returns absolute Pose without modifying anything within the project.
+        abs_poses = make_poses_abs(parent_pose(scene, project, parent_id), [Pose(ap.position) for ap in aps])
 
-    :param orientation_id:
-    :return:
+        for ap, abs_pose in zip(aps, abs_poses):
+            ret[ap.id] = abs_pose.position
+
+    return ret
+
+
+def abs_orientations(scene: CScene, project: CProject) -> Dict[str, Pose]:
+    """Returns absolute poses for all orientations of all action points
+    (without modifying anything within the project).
+
+    Orientations of APs with the same parent are transformed at once.
+
+    :param scene:
+    :param project:
+    :return: Orientation id -> pose.
     """
 
-    ap, ori = project.bare_ap_and_orientation(orientation_id)
-    pose = Pose(ap.position, ori.orientation)
+    ret: Dict[str, Pose] = {}
+    by_parent: Dict[str, Tuple[List[str], List[Pose]]] = {}
 
-    if not ap.parent:
-        return pose
+    for ap in project.action_points:
+
+        for ori in project.ap_orientations(ap.id):
+
+            pose = Pose(ap.position, ori.orientation)
+
+            if ap.parent:
+                ori_ids, poses = by_parent.setdefault(ap.parent, ([], []))
+                ori_ids.append(ori.id)
+                poses.append(pose)
+            else:
+                ret[ori.id] = copy.deepcopy(pose)
+
+    for parent_id, (ori_ids, poses) in by_parent.items():
+        ret.update(zip(ori_ids, make_poses_abs(parent_pose(scene, project, parent_id), poses)))
 
-    return _abs_pose_from_ap_orientation(scene, project, pose, ap.parent)
+    return ret
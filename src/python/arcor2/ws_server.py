@@ -2,8 +2,8 @@ import asyncio
 import json
 import os
 import time
-from collections import deque
-from typing import Any, Awaitable, Callable, Coroutine, Dict, Optional, Set, Tuple, Type, TypeVar
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Hashable, List, Optional, Set, Tuple, Type, TypeVar
 
 import websockets
 from aiologger.levels import LogLevel
@@ -11,9 +11,17 @@ from dataclasses_jsonschema import ValidationError
 
 from arcor2.data.events import Event
 from arcor2.data.rpc.common import RPC
+from arcor2.data.serialization import ValidationMode, from_dict, to_json, validation_mode
 from arcor2.exceptions import Arcor2Exception
 
 MAX_RPC_DURATION = float(os.getenv("ARCOR2_MAX_RPC_DURATION", 0.1))
+VALIDATION_MODE = validation_mode("ARCOR2_WS_VALIDATION")
+
+# events for a client are collected for EVENT_WINDOW seconds and then sent together, at most MAX_EVENT_RATE times/s
+EVENT_WINDOW = float(os.getenv("ARCOR2_EVENT_WINDOW", 0.01))
+MAX_EVENT_RATE = float(os.getenv("ARCOR2_MAX_EVENT_RATE", 25))
+# when a client does not keep up, number of its pending events is limited
+MAX_PENDING_EVENTS = int(os.getenv("ARCOR2_MAX_PENDING_EVENTS", 1000))
 
 RPCT = TypeVar("RPCT", bound=RPC)
 ReqT = TypeVar("ReqT", bound=RPC.Request)
@@ -36,6 +44,198 @@ async def send_json_to_client(client: websockets.WebSocketServerProtocol, data:
         pass
 
 
+class EventQueue:
+    """Outbound queue of events for one client, with its own writer task.
+
+    Events are not sent right away. They are collected for a short time
+    and then sent together, at most max_rate times per second. An event
+    put with a key supersedes pending event with the same key (e.g. an
+    older update of the same item), which is then not sent at all.
+
+    Events sent together form one frame (JSON array) when batching is
+    enabled, otherwise they are sent one by one. Batching has to be
+    supported by the client.
+
+    Events that are already rate limited by their producer (e.g. robot
+    streams with a rate requested by the client) might be put without
+    throttling. Such an event is sent once the window passes, regardless
+    of max_rate, together with other pending events.
+
+    A slow client only makes its own queue grow. When there are max_size
+    pending events, the oldest droppable one (e.g. streamed robot joints)
+    is dropped. If there is no such event, the client is disconnected, as
+    it would miss important events otherwise.
+    """
+
+    def __init__(
+        self,
+        client: websockets.WebSocketServerProtocol,
+        window: float = EVENT_WINDOW,
+        max_rate: Optional[float] = MAX_EVENT_RATE,
+        max_size: int = MAX_PENDING_EVENTS,
+    ) -> None:
+        """Creates the queue.
+
+        :param client:
+        :param window: For how long events are collected before sending.
+        :param max_rate: Max. number of sends per second, not limited when None.
+        :param max_size: Max. number of pending events.
+        """
+
+        if window < 0 or (max_rate is not None and max_rate <= 0) or max_size < 1:
+            raise Arcor2Exception("Invalid parameters of the queue.")
+
+        self.client = client
+        self.window = window
+        self.interval = 0.0 if max_rate is None else 1.0 / max_rate
+        self.max_size = max_size
+        self.batching = False
+        self.superseded = 0  # number of events that were not sent as they were superseded by newer ones
+        self.dropped = 0  # number of droppable events dropped due to overflow
+        self.disconnected = False  # the client was disconnected due to overflow
+
+        self._pending: "OrderedDict[Hashable, Tuple[str, bool]]" = OrderedDict()
+        self._last_send = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None  # set when the writer should not wait for max_rate anymore
+        self._unthrottled_since: Optional[float] = None  # when the oldest pending unthrottled event was put
+
+    def put(
+        self, message: str, key: Optional[Hashable] = None, droppable: bool = False, throttled: bool = True
+    ) -> None:
+        """Queues the event.
+
+        :param message: JSON-encoded event.
+        :param key: Pending event with the same key is dropped.
+        :param droppable: The event might be dropped when the client can't keep up.
+        :param throttled: When False, the event is not delayed due to max_rate.
+        :return:
+        """
+
+        if self.disconnected:
+            return
+
+        if key is None:
+            key = object()
+        elif self._pending.pop(key, None) is not None:
+            self.superseded += 1
+
+        if len(self._pending) >= self.max_size and not self._make_room(droppable):
+            return
+
+        # the newer event goes to the end (it might depend on events in between)
+        self._pending[key] = (message, droppable)
+
+        if not throttled and self._unthrottled_since is None:
+            self._unthrottled_since = time.monotonic()
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    def discard(self, key: Hashable) -> None:
+        """Drops pending event with the given key (if there is any), e.g.
+        because it became obsolete."""
+
+        if self._pending.pop(key, None) is not None:
+            self.superseded += 1
+
+    async def send_now(self, message: str) -> None:
+        """Sends pending events and then the given one, without any
+        delay."""
+
+        async with self._lock:
+            await self._send([*self._take(), message])
+
+    async def flush(self) -> None:
+        """Sends pending events without any delay."""
+
+        async with self._lock:
+            await self._send(self._take())
+
+    def close(self) -> None:
+        """Drops pending events."""
+
+        self._pending.clear()
+
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _make_room(self, droppable: bool) -> bool:
+        """Handles overflow, returns whether the new event should be
+        queued."""
+
+        for key, (_, pending_droppable) in self._pending.items():
+            if pending_droppable:
+                del self._pending[key]
+                self.dropped += 1
+                return True
+
+        if droppable:
+            self.dropped += 1
+            return False
+
+        self.disconnected = True
+        self.close()
+        asyncio.ensure_future(self.client.close(1008, "Too many pending events."))
+        return False
+
+    def _take(self) -> List[str]:
+
+        messages = [message for message, _ in self._pending.values()]
+        self._pending.clear()
+        self._unthrottled_since = None
+        return messages
+
+    def _delay(self) -> float:
+        """Returns how long the writer should wait before sending pending
+        events."""
+
+        now = time.monotonic()
+
+        if self._unthrottled_since is not None:
+            return max(0.0, self._unthrottled_since + self.window - now)
+
+        return max(self.window, self._last_send + self.interval - now)
+
+    async def _send(self, messages: List[str]) -> None:
+
+        if not messages:
+            return
+
+        self._last_send = time.monotonic()
+
+        if self.batching and len(messages) > 1:
+            await send_json_to_client(self.client, f"[{','.join(messages)}]")
+        else:
+            for message in messages:
+                await send_json_to_client(self.client, message)
+
+    async def _run(self) -> None:
+
+        try:
+            if self._wakeup is None:
+                self._wakeup = asyncio.Event()
+
+            while self._pending:
+
+                self._wakeup.clear()
+
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._delay())
+                except asyncio.TimeoutError:
+                    async with self._lock:
+                        await self._send(self._take())
+
+                # when woken up by an unthrottled event, the delay is computed again
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+
 async def server(
     client: Any,
     path: str,
@@ -45,7 +245,14 @@ async def server(
     rpc_dict: RPC_DICT_TYPE,
     event_dict: Optional[EVENT_DICT_TYPE] = None,
     verbose: bool = False,
+    validation: ValidationMode = VALIDATION_MODE,
+    flush: Optional[Callable[[Any], Awaitable[None]]] = None,
 ) -> None:
+    """Handles messages of one client.
+
+    :param flush: Called before a response is sent, so events pending for the client (e.g. broadcasted by the RPC
+        callback) are delivered before the response.
+    """
 
     if event_dict is None:
         event_dict = {}
@@ -83,14 +290,14 @@ async def server(
                 assert req_type == rpc_cls.__name__
 
                 try:
-                    req = rpc_cls.Request.from_dict(data)
+                    req = from_dict(rpc_cls.Request, data, validation)
                 except ValidationError as e:
                     logger.error(f"Invalid RPC: {data}, error: {e}")
                     continue
                 except Arcor2Exception as e:
                     # this might happen if e.g. some dataclass does additional validation of values in its __post_init__
                     try:
-                        await client.send(rpc_cls.Response(data["id"], False, messages=[str(e)]).to_json())
+                        await client.send(to_json(rpc_cls.Response(data["id"], False, messages=[str(e)])))
                         logger.debug(e, exc_info=True)
                     except KeyError:
                         pass
@@ -115,7 +322,11 @@ async def server(
                             assert isinstance(resp, rpc_cls.Response)
                             resp.id = req.id
 
-                await client.send(resp.to_json())
+                if flush:
+                    await asyncio.sleep(0)  # lets events scheduled by the callback (ensure_future) get queued
+                    await flush(client)
+
+                await client.send(to_json(resp))
 
                 if logger.level == LogLevel.DEBUG:
 
@@ -156,7 +367,7 @@ async def server(
                     continue
 
                 try:
-                    event = event_cls.from_dict(data)
+                    event = from_dict(event_cls, data, validation)
                 except ValidationError as e:
                     logger.error(f"Invalid event: {data}, error: {e}")
                     continue
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from datetime import datetime
 from typing import Dict
 
@@ -11,8 +10,10 @@ from arcor2.clients.aio_persistent_storage import (
     get_mesh,
     get_meshes,
     get_model,
+    get_models,
     get_object_type,
     get_object_type_ids,
+    get_object_types,
     get_project_sources,
     put_model,
     update_object_type,
@@ -75,22 +76,31 @@ async def get_scene(scene_id: str) -> Scene:
 
 
 async def update_project(project: Project) -> datetime:
+    """Stores the project and keeps it in the cache.
+
+    The project is cached as it is (without making a copy), so the caller must not modify it afterwards.
+    Projects obtained from UpdateableCachedProject are fine, as their items are copied on write.
+    """
 
     assert project.id
     ret = await ps.update_project(project)
     _projects_list[project.id] = IdDesc(project.id, project.name, project.desc)
-    _projects[project.id] = deepcopy(project)
+    _projects[project.id] = project
     _projects[project.id].modified = ret
     _projects[project.id].int_modified = None
     return ret
 
 
 async def update_scene(scene: Scene) -> datetime:
+    """Stores the scene and keeps it in the cache.
+
+    The same as for update_project applies here.
+    """
 
     assert scene.id
     ret = await ps.update_scene(scene)
     _scenes_list[scene.id] = IdDesc(scene.id, scene.name, scene.desc)
-    _scenes[scene.id] = deepcopy(scene)
+    _scenes[scene.id] = scene
     _scenes[scene.id].modified = ret
     _scenes[scene.id].int_modified = None
 
@@ -116,6 +126,7 @@ __all__ = [
     get_mesh.__name__,
     get_meshes.__name__,
     get_model.__name__,
+    get_models.__name__,
     put_model.__name__,
     delete_model.__name__,
     get_projects.__name__,
@@ -125,6 +136,7 @@ __all__ = [
     get_scene.__name__,
     get_object_type.__name__,
     get_object_type_ids.__name__,
+    get_object_types.__name__,
     update_project.__name__,
     update_scene.__name__,
     update_project_sources.__name__,
@@ -11,6 +11,7 @@ from websockets.server import WebSocketServerProtocol as WsClient
 from arcor2 import helpers as hlp
 from arcor2 import rest
 from arcor2.data import common, rpc
+from arcor2.data.serialization import ValidationMode, validation_mode
 from arcor2.exceptions import Arcor2Exception
 from arcor2_arserver import events as server_events
 from arcor2_arserver import globals as glob
@@ -31,6 +32,9 @@ else:
 MANAGER_RPC_REQUEST_QUEUE: ReqQueue = ReqQueue()
 MANAGER_RPC_RESPONSES: Dict[int, RespQueue] = {}
 
+# messages from the Execution service (internal one)
+MANAGER_VALIDATION = validation_mode("ARCOR2_EXECUTION_VALIDATION", ValidationMode.STRUCTURAL)
+
 
 async def run_temp_package(package_id: str) -> None:
 
@@ -1,6 +1,6 @@
 import os
 from collections import defaultdict
-from typing import Any, DefaultDict, Dict, Optional, Set
+from typing import Any, DefaultDict, Dict, Optional, Set, Tuple
 
 from websockets.server import WebSocketServerProtocol as WsClient
 
@@ -40,5 +40,10 @@ RegisteredUiDict = DefaultDict[str, Set[WsClient]]
 
 ROBOT_JOINTS_REGISTERED_UIS: RegisteredUiDict = defaultdict(lambda: set())  # robot, UIs
 ROBOT_EEF_REGISTERED_UIS: RegisteredUiDict = defaultdict(lambda: set())  # robot, UIs
+# UIs (subsets of the above) that want to get only changes
+ROBOT_JOINTS_DELTA_UIS: RegisteredUiDict = defaultdict(lambda: set())  # robot, UIs
+ROBOT_EEF_DELTA_UIS: RegisteredUiDict = defaultdict(lambda: set())  # robot, UIs
+# periods of streams requested by UIs
+ROBOT_STREAM_PERIODS: DefaultDict[Tuple[str, str], Dict[WsClient, float]] = defaultdict(dict)  # (robot, what), UI
 
 OBJECTS_WITH_UPDATED_POSE: Set[str] = set()
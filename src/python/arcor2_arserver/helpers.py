@@ -1,5 +1,7 @@
-from typing import Set
+import bisect
+from typing import List, Optional, Set, Tuple
 
+from arcor2.data.common import IdDesc
 from arcor2.exceptions import Arcor2Exception
 
 
@@ -10,3 +12,33 @@ def unique_name(name: str, existing_names: Set[str]) -> None:
 
     if name in existing_names:
         raise Arcor2Exception("Name already exists.")
+
+
+def page(
+    items: List[IdDesc], cursor: Optional[str] = None, page_size: Optional[int] = None
+) -> Tuple[List[IdDesc], Optional[str]]:
+    """Returns one page of items.
+
+    When paging, items are ordered by ID and the cursor is ID of the last item of the previous page,
+    so the listing is not disturbed by items added or removed in the meantime.
+
+    :param items:
+    :param cursor: Page starts after the item with this ID.
+    :param page_size: Max. number of items on the page. All (remaining) items are returned if not set.
+    :return: Items of the page and cursor of the next one (None for the last page).
+    """
+
+    if cursor is None and page_size is None:
+        return items, None
+
+    if page_size is not None and page_size < 1:
+        raise Arcor2Exception("Page size has to be positive.")
+
+    items = sorted(items, key=lambda item: item.id)
+    start = 0 if cursor is None else bisect.bisect_right([item.id for item in items], cursor)
+
+    if page_size is None or start + page_size >= len(items):
+        return items[start:], None
+
+    ret = items[start : start + page_size]
+    return ret, ret[-1].id
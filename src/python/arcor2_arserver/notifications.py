@@ -1,21 +1,118 @@
-import asyncio
-from typing import Optional
+from typing import Dict, Hashable, Iterable, Optional, Sequence
 
 from websockets.server import WebSocketServerProtocol
 
 from arcor2 import ws_server
 from arcor2.data import events
+from arcor2.data.serialization import to_json
 from arcor2_arserver import globals as glob
 
+_queues: Dict[WebSocketServerProtocol, ws_server.EventQueue] = {}
+
+
+def _queue(interface: WebSocketServerProtocol) -> ws_server.EventQueue:
+
+    try:
+        return _queues[interface]
+    except KeyError:
+        queue = _queues[interface] = ws_server.EventQueue(interface)
+        return queue
+
+
+def forget_interface(interface: WebSocketServerProtocol) -> None:
+    """Drops events pending for the (disconnected) interface."""
+
+    queue = _queues.pop(interface, None)
+
+    if queue:
+        queue.close()
+
+
+async def flush(interface: WebSocketServerProtocol) -> None:
+    """Sends events pending for the interface right away."""
+
+    queue = _queues.get(interface)
+
+    if queue:
+        await queue.flush()
+
+
+def set_batching(interface: WebSocketServerProtocol, enabled: bool) -> None:
+    _queue(interface).batching = enabled
+
+
+def _key(event: events.Event) -> Optional[Hashable]:
+    """Pending update of an item is superseded by its newer update."""
+
+    if event.change_type != events.Event.Type.UPDATE:
+        return None
+
+    item_id = getattr(getattr(event, "data", None), "id", None)
+
+    if not isinstance(item_id, str):
+        return None
+
+    return event.event, item_id
+
+
+def broadcast_message(
+    message: str, key: Optional[Hashable] = None, exclude_ui: Optional[WebSocketServerProtocol] = None
+) -> None:
+    """Queues already serialized event for all interfaces.
+
+    :param message: JSON-encoded event.
+    :param key: Pending event with the same key is superseded.
+    :param exclude_ui:
+    :return:
+    """
+
+    for intf in glob.INTERFACES:
+        if intf != exclude_ui:
+            _queue(intf).put(message, key)
+
 
 async def broadcast_event(event: events.Event, exclude_ui: Optional[WebSocketServerProtocol] = None) -> None:
 
     if (exclude_ui is None and glob.INTERFACES) or (exclude_ui and len(glob.INTERFACES) > 1):
-        message = event.to_json()
-        await asyncio.gather(
-            *[ws_server.send_json_to_client(intf, message) for intf in glob.INTERFACES if intf != exclude_ui]
-        )
+        broadcast_message(to_json(event), _key(event), exclude_ui)
+
+
+def stream_event(
+    interfaces: Iterable[WebSocketServerProtocol],
+    event: events.Event,
+    key: Hashable,
+    droppable: bool = True,
+    obsoletes: Sequence[Hashable] = (),
+) -> None:
+    """Queues event of a stream (e.g. robot joints) for the given interfaces.
+
+    Only the latest pending event of the stream is kept. Events are not
+    delayed by the rate limit of the queue.
+
+    :param interfaces:
+    :param event:
+    :param key: Identifies the stream.
+    :param droppable: The event might be dropped when an interface can't keep up.
+    :param obsoletes: Keys of pending events made obsolete by this one (e.g. deltas relative to an older keyframe).
+    :return:
+    """
+
+    message = to_json(event)
+
+    for intf in interfaces:
+        if intf in glob.INTERFACES:
+            queue = _queue(intf)
+            for obsolete_key in obsoletes:
+                queue.discard(obsolete_key)
+            # streams are rate limited by their producer, according to rates requested by interfaces
+            queue.put(message, key, droppable, throttled=False)
 
 
 async def event(interface: WebSocketServerProtocol, event: events.Event) -> None:
-    await ws_server.send_json_to_client(interface, event.to_json())
+    """Sends the event to the interface right away (after events that are
+    pending for it)."""
+
+    if interface in glob.INTERFACES:
+        await _queue(interface).send_now(to_json(event))
+    else:
+        await ws_server.send_json_to_client(interface, to_json(event))
@@ -0,0 +1,130 @@
+"""Persistent (on-disk) cache of analyzed ObjectTypes.
+
+Parsing and analysis of ObjectTypes (actions, their parameters, robot
+features) is costly. Without the cache, it would be done for all
+ObjectTypes on each start of ARServer. An entry is keyed by hash of the
+source code of the type and of all its ancestors (and versions of the
+packages doing the analysis), so any change results in a new key.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import List, Optional, Type
+
+from dataclasses_jsonschema import JsonSchemaMixin, ValidationError
+
+import arcor2
+import arcor2_arserver
+from arcor2.data import serialization
+from arcor2.object_types.abstract import Generic
+from arcor2_arserver import settings
+from arcor2_arserver_data.objects import ObjectAction, ObjectTypeMeta
+from arcor2_arserver_data.robot import RobotMeta
+
+# max. number of entries, the least recently used ones are removed by prune()
+MAX_ENTRIES = int(os.getenv("ARCOR2_ARSERVER_CACHE_SIZE", 1000))
+
+_VERSIONS = f"{arcor2.version()}/{arcor2_arserver.version()}"
+
+
+@dataclass
+class CachedObjectType(JsonSchemaMixin):
+
+    meta: ObjectTypeMeta
+    actions: List[ObjectAction] = field(default_factory=list)  # own actions (without the inherited ones)
+    robot_meta: Optional[RobotMeta] = None
+
+
+def key(source: str, base_key: str = "") -> str:
+    """Key of an ObjectType.
+
+    :param source: Source code of the type.
+    :param base_key: Key of its base.
+    :return:
+    """
+
+    return hashlib.sha256("\0".join((_VERSIONS, base_key, source)).encode()).hexdigest()
+
+
+def built_in_key(type_def: Type[Generic]) -> str:
+    """Key of a built-in ObjectType, given by sources of the type and its
+    ancestors."""
+
+    return key("\0".join(inspect.getsource(cls) for cls in inspect.getmro(type_def) if issubclass(cls, Generic)))
+
+
+def _path(entry_key: str) -> str:
+    return os.path.join(settings.OBJECT_TYPE_CACHE_PATH, f"{entry_key}.json")
+
+
+def load(entry_key: str) -> Optional[CachedObjectType]:
+    """Gets the entry.
+
+    :param entry_key:
+    :return: None if there is no (valid) entry for the key.
+    """
+
+    path = _path(entry_key)
+
+    try:
+        with open(path) as file:
+            entry = serialization.from_dict(CachedObjectType, json.load(file), serialization.ValidationMode.STRUCTURAL)
+        os.utime(path)  # marks the entry as recently used
+    except (OSError, ValueError, ValidationError):  # missing or corrupted entry
+        return None
+
+    return entry
+
+
+def store(entry_key: str, entry: CachedObjectType) -> None:
+    """Stores the entry. Failures are ignored as the cache is not essential.
+
+    :param entry_key:
+    :param entry:
+    :return:
+    """
+
+    path = _path(entry_key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        os.makedirs(settings.OBJECT_TYPE_CACHE_PATH, exist_ok=True)
+        with open(tmp_path, "w") as file:
+            file.write(serialization.to_json(entry))
+        os.replace(tmp_path, path)  # readers never see a partially written entry
+    except OSError:
+        with suppress(OSError):
+            os.remove(tmp_path)
+
+
+def store_robot_meta(entry_key: str, robot_meta: RobotMeta) -> None:
+    """Adds robot meta to an existing entry."""
+
+    entry = load(entry_key)
+
+    if entry is not None:
+        entry.robot_meta = robot_meta
+        store(entry_key, entry)
+
+
+def prune(max_entries: int = MAX_ENTRIES) -> None:
+    """Removes the least recently used entries.
+
+    :param max_entries: Number of entries to be kept.
+    :return:
+    """
+
+    try:
+        entries = [entry for entry in os.scandir(settings.OBJECT_TYPE_CACHE_PATH) if entry.name.endswith(".json")]
+    except OSError:
+        return
+
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+
+    for entry in entries[max_entries:]:
+        with suppress(OSError):
+            os.remove(entry.path)
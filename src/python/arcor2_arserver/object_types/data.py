@@ -16,11 +16,13 @@ class ObjectTypeData:
     actions: Dict[str, ObjectAction] = field(default_factory=dict)
     ast: Optional[AST] = None
     robot_meta: Optional[RobotMeta] = None
+    cache_key: Optional[str] = None  # key of the entry in the persistent cache (if any)
 
     def __post_init__(self) -> None:
         if not self.meta.disabled:
             assert self.type_def is not None
-            assert self.ast is not None
+            # ast might be None for types obtained from the persistent cache
+            assert self.ast is not None or self.cache_key is not None
 
 
 ObjectTypeDict = Dict[str, ObjectTypeData]
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from arcor2.object_types.abstract import Generic, Robot
+from arcor2_arserver import settings
+from arcor2_arserver.object_types import cache
+from arcor2_arserver_data.objects import ObjectAction, ObjectTypeMeta
+
+
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "OBJECT_TYPE_CACHE_PATH", str(tmp_path / "cache"))
+
+
+def test_key() -> None:
+
+    base_key = cache.key("class Base(Generic):\n    pass\n")
+
+    assert cache.key("source", base_key) == cache.key("source", base_key)
+    assert cache.key("source", base_key) != cache.key("source")
+    assert cache.key("source", base_key) != cache.key("changed source", base_key)
+
+    assert cache.built_in_key(Generic) != cache.built_in_key(Robot)
+
+
+def test_store_load() -> None:
+
+    entry = cache.CachedObjectType(ObjectTypeMeta("Test", base="Generic"), [ObjectAction("action")])
+    key = cache.key("test_store_load")
+
+    assert cache.load(key) is None
+
+    cache.store(key, entry)
+    assert cache.load(key) == entry
+
+    with open(os.path.join(settings.OBJECT_TYPE_CACHE_PATH, f"{key}.json"), "w") as file:
+        file.write('{"meta": ')  # e.g. ARServer killed while writing the file
+
+    assert cache.load(key) is None
+
+
+def test_prune() -> None:
+
+    keys = [cache.key(f"test_prune_{idx}") for idx in range(5)]
+
+    for idx, key in enumerate(keys):
+        cache.store(key, cache.CachedObjectType(ObjectTypeMeta(f"Test{idx}")))
+        os.utime(os.path.join(settings.OBJECT_TYPE_CACHE_PATH, f"{key}.json"), (idx, idx))
+
+    cache.prune(2)
+
+    assert [key for key in keys if cache.load(key)] == keys[-2:]
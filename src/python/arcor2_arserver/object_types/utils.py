@@ -19,6 +19,7 @@ from arcor2.parameter_plugins.utils import plugin_from_type
 from arcor2.source.utils import SourceException, find_function, parse_def
 from arcor2_arserver import globals as glob
 from arcor2_arserver import settings
+from arcor2_arserver.object_types import cache
 from arcor2_arserver.object_types.data import ObjectTypeData, ObjectTypeDict
 from arcor2_arserver_data.objects import ObjectAction, ObjectTypeMeta
 
@@ -121,9 +122,27 @@ def built_in_types_data() -> ObjectTypeDict:
 
         assert issubclass(type_def, Generic)
 
-        ast = parse_def(type_def)
-
-        d = ObjectTypeData(meta_from_def(type_def, built_in=True), type_def, object_actions(type_def, ast), ast)
+        cache_key = cache.built_in_key(type_def)
+        entry = cache.load(cache_key)
+
+        if entry is None:
+            ast = parse_def(type_def)
+            d = ObjectTypeData(
+                meta_from_def(type_def, built_in=True),
+                type_def,
+                object_actions(type_def, ast),
+                ast,
+                cache_key=cache_key,
+            )
+            cache.store(cache_key, cache.CachedObjectType(d.meta, list(d.actions.values())))
+        else:
+            d = ObjectTypeData(
+                entry.meta,
+                type_def,
+                {act.name: act for act in entry.actions},
+                robot_meta=entry.robot_meta,
+                cache_key=cache_key,
+            )
 
         ret[d.meta.type] = d
 
@@ -1,21 +1,24 @@
 import asyncio
 import os
-from typing import Optional, Type
+from typing import Dict, Optional, Set, Type
+
+from typed_ast.ast3 import AST
 
 from arcor2 import helpers as hlp
 from arcor2.clients import aio_persistent_storage as ps
 from arcor2.data.events import Event
-from arcor2.data.object_type import ObjectModel
+from arcor2.data.object_type import Model, ObjectModel, ObjectType
 from arcor2.exceptions import Arcor2Exception
 from arcor2.object_types import utils as otu
 from arcor2.object_types.abstract import Generic, Robot
 from arcor2.object_types.utils import built_in_types_names, get_containing_module_sources
 from arcor2.parameter_plugins.base import TypesDict
-from arcor2.source.utils import parse
+from arcor2.source.utils import parse_cached
 from arcor2_arserver import globals as glob
 from arcor2_arserver import notifications as notif
 from arcor2_arserver import settings
 from arcor2_arserver.clients import persistent_storage as storage
+from arcor2_arserver.object_types import cache
 from arcor2_arserver.object_types.source import prepare_object_types_dir
 from arcor2_arserver.object_types.utils import (
     ObjectTypeData,
@@ -31,10 +34,46 @@ from arcor2_arserver.robot import get_robot_meta
 from arcor2_arserver_data.events.objects import ChangedObjectTypes
 from arcor2_arserver_data.objects import ObjectTypeMeta
 
+# views of glob.OBJECT_TYPES, created on demand and dropped on any change
+_types_dict: Optional[TypesDict] = None
+_valid_object_types: Optional[ObjectTypeDict] = None
+_object_types_version = 0
+
+
+def object_types_changed() -> None:
+    """Has to be called after each modification of glob.OBJECT_TYPES
+    (including replacing type_def or disabling a type)."""
+
+    global _types_dict
+    global _valid_object_types
+    global _object_types_version
+
+    _types_dict = None
+    _valid_object_types = None
+    _object_types_version += 1
+
+
+def object_types_version() -> int:
+    """Version of glob.OBJECT_TYPES, incremented on each change.
+
+    Might be used as a part of a key by caches depending on ObjectTypes.
+    """
+
+    return _object_types_version
+
 
 def get_types_dict() -> TypesDict:
+    """Type definitions of all ObjectTypes.
+
+    The dict is shared (until a change of ObjectTypes), so it must not be modified.
+    """
 
-    return {k: v.type_def for k, v in glob.OBJECT_TYPES.items() if v.type_def is not None}
+    global _types_dict
+
+    if _types_dict is None:
+        _types_dict = {k: v.type_def for k, v in glob.OBJECT_TYPES.items() if v.type_def is not None}
+
+    return _types_dict
 
 
 def get_obj_type_name(object_id: str) -> str:
@@ -50,10 +89,17 @@ def get_obj_type_name(object_id: str) -> str:
 def valid_object_types() -> ObjectTypeDict:
     """To get only valid (not disabled) types.
 
+    The dict is shared (until a change of ObjectTypes), so it must not be modified.
+
     :return:
     """
 
-    return {obj_type: obj for obj_type, obj in glob.OBJECT_TYPES.items() if not obj.meta.disabled}
+    global _valid_object_types
+
+    if _valid_object_types is None:
+        _valid_object_types = {obj_type: obj for obj_type, obj in glob.OBJECT_TYPES.items() if not obj.meta.disabled}
+
+    return _valid_object_types
 
 
 async def handle_robot_urdf(robot: Type[Robot]) -> None:
@@ -69,36 +115,50 @@ async def handle_robot_urdf(robot: Type[Robot]) -> None:
         glob.logger.exception(f"Failed to download URDF for {robot.__name__}.")
 
 
-async def get_object_data(object_types: ObjectTypeDict, obj_id: str) -> None:
+def _up_to_date(obj: ObjectType) -> bool:
+    """Checks whether the ObjectType is already imported from the same
+    source."""
 
-    glob.logger.debug(f"Processing {obj_id}.")
+    try:
+        stored_type_def = glob.OBJECT_TYPES[obj.id].type_def
+    except KeyError:
+        return False
 
-    if obj_id in object_types:
-        glob.logger.debug(f"{obj_id} already processed, skipping...")
-        return
+    return stored_type_def is not None and hash(get_containing_module_sources(stored_type_def)) == hash(obj.source)
 
-    obj = await storage.get_object_type(obj_id)
 
-    if obj_id in glob.OBJECT_TYPES and glob.OBJECT_TYPES[obj_id].type_def is not None:
+def _disabled(obj_id: str, problem: str) -> ObjectTypeData:
+    return ObjectTypeData(ObjectTypeMeta(obj_id, "Object type disabled.", disabled=True, problem=problem))
 
-        stored_type_def = glob.OBJECT_TYPES[obj_id].type_def
-        assert stored_type_def
-        if hash(get_containing_module_sources(stored_type_def)) == hash(obj.source):
-            glob.logger.debug(f"No need to update {obj_id}.")
-            return
 
-    try:
-        base = otu.base_from_source(obj.source, obj_id)
-        if base and base not in object_types.keys() | built_in_types_names():
-            glob.logger.debug(f"Getting base class {base} for {obj_id}.")
-            await get_object_data(object_types, base)
-    except Arcor2Exception:
-        object_types[obj_id] = ObjectTypeData(
-            ObjectTypeMeta(obj_id, "Object type disabled.", disabled=True, problem="Can't get base.")
-        )
-        return
+def _base_of(obj: ObjectType) -> Optional[str]:
+    """Gets name of the base class of the ObjectType (could be run in a worker
+    thread)."""
 
-    glob.logger.debug(f"Updating {obj_id}.")
+    return otu.base_from_ast(parse_cached(obj.source, comments=False), obj.id)
+
+
+async def _import_object_type(
+    object_types: ObjectTypeDict,
+    obj: ObjectType,
+    models: Dict[str, Model],
+    cache_key: str,
+    entry: Optional[cache.CachedObjectType] = None,
+    tree: Optional[AST] = None,
+) -> None:
+    """Imports the ObjectType (its base has to be imported already) and stores
+    its data into object_types.
+
+    :param object_types: Processed ObjectTypes.
+    :param obj: ObjectType to be imported.
+    :param models: Models obtained in advance.
+    :param cache_key: Key of the ObjectType in the persistent cache.
+    :param entry: Cached analysis. If not given, the type is analyzed (tree is needed) and the result is cached.
+    :param tree: Parsed source of the ObjectType.
+    :return:
+    """
+
+    glob.logger.debug(f"Updating {obj.id}.")
 
     try:
         type_def = await hlp.run_in_executor(
@@ -110,33 +170,180 @@ async def get_object_data(object_types: ObjectTypeDict, obj_id: str) -> None:
             settings.OBJECT_TYPE_MODULE,
         )
         assert issubclass(type_def, Generic)
-        meta = meta_from_def(type_def)
+        meta = entry.meta if entry else meta_from_def(type_def)
         otu.get_settings_def(type_def)  # just to check if settings are ok
     except Arcor2Exception as e:
         glob.logger.warning(f"Disabling object type {obj.id}.")
         glob.logger.debug(e, exc_info=True)
-        object_types[obj_id] = ObjectTypeData(
-            ObjectTypeMeta(obj_id, "Object type disabled.", disabled=True, problem=str(e))
-        )
+        object_types[obj.id] = _disabled(obj.id, str(e))
         return
 
+    if entry:
+        actions = {act.name: act for act in entry.actions}
+    else:
+        assert tree is not None
+        actions = object_actions(type_def, tree)
+        # has to be stored before meta gets modified
+        await hlp.run_in_executor(cache.store, cache_key, cache.CachedObjectType(meta, list(actions.values())))
+
     if obj.model:
         try:
-            model = await storage.get_model(obj.model.id, obj.model.type)
+            try:
+                model = models[obj.model.id]
+            except KeyError:
+                model = await storage.get_model(obj.model.id, obj.model.type)
         except Arcor2Exception:
             glob.logger.error(f"{obj.model.id}: failed to get collision model of type {obj.model.type}.")
             meta.disabled = True
             meta.problem = "Can't get collision model."
-            object_types[obj_id] = ObjectTypeData(meta)
+            object_types[obj.id] = ObjectTypeData(meta)
             return
 
         kwargs = {model.type().value.lower(): model}
         meta.object_model = ObjectModel(model.type(), **kwargs)  # type: ignore
 
-    ast = parse(obj.source)
-    otd = ObjectTypeData(meta, type_def, object_actions(type_def, ast), ast)
+    object_types[obj.id] = ObjectTypeData(
+        meta, type_def, actions, tree, entry.robot_meta if entry else None, cache_key=cache_key
+    )
+
+
+async def import_object_types(
+    object_types: ObjectTypeDict, objects: Dict[str, ObjectType], models: Dict[str, Model]
+) -> None:
+    """Imports new or changed ObjectTypes and stores their data into
+    object_types.
+
+    Types analyzed before (with the same source code and ancestors) are
+    taken from the persistent cache, the rest is parsed concurrently in
+    worker threads. Then, the types are imported by levels of the
+    inheritance hierarchy - types whose bases are already imported are
+    imported concurrently.
+
+    :param object_types: Processed ObjectTypes.
+    :param objects: ObjectTypes to be processed. Missing ancestors are obtained and added.
+    :param models: Models obtained in advance. Those not present are obtained separately.
+    :return:
+    """
+
+    bases: Dict[str, Optional[str]] = {}
+
+    to_check = [obj for obj in objects.values() if obj.id not in object_types]
+
+    while to_check:
+
+        up_to_date = {obj.id for obj in to_check if _up_to_date(obj)}
+
+        if up_to_date:
+            glob.logger.debug(f"No need to update {up_to_date}.")
+
+        to_check = [obj for obj in to_check if obj.id not in up_to_date]
+
+        results = await asyncio.gather(
+            *[hlp.run_in_executor(_base_of, obj) for obj in to_check], return_exceptions=True
+        )
+
+        missing_bases: Set[str] = set()
+
+        for obj, res in zip(to_check, results):
 
-    object_types[obj_id] = otd
+            if isinstance(res, Arcor2Exception):
+                object_types[obj.id] = _disabled(obj.id, "Can't get base.")
+                continue
+
+            if isinstance(res, BaseException):
+                raise res
+
+            bases[obj.id] = res
+
+            if res and res not in objects and res not in built_in_types_names():
+                missing_bases.add(res)
+
+        to_check = []
+
+        # ancestors that were not listed by the storage (hardly ever happens)
+        for base in missing_bases:
+            glob.logger.debug(f"Getting base class {base}.")
+            try:
+                objects[base] = await storage.get_object_type(base)
+            except Arcor2Exception:
+                for obj_id in [obj_id for obj_id, obj_base in bases.items() if obj_base == base]:
+                    del bases[obj_id]
+                    object_types[obj_id] = _disabled(obj_id, "Can't get base.")
+                continue
+            to_check.append(objects[base])
+
+    keys: Dict[str, str] = {}
+
+    def cache_key(obj_id: str) -> str:
+
+        if obj_id not in keys:
+
+            keys[obj_id] = ""  # in case of cyclic inheritance
+            base = bases[obj_id]
+
+            if base in bases:
+                base_key = cache_key(base)
+            elif base in glob.OBJECT_TYPES:
+                base_key = glob.OBJECT_TYPES[base].cache_key or ""
+            else:
+                base_key = ""
+
+            keys[obj_id] = cache.key(objects[obj_id].source, base_key)
+
+        return keys[obj_id]
+
+    for obj_id in bases:
+        cache_key(obj_id)
+
+    entries = dict(
+        zip(keys, await asyncio.gather(*[hlp.run_in_executor(cache.load, obj_key) for obj_key in keys.values()]))
+    )
+
+    glob.logger.debug(f"Cached ObjectTypes: {[obj_id for obj_id, entry in entries.items() if entry]}")
+
+    # types not found in the cache have to be analyzed
+    to_parse = [obj_id for obj_id, entry in entries.items() if entry is None]
+    trees: Dict[str, AST] = {}
+
+    for obj_id, res in zip(
+        to_parse,
+        await asyncio.gather(
+            *[hlp.run_in_executor(parse_cached, objects[obj_id].source) for obj_id in to_parse], return_exceptions=True
+        ),
+    ):
+
+        if isinstance(res, Arcor2Exception):
+            del bases[obj_id]
+            object_types[obj_id] = _disabled(obj_id, str(res))
+        elif isinstance(res, BaseException):
+            raise res
+        else:
+            trees[obj_id] = res
+
+    # only dependencies between types being imported matter
+    pending = {obj_id: base if base in bases else None for obj_id, base in bases.items()}
+
+    while pending:
+
+        ready = [obj_id for obj_id, base in pending.items() if base not in pending]
+
+        if not ready:
+            for obj_id in pending:
+                glob.logger.warning(f"Disabling object type {obj_id}.")
+                object_types[obj_id] = _disabled(obj_id, "Cyclic inheritance.")
+            break
+
+        await asyncio.gather(
+            *[
+                _import_object_type(
+                    object_types, objects[obj_id], models, keys[obj_id], entries[obj_id], trees.get(obj_id)
+                )
+                for obj_id in ready
+            ]
+        )
+
+        for obj_id in ready:
+            del pending[obj_id]
 
 
 async def get_object_types() -> None:
@@ -154,14 +361,30 @@ async def get_object_types() -> None:
         glob.logger.debug("Initialization of object types.")
         initialization = True
         await hlp.run_in_executor(prepare_object_types_dir, settings.OBJECT_TYPE_PATH, settings.OBJECT_TYPE_MODULE)
+        await hlp.run_in_executor(cache.prune)
         glob.OBJECT_TYPES.update(built_in_types_data())
+        object_types_changed()
 
     updated_object_types: ObjectTypeDict = {}
 
     object_type_ids = {it.id for it in (await storage.get_object_type_ids()).items}
 
-    for obj_id in object_type_ids:
-        await get_object_data(updated_object_types, obj_id)
+    # all ObjectTypes are obtained at once, models only for those which are going to be (re)imported
+    objects = {obj.id: obj for obj in await storage.get_object_types(object_type_ids)}
+    models: Dict[str, Model] = {}
+
+    try:
+        models.update(
+            (model.id, model)
+            for model in await storage.get_models(
+                obj.model for obj in objects.values() if obj.model and not _up_to_date(obj)
+            )
+        )
+    except Arcor2Exception:
+        # models are going to be obtained one by one and types with an unavailable model will be disabled
+        glob.logger.warning("Failed to get models at once.")
+
+    await import_object_types(updated_object_types, objects, models)
 
     removed_object_ids = {
         obj for obj in glob.OBJECT_TYPES.keys() if obj not in object_type_ids
@@ -182,9 +405,11 @@ async def get_object_types() -> None:
         for removed in removed_object_ids:
             assert removed not in built_in_types_names(), "Attempt to remove built-in type."
             del glob.OBJECT_TYPES[removed]
+            object_types_changed()
             await hlp.run_in_executor(remove_object_type, removed)
 
     glob.OBJECT_TYPES.update(updated_object_types)
+    object_types_changed()
 
     glob.logger.debug(f"All known ids: {glob.OBJECT_TYPES.keys()}")
 
@@ -216,7 +441,13 @@ async def get_object_types() -> None:
     for obj_type in updated_object_types.values():
 
         if obj_type.type_def and issubclass(obj_type.type_def, Robot) and not obj_type.type_def.abstract():
-            await get_robot_meta(obj_type)
+
+            if obj_type.robot_meta is None:
+                await get_robot_meta(obj_type)
+                if obj_type.cache_key:
+                    assert obj_type.robot_meta
+                    await hlp.run_in_executor(cache.store_robot_meta, obj_type.cache_key, obj_type.robot_meta)
+
             asyncio.ensure_future(handle_robot_urdf(obj_type.type_def))
 
     # if object does not change but its base has changed, it has to be reloaded
@@ -235,6 +466,7 @@ async def get_object_types() -> None:
                 settings.OBJECT_TYPE_PATH,
                 settings.OBJECT_TYPE_MODULE,
             )
+            object_types_changed()
 
 
 async def get_robot_instance(robot_id: str, end_effector_id: Optional[str] = None) -> Robot:
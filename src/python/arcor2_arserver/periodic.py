@@ -0,0 +1,114 @@
+"""Periodic execution with absolute deadlines.
+
+Deadlines are multiples of the period since the start, so there is no
+drift caused by the duration of ticks or by imprecise sleeping. When a
+tick takes longer than the period, missed ticks are skipped instead of
+being executed in a burst.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+
+from arcor2.exceptions import Arcor2Exception
+
+
+@dataclass
+class PeriodicStats:
+
+    ticks: int = 0  # executed ticks
+    overruns: int = 0  # ticks that took longer than the period
+    skipped: int = 0  # ticks that were skipped due to overruns
+    max_jitter: float = 0.0  # the biggest delay of a tick after its deadline (seconds)
+    jitter_sum: float = 0.0
+
+    @property
+    def mean_jitter(self) -> float:
+        return self.jitter_sum / self.ticks if self.ticks else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "max_jitter": self.max_jitter,
+            "mean_jitter": self.mean_jitter,
+        }
+
+
+class Periodic:
+    """Yields deadlines of ticks, the period might be changed at any time
+    (it applies from the next tick).
+
+    Usage:
+
+    async for deadline in Periodic(0.1).ticks():
+        ...
+    """
+
+    def __init__(self, period: float) -> None:
+
+        if period <= 0:
+            raise Arcor2Exception("Period must be positive.")
+
+        self.period = period
+        self.stats = PeriodicStats()
+
+    async def ticks(self) -> AsyncIterator[float]:
+
+        deadline = time.monotonic()
+
+        while True:
+
+            now = time.monotonic()
+
+            if now < deadline:
+                await asyncio.sleep(deadline - now)
+                now = time.monotonic()
+
+            jitter = now - deadline
+            self.stats.ticks += 1
+            self.stats.jitter_sum += jitter
+            self.stats.max_jitter = max(self.stats.max_jitter, jitter)
+
+            yield deadline
+
+            deadline += self.period
+            now = time.monotonic()
+
+            if now > deadline:  # the tick took too long, the next one is executed right away
+                self.stats.overruns += 1
+                missed = int((now - deadline) // self.period)
+                self.stats.skipped += missed
+                deadline += missed * self.period
+
+
+class Subsampler:
+    """Selects ticks of a faster schedule for a slower one (e.g. 2 Hz out
+    of 30 Hz)."""
+
+    def __init__(self, period: float) -> None:
+
+        self.period = period
+        self._next: Optional[float] = None
+
+    def due(self, deadline: float, tick_period: float) -> bool:
+        """Decides whether the tick belongs to this schedule.
+
+        :param deadline: Deadline of the tick.
+        :param tick_period: Period of the faster schedule.
+        :return:
+        """
+
+        if self._next is None:
+            self._next = deadline
+        elif deadline < self._next - tick_period / 2:
+            return False
+
+        self._next += self.period
+
+        if self._next <= deadline:  # ticks were skipped, keep the phase of the faster schedule
+            self._next = deadline + self.period
+
+        return True
@@ -1,17 +1,22 @@
 import asyncio
-from typing import Any, AsyncIterator, Callable, Dict, List, Set, Union
+import json
+import os
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Union
+
+from lru import LRU
 
 from arcor2 import helpers as hlp
 from arcor2.action import results_to_json
 from arcor2.cached import CachedProject, CachedScene, UpdateableCachedProject
 from arcor2.data import common
+from arcor2.data.serialization import dumps, to_dict
 from arcor2.exceptions import Arcor2Exception
 from arcor2.parameter_plugins import ParameterPluginException
 from arcor2.parameter_plugins.utils import known_parameter_types, plugin_from_type_name
 from arcor2_arserver import globals as glob
 from arcor2_arserver import notifications as notif
 from arcor2_arserver.clients import persistent_storage as storage
-from arcor2_arserver.objects_actions import get_types_dict
+from arcor2_arserver.objects_actions import get_types_dict, object_types_version
 from arcor2_arserver.scene import open_scene
 from arcor2_arserver_data.events.actions import ActionExecution, ActionResult
 from arcor2_arserver_data.events.common import ShowMainScreen
@@ -20,6 +25,12 @@ from arcor2_arserver_data.objects import ObjectAction
 
 PREV_RESULTS: Dict[str, List[Any]] = {}
 
+# max. number of remembered results of action checks (see project_problems)
+ACTION_PROBLEMS_CACHE_SIZE = int(os.getenv("ARCOR2_ARSERVER_VALIDATION_CACHE_SIZE", 10000))
+
+# results of check_action_params (None when the action is ok), keyed by everything the check depends on
+_action_problems: Dict[str, Optional[str]] = LRU(ACTION_PROBLEMS_CACHE_SIZE)  # type: ignore
+
 
 def remove_prev_result(action_id: str) -> None:
 
@@ -310,7 +321,80 @@ async def projects_referencing_object(scene_id: str, obj_id: str) -> AsyncIterat
             yield project
 
 
+def _referenced_items(project: CachedProject, value: str) -> List[Any]:
+    """Orientations (including their APs) and joints referenced by a
+    parameter value."""
+
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return []
+
+    if isinstance(parsed, str):
+        ids = [parsed]
+    elif isinstance(parsed, list):
+        ids = [item for item in parsed if isinstance(item, str)]
+    else:
+        return []
+
+    items: List[Any] = []
+
+    for item_id in ids:
+
+        try:
+            ap, ori = project.bare_ap_and_orientation(item_id)
+        except Arcor2Exception:
+            pass
+        else:
+            items.append([to_dict(ap), to_dict(ori)])
+            continue
+
+        try:
+            items.append(to_dict(project.joints(item_id)))
+        except Arcor2Exception:
+            items.append(item_id)  # an arbitrary string or a dangling reference
+
+    return items
+
+
+def action_key(obj_type: str, project: CachedProject, action: common.Action) -> str:
+    """Returns key describing everything that affects the result of
+    check_action_params for the action.
+
+    :param obj_type: Type of the object which action is used.
+    :param project:
+    :param action:
+    :return: The key changes whenever the action, ObjectTypes or referenced constants, orientations, joints or
+    outputs of linked actions change.
+    """
+
+    deps: List[Any] = []
+
+    for param in action.parameters:
+
+        try:
+            if param.type == common.ActionParameter.TypeEnum.CONSTANT:
+                deps.append(to_dict(project.constant(param.value)))
+            elif param.type == common.ActionParameter.TypeEnum.LINK:
+                deps.append([to_dict(flow) for flow in project.action(param.parse_link().action_id).flows])
+            else:
+                deps.append(_referenced_items(project, param.value))
+        except Arcor2Exception:
+            deps.append(None)
+
+    return dumps([object_types_version(), obj_type, to_dict(action), deps])
+
+
 def project_problems(scene: CachedScene, project: CachedProject) -> List[str]:
+    """Checks the project against the scene and ObjectTypes.
+
+    Results of checks of actions are remembered, so only actions that are new or affected by a change are checked
+    again.
+
+    :param scene:
+    :param project:
+    :return: List of problems, empty when the project is valid.
+    """
 
     scene_objects: Dict[str, str] = {obj.id: obj.type for obj in scene.objects}
 
@@ -335,11 +419,13 @@ def project_problems(scene: CachedScene, project: CachedProject) -> List[str]:
                     f"Action point {ap.name} has invalid joints: {joints.name} " f"(robot {joints.robot_id})."
                 )
 
-        for action in project.actions:
+        for action in project.ap_actions(ap.id):
 
             if action.id in action_ids:
                 problems.append(f"Action {action.name} of the {ap.name} is not unique.")
 
+            action_ids.add(action.id)
+
             # check if objects have used actions
             obj_id, action_type = action.parse_type()
 
@@ -358,10 +444,21 @@ def project_problems(scene: CachedScene, project: CachedProject) -> List[str]:
                 )
                 continue
 
+            key = action_key(os_type, project, action)
+
             try:
-                check_action_params(scene, project, action, glob.OBJECT_TYPES[os_type].actions[action_type])
-            except Arcor2Exception as e:
-                problems.append(str(e))
+                problem = _action_problems[key]
+            except KeyError:
+                try:
+                    check_action_params(scene, project, action, glob.OBJECT_TYPES[os_type].actions[action_type])
+                except Arcor2Exception as e:
+                    problem = str(e)
+                else:
+                    problem = None
+                _action_problems[key] = problem
+
+            if problem:
+                problems.append(problem)
 
     return problems
 
@@ -1,5 +1,9 @@
+import asyncio
 import inspect
-from typing import List, Optional, Set, Type
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple, Type
 
 from typed_ast.ast3 import AST
 
@@ -7,6 +11,7 @@ import arcor2.helpers as hlp
 from arcor2.data import common
 from arcor2.exceptions import Arcor2Exception
 from arcor2.object_types.abstract import Robot
+from arcor2.source.utils import parse_def
 from arcor2_arserver import globals as glob
 from arcor2_arserver import notifications as notif
 from arcor2_arserver import objects_actions as osa
@@ -15,19 +20,240 @@ from arcor2_arserver.object_types.source import function_implemented
 from arcor2_arserver_data import events as sevts
 from arcor2_arserver_data.robot import RobotMeta
 
+# state of a robot is sampled (for streams) once per this period
+SAMPLING_PERIOD = float(os.getenv("ARCOR2_ARSERVER_ROBOT_SAMPLING_PERIOD", 0.1))
+# max. rate (Hz) of streams that might be requested by UIs
+MAX_STREAM_RATE = float(os.getenv("ARCOR2_ARSERVER_ROBOT_MAX_STREAM_RATE", 50))
+
+# delta streams: smaller changes (rad, m, quaternion components) are not sent
+STREAM_EPSILON = float(os.getenv("ARCOR2_ARSERVER_ROBOT_STREAM_EPSILON", 1e-4))
+# delta streams: values are rounded to this number of decimal places
+STREAM_DECIMALS = int(os.getenv("ARCOR2_ARSERVER_ROBOT_STREAM_DECIMALS", 5))
+# delta streams: full state is sent at least once per this period (seconds)
+KEYFRAME_PERIOD = float(os.getenv("ARCOR2_ARSERVER_ROBOT_KEYFRAME_PERIOD", 5.0))
+
+Values = Dict[str, Tuple[float, ...]]
+
 
 class RobotPoseException(Arcor2Exception):
     pass
 
 
+@dataclass
+class RobotState:
+    """Snapshot of a robot state, parts that were not sampled are
+    None."""
+
+    timestamp: float  # time.monotonic() when the sampling started
+    joints: Optional[List[common.Joint]] = None
+    eef_poses: Optional[Dict[str, common.Pose]] = None
+
+
+class RobotSampler:
+    """Samples state of a robot (joints and poses of all end effectors at
+    once).
+
+    The latest snapshot is shared by all consumers (streams, RPCs), so
+    the robot is not polled more often because of more UIs. IDs of end
+    effectors are obtained just once.
+    """
+
+    def __init__(self, robot_inst: Robot) -> None:
+
+        self.robot = robot_inst
+        self.state = RobotState(0.0)
+        self._end_effectors: Optional[FrozenSet[str]] = None
+        self._lock = asyncio.Lock()
+
+    async def end_effectors(self) -> FrozenSet[str]:
+
+        if self._end_effectors is None:
+            self._end_effectors = frozenset(await hlp.run_in_executor(self.robot.get_end_effectors_ids))
+
+        return self._end_effectors
+
+    async def _eef_poses(self) -> Dict[str, common.Pose]:
+
+        eef_ids = list(await self.end_effectors())
+        poses = await asyncio.gather(
+            *[hlp.run_in_executor(self.robot.get_end_effector_pose, eef_id) for eef_id in eef_ids]
+        )
+        return dict(zip(eef_ids, poses))
+
+    async def sample(self, joints: bool = True, eef: bool = True, max_age: float = 0.0) -> RobotState:
+        """Returns state of the robot. The robot is polled only when the
+        latest snapshot is older than max_age or misses some of the
+        requested parts.
+
+        :param joints: Joints are needed.
+        :param eef: Poses of end effectors are needed.
+        :param max_age: Acceptable age of the snapshot (seconds).
+        :return:
+        """
+
+        async with self._lock:  # concurrent consumers wait for the ongoing sampling and then (probably) get its result
+
+            state = self.state
+
+            if (
+                time.monotonic() - state.timestamp <= max_age
+                and (not joints or state.joints is not None)
+                and (not eef or state.eef_poses is not None)
+            ):
+                return state
+
+            state = RobotState(time.monotonic())
+
+            if joints and eef:
+                state.joints, state.eef_poses = await asyncio.gather(
+                    hlp.run_in_executor(self.robot.robot_joints), self._eef_poses()
+                )
+            elif joints:
+                state.joints = await hlp.run_in_executor(self.robot.robot_joints)
+            elif eef:
+                state.eef_poses = await self._eef_poses()
+
+            self.state = state
+            return state
+
+
+_samplers: Dict[str, RobotSampler] = {}
+
+
+async def sampler(robot_id: str) -> RobotSampler:
+    """Returns sampler of the robot (a new one for a new robot
+    instance)."""
+
+    robot_inst = await osa.get_robot_instance(robot_id)
+
+    try:
+        smp = _samplers[robot_id]
+    except KeyError:
+        pass
+    else:
+        if smp.robot is robot_inst:
+            return smp
+
+    smp = _samplers[robot_id] = RobotSampler(robot_inst)
+    return smp
+
+
+def remove_sampler(robot_id: str) -> None:
+    """Forgets sampler of the robot (when its instance is destroyed)."""
+
+    try:
+        del _samplers[robot_id]
+    except KeyError:
+        pass
+
+
+def remove_samplers() -> None:
+    """Forgets samplers of all robots (when the scene is stopped)."""
+
+    _samplers.clear()
+
+
+def joints_values(joints: List[common.Joint]) -> Values:
+    return {joint.name: (joint.value,) for joint in joints}
+
+
+def eef_values(eef_poses: Dict[str, common.Pose]) -> Values:
+    return {eef_id: (*pose.position, *pose.orientation) for eef_id, pose in eef_poses.items()}
+
+
+def quantize(value: float) -> float:
+    return round(value, STREAM_DECIMALS)
+
+
+@dataclass
+class Frame:
+    """What should be sent within a frame of a delta stream."""
+
+    seq: int
+    base: Optional[int]  # seq of the keyframe the delta is relative to, None for a keyframe
+    items: List[str]
+
+
+class DeltaEncoder:
+    """Decides what has to be sent within a delta stream (e.g. of robot
+    joints).
+
+    A keyframe contains all items, a delta frame only items that differ from the last keyframe by more than epsilon.
+    Therefore, a delta frame might be dropped or superseded by a newer one without consequences for the receiver.
+    Nothing is sent while values do not change, except for periodic keyframes.
+    """
+
+    def __init__(self, epsilon: float = STREAM_EPSILON, keyframe_period: float = KEYFRAME_PERIOD) -> None:
+
+        self.epsilon = epsilon
+        self.keyframe_period = keyframe_period
+        self.seq = 0
+        self._keyframe_seq: Optional[int] = None
+        self._keyframe_time = 0.0
+        self._keyframe: Values = {}
+        self._last: Values = {}  # what the receiver has after the last frame
+
+    def request_keyframe(self) -> None:
+        """Next frame will be a keyframe (e.g. for a new receiver)."""
+
+        self._keyframe_seq = None
+
+    def _differ(self, values: Values, ref: Values, item_id: str) -> bool:
+
+        try:
+            ref_val = ref[item_id]
+        except KeyError:
+            return True
+
+        return any(abs(a - b) > self.epsilon for a, b in zip(values[item_id], ref_val))
+
+    def encode(self, values: Values, now: Optional[float] = None) -> Optional[Frame]:
+        """Compares values with what was sent before.
+
+        :param values: Current values of all items.
+        :param now: time.monotonic() by default.
+        :return: Frame to be sent or None when there is nothing to send.
+        """
+
+        if now is None:
+            now = time.monotonic()
+
+        self.seq += 1
+
+        if (
+            self._keyframe_seq is None
+            or now - self._keyframe_time >= self.keyframe_period
+            or values.keys() != self._keyframe.keys()
+        ):
+            return self._encode_keyframe(values, now)
+
+        if not any(self._differ(values, self._last, item_id) for item_id in values):
+            self.seq -= 1
+            return None
+
+        changed = [item_id for item_id in values if self._differ(values, self._keyframe, item_id)]
+
+        if len(changed) == len(values):  # delta would be as big as a keyframe
+            return self._encode_keyframe(values, now)
+
+        self._last = {**self._keyframe, **{item_id: values[item_id] for item_id in changed}}
+        return Frame(self.seq, self._keyframe_seq, changed)
+
+    def _encode_keyframe(self, values: Values, now: float) -> Frame:
+
+        self._keyframe_seq = self.seq
+        self._keyframe_time = now
+        self._keyframe = self._last = values
+        return Frame(self.seq, None, list(values))
+
+
 async def get_end_effectors(robot_id: str) -> Set[str]:
     """
     :param robot_id:
     :return: IDs of existing end effectors.
     """
 
-    robot_inst = await osa.get_robot_instance(robot_id)
-    return await hlp.run_in_executor(robot_inst.get_end_effectors_ids)
+    return set(await (await sampler(robot_id)).end_effectors())
 
 
 async def get_grippers(robot_id: str) -> Set[str]:
@@ -50,25 +276,42 @@ async def get_suctions(robot_id: str) -> Set[str]:
     return await hlp.run_in_executor(robot_inst.suctions)
 
 
-async def get_end_effector_pose(robot_id: str, end_effector: str) -> common.Pose:
+async def get_end_effector_pose(robot_id: str, end_effector: str, max_age: float = 0.0) -> common.Pose:
     """
     :param robot_id:
     :param end_effector:
+    :param max_age: When set, pose might be taken from a snapshot not older than max_age.
     :return: Global pose
     """
 
-    robot_inst = await osa.get_robot_instance(robot_id, end_effector)
-    return await hlp.run_in_executor(robot_inst.get_end_effector_pose, end_effector)
+    smp = await sampler(robot_id)
+
+    if end_effector not in await smp.end_effectors():
+        raise Arcor2Exception("Unknown end effector ID.")
+
+    if max_age <= 0:
+        return await hlp.run_in_executor(smp.robot.get_end_effector_pose, end_effector)
 
+    state = await smp.sample(joints=False, eef=True, max_age=max_age)
+    assert state.eef_poses is not None
+    return state.eef_poses[end_effector]
 
-async def get_robot_joints(robot_id: str) -> List[common.Joint]:
+
+async def get_robot_joints(robot_id: str, max_age: float = 0.0) -> List[common.Joint]:
     """
     :param robot_id:
+    :param max_age: When set, joints might be taken from a snapshot not older than max_age.
     :return: List of joints
     """
 
-    robot_inst = await osa.get_robot_instance(robot_id)
-    return await hlp.run_in_executor(robot_inst.robot_joints)
+    smp = await sampler(robot_id)
+
+    if max_age <= 0:
+        return await hlp.run_in_executor(smp.robot.robot_joints)
+
+    state = await smp.sample(joints=True, eef=False, max_age=max_age)
+    assert state.joints is not None
+    return state.joints
 
 
 def feature(tree: AST, robot_type: Type[Robot], func_name: str) -> bool:
@@ -90,10 +333,12 @@ def _feature(type_def: Type[Robot], method_name: str) -> bool:
     if where_it_is_defined.type_def is Robot or where_it_is_defined.meta.disabled:
         return False
 
-    assert where_it_is_defined.ast is not None
     assert where_it_is_defined.type_def is not None
     assert issubclass(where_it_is_defined.type_def, Robot)
 
+    if where_it_is_defined.ast is None:  # the type was obtained from the persistent cache
+        where_it_is_defined.ast = parse_def(where_it_is_defined.type_def)
+
     return feature(where_it_is_defined.ast, where_it_is_defined.type_def, method_name)
 
 
@@ -61,7 +61,7 @@ async def calibrate_camera(camera: Camera) -> None:
         glob.logger.exception("Failed to calibrate the camera.")
         return
 
-    await update_scene_object_pose(glob.SCENE.object(camera.id), pose, camera)
+    await update_scene_object_pose(camera.id, pose, camera)
     await notif.broadcast_event(ProcessState(ProcessState.Data(CAMERA_CALIB, ProcessState.Data.StateEnum.Finished)))
 
 
@@ -170,7 +170,7 @@ async def focus_object_done_cb(req: srpc.o.FocusObjectDone.Request, ui: WsClient
 
     clean_up_after_focus(obj_id)
 
-    asyncio.ensure_future(update_scene_object_pose(obj, new_pose, obj_inst))
+    asyncio.ensure_future(update_scene_object_pose(obj.id, new_pose, obj_inst))
 
     return None
 
@@ -244,6 +244,7 @@ async def new_object_type_cb(req: srpc.o.NewObjectType.Request, ui: WsClient) ->
     await storage.update_object_type(obj)
 
     glob.OBJECT_TYPES[meta.type] = ObjectTypeData(meta, type_def, actions, ast)
+    osa.object_types_changed()
     add_ancestor_actions(meta.type, glob.OBJECT_TYPES)
 
     evt = sevts.o.ChangedObjectTypes([meta])
@@ -303,6 +304,7 @@ async def delete_object_type_cb(req: srpc.o.DeleteObjectType.Request, ui: WsClie
             glob.logger.error(str(e))
 
     del glob.OBJECT_TYPES[req.args.id]
+    osa.object_types_changed()
     remove_object_type(req.args.id)
 
     evt = sevts.o.ChangedObjectTypes([obj_type.meta])
@@ -3,7 +3,7 @@ import collections.abc as collections_abc
 import copy
 import inspect
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Dict, Optional, Set
+from typing import Any, AsyncGenerator, Dict, Optional, Set, Tuple
 
 from websockets.server import WebSocketServerProtocol as WsClient
 
@@ -22,8 +22,8 @@ from arcor2_arserver import notifications as notif
 from arcor2_arserver import project
 from arcor2_arserver.clients import persistent_storage as storage
 from arcor2_arserver.decorators import no_project, project_needed, scene_needed
-from arcor2_arserver.helpers import unique_name
-from arcor2_arserver.objects_actions import get_types_dict
+from arcor2_arserver.helpers import page, unique_name
+from arcor2_arserver.objects_actions import get_types_dict, object_types_version
 from arcor2_arserver.project import (
     check_action_params,
     check_flows,
@@ -38,6 +38,10 @@ from arcor2_arserver.scene import can_modify_scene, ensure_scene_started, get_in
 from arcor2_arserver_data import events as sevts
 from arcor2_arserver_data import rpc as srpc
 
+# ListProjects data of stored projects (key: project_id)
+# an item is valid while the project, its scene and ObjectTypes are unchanged
+PROJECTS_INFO: Dict[str, Tuple[Tuple[Any, ...], srpc.p.ListProjects.Response.Data]] = {}
+
 
 @asynccontextmanager
 async def managed_project(project_id: str, make_copy: bool = False) -> AsyncGenerator[UpdateableCachedProject, None]:
@@ -46,7 +50,7 @@ async def managed_project(project_id: str, make_copy: bool = False) -> AsyncGene
 
     if glob.PROJECT and glob.PROJECT.id == project_id:
         if make_copy:
-            project = copy.deepcopy(glob.PROJECT)
+            project = glob.PROJECT.snapshot()
             save_back = True
         else:
             project = glob.PROJECT
@@ -181,17 +185,46 @@ async def execute_action_cb(req: srpc.p.ExecuteAction.Request, ui: WsClient) ->
     return None
 
 
+def _project_data(project: common.Project) -> srpc.p.ListProjects.Response.Data:
+
+    assert project.modified is not None
+
+    return srpc.p.ListProjects.Response.Data(
+        id=project.id, desc=project.desc, name=project.name, scene_id=project.scene_id, modified=project.modified
+    )
+
+
 async def project_info(
-    project_id: str, scenes_lock: asyncio.Lock, scenes: Dict[str, CachedScene]
+    project_id: str, scenes_lock: asyncio.Lock, scenes: Dict[str, CachedScene], validate: bool = True
 ) -> srpc.p.ListProjects.Response.Data:
 
     project = await storage.get_project(project_id)
 
-    assert project.modified is not None
+    if not validate:
+        return _project_data(project)
 
-    pd = srpc.p.ListProjects.Response.Data(
-        id=project.id, desc=project.desc, name=project.name, scene_id=project.scene_id, modified=project.modified
-    )
+    scene: Optional[CachedScene] = None
+
+    try:
+        async with scenes_lock:
+            if project.scene_id not in scenes:
+                scenes[project.scene_id] = CachedScene(await storage.get_scene(project.scene_id))
+            scene = scenes[project.scene_id]
+    except storage.ProjectServiceException:
+        pass
+
+    key = (project.modified, scene.modified if scene else None, object_types_version())
+
+    try:
+        cached_key, cached_pd = PROJECTS_INFO[project_id]
+    except KeyError:
+        pass
+    else:
+        if cached_key == key:
+            return cached_pd
+
+    pd = _project_data(project)
+    PROJECTS_INFO[project_id] = key, pd
 
     try:
         cached_project = UpdateableCachedProject(project)
@@ -199,15 +232,11 @@ async def project_info(
         pd.problems.append(str(e))
         return pd
 
-    try:
-        async with scenes_lock:
-            if project.scene_id not in scenes:
-                scenes[project.scene_id] = CachedScene(await storage.get_scene(project.scene_id))
-    except storage.ProjectServiceException:
+    if scene is None:
         pd.problems.append("Scene does not exist.")
         return pd
 
-    pd.problems = project_problems(scenes[project.scene_id], cached_project)
+    pd.problems = project_problems(scene, cached_project)
     pd.valid = not pd.problems
 
     if not pd.valid:
@@ -230,8 +259,25 @@ async def list_projects_cb(req: srpc.p.ListProjects.Request, ui: WsClient) -> sr
     scenes: Dict[str, CachedScene] = {}
 
     resp = srpc.p.ListProjects.Response()
-    tasks = [project_info(project_iddesc.id, scenes_lock, scenes) for project_iddesc in projects.items]
-    resp.data = await asyncio.gather(*tasks)
+    items, resp.next_cursor = page(projects.items, req.args.cursor, req.args.page_size)
+    tasks = [asyncio.ensure_future(project_info(item.id, scenes_lock, scenes, req.args.validate)) for item in items]
+
+    try:
+        if req.args.stream:
+            resp.data = []
+            for task in asyncio.as_completed(tasks):
+                await notif.event(ui, sevts.p.ProjectListed(await task))
+        else:
+            resp.data = await asyncio.gather(*tasks)
+    finally:
+        # when a task fails (or the RPC is cancelled), the remaining ones are of no use
+        for task in tasks:
+            task.cancel()
+
+    # forget deleted projects
+    for project_id in PROJECTS_INFO.keys() - {project_iddesc.id for project_iddesc in projects.items}:
+        del PROJECTS_INFO[project_id]
+
     return resp
 
 
@@ -277,12 +323,9 @@ async def update_action_point_joints_using_robot_cb(
     assert glob.PROJECT
 
     robot_joints = glob.PROJECT.joints(req.args.joints_id)
-    robot_joints.joints = await get_robot_joints(robot_joints.robot_id)
-    robot_joints.is_valid = True
-
-    glob.PROJECT.update_modified()
+    new_joints = await get_robot_joints(robot_joints.robot_id)
 
-    evt = sevts.p.JointsChanged(robot_joints)
+    evt = sevts.p.JointsChanged(glob.PROJECT.update_joints(robot_joints.id, new_joints))
     evt.change_type = Event.Type.UPDATE
     asyncio.ensure_future(notif.broadcast_event(evt))
     return None
@@ -301,11 +344,7 @@ async def update_action_point_joints_cb(req: srpc.p.UpdateActionPointJoints.Requ
         raise Arcor2Exception("Joint names does not match the robot.")
 
     # TODO maybe joints values should be normalized? To <0, 2pi> or to <-pi, pi>?
-    robot_joints.joints = req.args.joints
-    robot_joints.is_valid = True
-    glob.PROJECT.update_modified()
-
-    evt = sevts.p.JointsChanged(robot_joints)
+    evt = sevts.p.JointsChanged(glob.PROJECT.update_joints(robot_joints.id, req.args.joints))
     evt.change_type = Event.Type.UPDATE
     asyncio.ensure_future(notif.broadcast_event(evt))
     return None
@@ -360,6 +399,7 @@ async def rename_action_point_cb(req: srpc.p.RenameActionPoint.Request, ui: WsCl
     if req.dry_run:
         return None
 
+    ap = glob.PROJECT.bare_action_point_mut(ap.id)
     ap.name = req.args.new_name
 
     glob.PROJECT.update_modified()
@@ -411,6 +451,8 @@ async def update_action_point_parent_cb(req: srpc.p.UpdateActionPointParent.Requ
     if req.dry_run:
         return
 
+    ap = glob.PROJECT.bare_action_point_mut(ap.id)
+
     if not ap.parent and req.args.new_parent_id:
         # AP position and all orientations will become relative to the parent
         tr.make_global_ap_relative(glob.SCENE, glob.PROJECT, ap, req.args.new_parent_id)
@@ -439,7 +481,7 @@ async def update_action_point_parent_cb(req: srpc.p.UpdateActionPointParent.Requ
     return None
 
 
-async def update_ap_position(ap: common.BareActionPoint, position: common.Position) -> None:
+async def update_ap_position(ap_id: str, position: common.Position) -> None:
     """Updates position of an AP and sends notification about joints that
     become invalid because of it.
 
@@ -450,19 +492,20 @@ async def update_ap_position(ap: common.BareActionPoint, position: common.Positi
 
     assert glob.PROJECT
 
-    valid_joints = [joints for joints in glob.PROJECT.ap_joints(ap.id) if joints.is_valid]
-    glob.PROJECT.update_ap_position(ap.id, position)
+    valid_joints_ids = [joints.id for joints in glob.PROJECT.ap_joints(ap_id) if joints.is_valid]
+    glob.PROJECT.update_ap_position(ap_id, position)
 
-    for joints in valid_joints:  # those are now invalid, so let's notify UI about the change
+    for joints_id in valid_joints_ids:  # those are now invalid, so let's notify UI about the change
 
+        joints = glob.PROJECT.joints(joints_id)
         assert not joints.is_valid
 
         evt = sevts.p.JointsChanged(joints)
         evt.change_type = Event.Type.UPDATE
-        evt.parent_id = ap.id
+        evt.parent_id = ap_id
         asyncio.ensure_future(notif.broadcast_event(evt))
 
-    ap_evt = sevts.p.ActionPointChanged(ap)
+    ap_evt = sevts.p.ActionPointChanged(glob.PROJECT.bare_action_point(ap_id))
     ap_evt.change_type = Event.Type.UPDATE_BASE
     asyncio.ensure_future(notif.broadcast_event(ap_evt))
 
@@ -478,7 +521,7 @@ async def update_action_point_position_cb(req: srpc.p.UpdateActionPointPosition.
     if req.dry_run:
         return
 
-    await update_ap_position(ap, req.args.new_position)
+    await update_ap_position(ap.id, req.args.new_position)
 
 
 @scene_needed
@@ -496,7 +539,7 @@ async def update_action_point_using_robot_cb(req: srpc.p.UpdateActionPointUsingR
     if ap.parent:
         new_pose = tr.make_pose_rel_to_parent(glob.SCENE, glob.PROJECT, new_pose, ap.parent)
 
-    await update_ap_position(glob.PROJECT.bare_action_point(req.args.action_point_id), new_pose.position)
+    await update_ap_position(ap.id, new_pose.position)
     return None
 
 
@@ -540,12 +583,7 @@ async def update_action_point_orientation_cb(req: srpc.p.UpdateActionPointOrient
     assert glob.SCENE
     assert glob.PROJECT
 
-    orientation = glob.PROJECT.orientation(req.args.orientation_id)
-    orientation.orientation = req.args.orientation
-
-    glob.PROJECT.update_modified()
-
-    evt = sevts.p.OrientationChanged(orientation)
+    evt = sevts.p.OrientationChanged(glob.PROJECT.update_orientation(req.args.orientation_id, req.args.orientation))
     evt.change_type = Event.Type.UPDATE
     asyncio.ensure_future(notif.broadcast_event(evt))
     return None
@@ -611,11 +649,7 @@ async def update_action_point_orientation_using_robot_cb(
     if ap.parent:
         new_pose = tr.make_pose_rel_to_parent(glob.SCENE, glob.PROJECT, new_pose, ap.parent)
 
-    ori.orientation = new_pose.orientation
-
-    glob.PROJECT.update_modified()
-
-    evt = sevts.p.OrientationChanged(ori)
+    evt = sevts.p.OrientationChanged(glob.PROJECT.update_orientation(ori.id, new_pose.orientation))
     evt.change_type = Event.Type.UPDATE
     asyncio.ensure_future(notif.broadcast_event(evt))
     return None
@@ -855,7 +889,7 @@ async def add_action_cb(req: srpc.p.AddAction.Request, ui: WsClient) -> None:
 
     action_meta = find_object_action(glob.SCENE, new_action)
 
-    updated_project = copy.deepcopy(glob.PROJECT)
+    updated_project = glob.PROJECT.snapshot()
     updated_project.upsert_action(req.args.action_point_id, new_action)
 
     check_flows(updated_project, new_action, action_meta)
@@ -880,9 +914,9 @@ async def update_action_cb(req: srpc.p.UpdateAction.Request, ui: WsClient) -> No
     assert glob.PROJECT
     assert glob.SCENE
 
-    updated_project = copy.deepcopy(glob.PROJECT)
+    updated_project = glob.PROJECT.snapshot()
 
-    updated_action = updated_project.action(req.args.action_id)
+    updated_action = updated_project.action_mut(req.args.action_id)
 
     if req.args.parameters is not None:
         updated_action.parameters = req.args.parameters
@@ -897,7 +931,7 @@ async def update_action_cb(req: srpc.p.UpdateAction.Request, ui: WsClient) -> No
     if req.dry_run:
         return None
 
-    orig_action = glob.PROJECT.action(req.args.action_id)
+    orig_action = glob.PROJECT.action_mut(req.args.action_id)
     orig_action.parameters = updated_action.parameters
     glob.PROJECT.update_modified()
 
@@ -1053,7 +1087,7 @@ async def add_logic_item_cb(req: srpc.p.AddLogicItem.Request, ui: WsClient) -> N
     check_logic_item(glob.PROJECT, logic_item)
 
     if logic_item.start != logic_item.START:
-        updated_project = copy.deepcopy(glob.PROJECT)
+        updated_project = glob.PROJECT.snapshot()
         updated_project.upsert_logic_item(logic_item)
         check_for_loops(updated_project, logic_item.parse_start().start_action_id)
 
@@ -1075,12 +1109,13 @@ async def update_logic_item_cb(req: srpc.p.UpdateLogicItem.Request, ui: WsClient
     assert glob.PROJECT
     assert glob.SCENE
 
-    updated_project = copy.deepcopy(glob.PROJECT)
-    updated_logic_item = updated_project.logic_item(req.args.logic_item_id)
+    updated_project = glob.PROJECT.snapshot()
+    updated_logic_item = updated_project.logic_item_mut(req.args.logic_item_id)
 
     updated_logic_item.start = req.args.start
     updated_logic_item.end = req.args.end
     updated_logic_item.condition = req.args.condition
+    updated_project.upsert_logic_item(updated_logic_item)  # in order to get logic index updated
 
     check_logic_item(updated_project, updated_logic_item)
 
@@ -1304,6 +1339,7 @@ async def rename_action_point_joints_cb(req: srpc.p.RenameActionPointJoints.Requ
     if req.dry_run:
         return None
 
+    joints = glob.PROJECT.joints_mut(joints.id)
     joints.name = req.args.new_name
     glob.PROJECT.update_modified()
 
@@ -1325,6 +1361,7 @@ async def rename_action_point_orientation_cb(req: srpc.p.RenameActionPointOrient
     if req.dry_run:
         return None
 
+    ori = glob.PROJECT.orientation_mut(ori.id)
     ori.name = req.args.new_name
     glob.PROJECT.update_modified()
 
@@ -1345,7 +1382,7 @@ async def rename_action_cb(req: srpc.p.RenameAction.Request, ui: WsClient) -> No
     if req.dry_run:
         return None
 
-    act = glob.PROJECT.action(req.args.action_id)
+    act = glob.PROJECT.action_mut(req.args.action_id)
     act.name = req.args.new_name
 
     glob.PROJECT.update_modified()
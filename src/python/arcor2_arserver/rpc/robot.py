@@ -1,15 +1,14 @@
 import asyncio
-import time
-from typing import Awaitable, Callable, Dict
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from arcor2_calibration_data import client as calib_client
 from arcor2_calibration_data.client import CalibrateRobotArgs
 from websockets.server import WebSocketServerProtocol as WsClient
 
 from arcor2 import transformations as tr
-from arcor2 import ws_server
 from arcor2.clients.persistent_storage import URL as ps_url
 from arcor2.data import common
+from arcor2.data.events import Event
 from arcor2.exceptions import Arcor2Exception
 from arcor2.helpers import run_in_executor
 from arcor2.object_types.abstract import Camera, Robot
@@ -17,7 +16,7 @@ from arcor2_arserver import camera
 from arcor2_arserver import globals as glob
 from arcor2_arserver import notifications as notif
 from arcor2_arserver import objects_actions as osa
-from arcor2_arserver import robot
+from arcor2_arserver import periodic, robot
 from arcor2_arserver.decorators import project_needed, scene_needed
 from arcor2_arserver.scene import ensure_scene_started, scene_started, update_scene_object_pose
 from arcor2_arserver_data import events as sevts
@@ -28,82 +27,247 @@ RBT_CALIB = "RobotCalibration"
 
 TaskDict = Dict[str, asyncio.Task]
 
-ROBOT_JOINTS_TASKS: TaskDict = {}
-EEF_POSE_TASKS: TaskDict = {}
+ROBOT_EVENTS_TASKS: TaskDict = {}
 
-EVENT_PERIOD = 0.1
+RegEnum = srpc.r.RegisterForRobotEvent.Request.Args.RegisterEnum
 
+# (robot_id, stream, period), encoder - UIs with the same period share the encoder
+DELTA_ENCODERS: Dict[Tuple[str, RegEnum, float], robot.DeltaEncoder] = {}
 
-async def robot_joints_event(robot_id: str) -> None:
+# schedulers of running streams (robot_id, scheduler)
+SCHEDULERS: Dict[str, periodic.Periodic] = {}
 
-    global ROBOT_JOINTS_TASKS
+StreamGroups = Dict[float, Set[WsClient]]  # period, UIs
 
-    glob.logger.info(f"Sending '{sevts.r.RobotJoints.__name__}' for robot '{robot_id}' started.")
-    while scene_started() and glob.ROBOT_JOINTS_REGISTERED_UIS[robot_id]:
 
-        start = time.monotonic()
+def stream_period(rate: Optional[float]) -> float:
+    """Returns period (seconds) for requested rate (Hz) of a stream.
 
-        try:
-            evt = sevts.r.RobotJoints(sevts.r.RobotJoints.Data(robot_id, (await robot.get_robot_joints(robot_id))))
-        except Arcor2Exception as e:
-            glob.logger.error(f"Failed to get joints for {robot_id}. {str(e)}")
-            break
-
-        evt_json = evt.to_json()
-        await asyncio.gather(
-            *[ws_server.send_json_to_client(ui, evt_json) for ui in glob.ROBOT_JOINTS_REGISTERED_UIS[robot_id]]
+    :param rate: None for the default one.
+    :return:
+    """
+
+    if rate is None:
+        return robot.SAMPLING_PERIOD
+
+    if not 0 < rate <= robot.MAX_STREAM_RATE:
+        raise Arcor2Exception(f"Rate has to be greater than 0 and at most {robot.MAX_STREAM_RATE} Hz.")
+
+    return 1.0 / rate
+
+
+def stream_groups(robot_id: str, stream: RegEnum, interfaces: Set[WsClient]) -> StreamGroups:
+
+    periods = glob.ROBOT_STREAM_PERIODS[(robot_id, stream)]
+    groups: StreamGroups = {}
+
+    for ui in interfaces:
+        groups.setdefault(periods.get(ui, robot.SAMPLING_PERIOD), set()).add(ui)
+
+    return groups
+
+
+def robot_events_stats() -> Dict[str, Dict[str, float]]:
+    """Statistics of schedulers of running streams (per robot)."""
+
+    return {robot_id: scheduler.stats.as_dict() for robot_id, scheduler in SCHEDULERS.items()}
+
+
+def _joints_frame(robot_id: str, values: robot.Values, frame: robot.Frame) -> sevts.r.RobotJoints:
+
+    return sevts.r.RobotJoints(
+        sevts.r.RobotJoints.Data(
+            robot_id,
+            [common.Joint(name, robot.quantize(values[name][0])) for name in frame.items],
+            frame.seq,
+            frame.base,
         )
+    )
 
-        end = time.monotonic()
-        await asyncio.sleep(EVENT_PERIOD - (end - start))
 
-    del ROBOT_JOINTS_TASKS[robot_id]
+def _eef_frame(robot_id: str, values: robot.Values, frame: robot.Frame) -> sevts.r.RobotEef:
 
-    # TODO notify UIs that registration was cancelled
-    del glob.ROBOT_JOINTS_REGISTERED_UIS[robot_id]
+    eef_poses: List[sevts.r.RobotEef.Data.EefPose] = []
 
-    glob.logger.info(f"Sending '{sevts.r.RobotJoints.__name__}' for robot '{robot_id}' stopped.")
+    for eef_id in frame.items:
 
+        vals = values[eef_id]
+        pose = common.Pose(common.Position(*[robot.quantize(val) for val in vals[:3]]), common.Orientation(*vals[3:]))
 
-async def eef_pose(robot_id: str, eef_id: str) -> sevts.r.RobotEef.Data.EefPose:
+        # rounded quaternion is not unit, it would be normalized again if given to the constructor
+        ori = pose.orientation
+        ori.x, ori.y, ori.z, ori.w = [robot.quantize(val) for val in vals[3:]]
 
-    return sevts.r.RobotEef.Data.EefPose(eef_id, (await robot.get_end_effector_pose(robot_id, eef_id)))
+        eef_poses.append(sevts.r.RobotEef.Data.EefPose(eef_id, pose))
 
+    return sevts.r.RobotEef(sevts.r.RobotEef.Data(robot_id, eef_poses, frame.seq, frame.base))
 
-async def robot_eef_pose_event(robot_id: str) -> None:
 
-    global EEF_POSE_TASKS
+def delta_stream(
+    robot_id: str,
+    stream: RegEnum,
+    period: float,
+    interfaces: Set[WsClient],
+    values: robot.Values,
+    make_event: Callable[[str, robot.Values, robot.Frame], Event],
+) -> None:
+    """Sends changes of values (if there are any) to the interfaces."""
 
-    glob.logger.info(f"Sending '{sevts.r.RobotEef.__name__}' for robot '{robot_id}' started.")
+    try:
+        encoder = DELTA_ENCODERS[(robot_id, stream, period)]
+    except KeyError:
+        encoder = DELTA_ENCODERS[(robot_id, stream, period)] = robot.DeltaEncoder()
 
-    while scene_started() and glob.ROBOT_EEF_REGISTERED_UIS[robot_id]:
+    frame = encoder.encode(values)
 
-        start = time.monotonic()
+    if frame is None:
+        return
 
-        evt = sevts.r.RobotEef(sevts.r.RobotEef.Data(robot_id))
+    evt = make_event(robot_id, values, frame)
 
-        try:
-            evt.data.end_effectors = await asyncio.gather(
-                *[eef_pose(robot_id, eef_id) for eef_id in (await robot.get_end_effectors(robot_id))]
+    keyframe_key = (evt.event, robot_id, "keyframe")
+    delta_key = (evt.event, robot_id, "delta")
+
+    if frame.base is None:
+        # the keyframe must not be lost, deltas relative to the previous one are not needed anymore
+        notif.stream_event(interfaces, evt, keyframe_key, droppable=False, obsoletes=[delta_key])
+    else:
+        # keyframe can't be superseded by a delta (which is relative to it)
+        notif.stream_event(interfaces, evt, delta_key)
+
+
+def _stream(
+    robot_id: str,
+    stream: RegEnum,
+    due: StreamGroups,
+    delta_uis: Set[WsClient],
+    make_event: Callable[[], Event],
+    values: Callable[[], robot.Values],
+    make_frame: Callable[[str, robot.Values, robot.Frame], Event],
+) -> None:
+
+    full_uis = set().union(*due.values()) - delta_uis
+
+    if full_uis:
+        evt = make_event()
+        notif.stream_event(full_uis, evt, (evt.event, robot_id))
+
+    vals: Optional[robot.Values] = None
+
+    for period, uis in due.items():
+        if uis & delta_uis:
+            if vals is None:
+                vals = values()
+            delta_stream(robot_id, stream, period, uis & delta_uis, vals, make_frame)
+
+
+async def robot_events(robot_id: str) -> None:
+    """Streams joints and/or poses of end effectors to registered UIs.
+
+    Everything is obtained at once, using the shared sampler of the robot. The robot is sampled with the highest
+    rate requested by UIs, UIs that requested lower rates get only some of the samples.
+    """
+
+    glob.logger.info(f"Sending events for robot '{robot_id}' started.")
+
+    scheduler = SCHEDULERS[robot_id] = periodic.Periodic(robot.SAMPLING_PERIOD)
+    subsamplers: Dict[Tuple[RegEnum, float], periodic.Subsampler] = {}
+
+    def due(stream: RegEnum, interfaces: Set[WsClient], deadline: float) -> StreamGroups:
+
+        ret: StreamGroups = {}
+
+        for period, uis in stream_groups(robot_id, stream, interfaces).items():
+
+            try:
+                subsampler = subsamplers[(stream, period)]
+            except KeyError:
+                subsampler = subsamplers[(stream, period)] = periodic.Subsampler(period)
+
+            if subsampler.due(deadline, scheduler.period):
+                ret[period] = uis
+
+        return ret
+
+    try:
+        async for deadline in scheduler.ticks():
+
+            joints_uis = glob.ROBOT_JOINTS_REGISTERED_UIS[robot_id]
+            eef_uis = glob.ROBOT_EEF_REGISTERED_UIS[robot_id]
+
+            if not scene_started() or not (joints_uis or eef_uis):
+                break
+
+            joints_due = due(RegEnum.JOINTS, joints_uis, deadline)
+            eef_due = due(RegEnum.EEF_POSE, eef_uis, deadline)
+
+            # the next tick is scheduled according to the highest requested rate
+            scheduler.period = min(
+                [
+                    *stream_groups(robot_id, RegEnum.JOINTS, joints_uis),
+                    *stream_groups(robot_id, RegEnum.EEF_POSE, eef_uis),
+                ]
             )
-        except Arcor2Exception as e:
-            glob.logger.error(f"Failed to get eef pose for {robot_id}. {str(e)}")
-            break
 
-        evt_json = evt.to_json()
-        await asyncio.gather(
-            *[ws_server.send_json_to_client(ui, evt_json) for ui in glob.ROBOT_EEF_REGISTERED_UIS[robot_id]]
-        )
+            if not joints_due and not eef_due:
+                continue
 
-        end = time.monotonic()
-        await asyncio.sleep(EVENT_PERIOD - (end - start))
+            try:
+                state = await (await robot.sampler(robot_id)).sample(joints=bool(joints_due), eef=bool(eef_due))
+            except Arcor2Exception as e:
+                glob.logger.error(f"Failed to get state of {robot_id}. {str(e)}")
+                break
 
-    del EEF_POSE_TASKS[robot_id]
+            if state.joints is not None:
+                joints = state.joints
+                _stream(
+                    robot_id,
+                    RegEnum.JOINTS,
+                    joints_due,
+                    glob.ROBOT_JOINTS_DELTA_UIS[robot_id],
+                    lambda: sevts.r.RobotJoints(sevts.r.RobotJoints.Data(robot_id, joints)),
+                    lambda: robot.joints_values(joints),
+                    _joints_frame,
+                )
+
+            if state.eef_poses is not None:
+                eef_poses = state.eef_poses
+                _stream(
+                    robot_id,
+                    RegEnum.EEF_POSE,
+                    eef_due,
+                    glob.ROBOT_EEF_DELTA_UIS[robot_id],
+                    lambda: sevts.r.RobotEef(
+                        sevts.r.RobotEef.Data(
+                            robot_id,
+                            [sevts.r.RobotEef.Data.EefPose(eef_id, pose) for eef_id, pose in eef_poses.items()],
+                        )
+                    ),
+                    lambda: robot.eef_values(eef_poses),
+                    _eef_frame,
+                )
+
+    finally:
+        if SCHEDULERS.get(robot_id) is scheduler:
+            del SCHEDULERS[robot_id]
+
+        glob.logger.info(f"Stats of events for robot '{robot_id}': {scheduler.stats.as_dict()}")
+
+    del ROBOT_EVENTS_TASKS[robot_id]
 
     # TODO notify UIs that registration was cancelled
-    del glob.ROBOT_EEF_REGISTERED_UIS[robot_id]
+    glob.ROBOT_JOINTS_REGISTERED_UIS.pop(robot_id, None)
+    glob.ROBOT_EEF_REGISTERED_UIS.pop(robot_id, None)
+    glob.ROBOT_JOINTS_DELTA_UIS.pop(robot_id, None)
+    glob.ROBOT_EEF_DELTA_UIS.pop(robot_id, None)
 
-    glob.logger.info(f"Sending '{sevts.r.RobotEef.__name__}' for robot '{robot_id}' stopped.")
+    for stream in RegEnum:
+        glob.ROBOT_STREAM_PERIODS.pop((robot_id, stream), None)
+
+    for key in [key for key in DELTA_ENCODERS if key[0] == robot_id]:
+        del DELTA_ENCODERS[key]
+
+    glob.logger.info(f"Sending events for robot '{robot_id}' stopped.")
 
 
 async def get_robot_meta_cb(req: srpc.r.GetRobotMeta.Request, ui: WsClient) -> srpc.r.GetRobotMeta.Response:
@@ -117,7 +281,9 @@ async def get_robot_meta_cb(req: srpc.r.GetRobotMeta.Request, ui: WsClient) -> s
 async def get_robot_joints_cb(req: srpc.r.GetRobotJoints.Request, ui: WsClient) -> srpc.r.GetRobotJoints.Response:
 
     ensure_scene_started()
-    return srpc.r.GetRobotJoints.Response(data=await robot.get_robot_joints(req.args.robot_id))
+    return srpc.r.GetRobotJoints.Response(
+        data=await robot.get_robot_joints(req.args.robot_id, max_age=robot.SAMPLING_PERIOD)
+    )
 
 
 @scene_needed
@@ -127,7 +293,9 @@ async def get_end_effector_pose_cb(
 
     ensure_scene_started()
     return srpc.r.GetEndEffectorPose.Response(
-        data=await robot.get_end_effector_pose(req.args.robot_id, req.args.end_effector_id)
+        data=await robot.get_end_effector_pose(
+            req.args.robot_id, req.args.end_effector_id, max_age=robot.SAMPLING_PERIOD
+        )
     )
 
 
@@ -155,33 +323,52 @@ async def get_suctions_cb(req: srpc.r.GetSuctions.Request, ui: WsClient) -> srpc
 async def register(
     req: srpc.r.RegisterForRobotEvent.Request,
     ui: WsClient,
-    tasks: TaskDict,
     reg_uis: glob.RegisteredUiDict,
-    coro: Callable[[str], Awaitable[None]],
+    delta_uis: glob.RegisteredUiDict,
 ) -> None:
 
+    robot_id = req.args.robot_id
+    periods = glob.ROBOT_STREAM_PERIODS[(robot_id, req.args.what)]
+
     if req.args.send:
 
-        reg_uis[req.args.robot_id].add(ui)
+        period = stream_period(req.args.rate)
+
+        reg_uis[robot_id].add(ui)
+        periods[ui] = period
+
+        if req.args.delta:
+            delta_uis[robot_id].add(ui)
 
-        if req.args.robot_id not in tasks:
+            # the new UI needs the full state first
+            try:
+                DELTA_ENCODERS[(robot_id, req.args.what, period)].request_keyframe()
+            except KeyError:
+                pass
+        else:
+            delta_uis[robot_id].discard(ui)
+
+        if robot_id not in ROBOT_EVENTS_TASKS:
             # start task
-            tasks[req.args.robot_id] = asyncio.create_task(coro(req.args.robot_id))
+            ROBOT_EVENTS_TASKS[robot_id] = asyncio.create_task(robot_events(robot_id))
 
     else:
         try:
-            reg_uis[req.args.robot_id].remove(ui)
+            reg_uis[robot_id].remove(ui)
         except KeyError as e:
             raise Arcor2Exception("Failed to unregister.") from e
 
+        delta_uis[robot_id].discard(ui)
+        periods.pop(ui, None)
+
         # cancel task if not needed anymore
-        if not reg_uis[req.args.robot_id]:
-            task = tasks[req.args.robot_id]
+        if not glob.ROBOT_JOINTS_REGISTERED_UIS[robot_id] and not glob.ROBOT_EEF_REGISTERED_UIS[robot_id]:
+            task = ROBOT_EVENTS_TASKS[robot_id]
 
             if not task.cancelled():
                 task.cancel()
 
-            del tasks[req.args.robot_id]
+            del ROBOT_EVENTS_TASKS[robot_id]
 
 
 @scene_needed
@@ -193,13 +380,13 @@ async def register_for_robot_event_cb(req: srpc.r.RegisterForRobotEvent.Request,
     await osa.get_robot_instance(req.args.robot_id)
 
     if req.args.what == req.args.RegisterEnum.JOINTS:
-        await register(req, ui, ROBOT_JOINTS_TASKS, glob.ROBOT_JOINTS_REGISTERED_UIS, robot_joints_event)
+        await register(req, ui, glob.ROBOT_JOINTS_REGISTERED_UIS, glob.ROBOT_JOINTS_DELTA_UIS)
     elif req.args.what == req.args.RegisterEnum.EEF_POSE:
 
         if not (await robot.get_end_effectors(req.args.robot_id)):
             raise Arcor2Exception("Robot does not have any end effector.")
 
-        await register(req, ui, EEF_POSE_TASKS, glob.ROBOT_EEF_REGISTERED_UIS, robot_eef_pose_event)
+        await register(req, ui, glob.ROBOT_EEF_REGISTERED_UIS, glob.ROBOT_EEF_DELTA_UIS)
     else:
         raise Arcor2Exception(f"Option '{req.args.what.value}' not implemented.")
 
@@ -359,7 +546,7 @@ async def calibrate_robot(robot_inst: Robot, camera_inst: Camera, move_to_calibr
         glob.logger.exception("Failed to calibrate the robot.")
         return
 
-    await update_scene_object_pose(glob.SCENE.object(robot_inst.id), new_pose, robot_inst)
+    await update_scene_object_pose(robot_inst.id, new_pose, robot_inst)
     await notif.broadcast_event(ProcessState(ProcessState.Data(RBT_CALIB, ProcessState.Data.StateEnum.Finished)))
 
 
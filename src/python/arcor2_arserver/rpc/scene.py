@@ -1,5 +1,4 @@
 import asyncio
-import copy
 import functools
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
@@ -19,7 +18,7 @@ from arcor2_arserver import globals as glob
 from arcor2_arserver import notifications as notif
 from arcor2_arserver.clients import persistent_storage as storage
 from arcor2_arserver.decorators import no_project, no_scene, scene_needed
-from arcor2_arserver.helpers import unique_name
+from arcor2_arserver.helpers import page, unique_name
 from arcor2_arserver.objects_actions import get_object_types
 from arcor2_arserver.project import (
     associated_projects,
@@ -27,7 +26,7 @@ from arcor2_arserver.project import (
     projects_using_object,
     remove_object_references_from_projects,
 )
-from arcor2_arserver.robot import get_end_effector_pose
+from arcor2_arserver.robot import get_end_effector_pose, remove_sampler
 from arcor2_arserver.scene import (
     add_object_to_scene,
     can_modify_scene,
@@ -38,7 +37,6 @@ from arcor2_arserver.scene import (
     notify_scene_closed,
     open_scene,
     scene_names,
-    scenes,
     start_scene,
     stop_scene,
     update_scene_object_pose,
@@ -54,7 +52,7 @@ async def managed_scene(scene_id: str, make_copy: bool = False) -> AsyncGenerato
 
     if glob.SCENE and glob.SCENE.id == scene_id:
         if make_copy:
-            scene = copy.deepcopy(glob.SCENE)
+            scene = glob.SCENE.snapshot()
             save_back = True
         else:
             scene = glob.SCENE
@@ -152,13 +150,32 @@ async def open_scene_cb(req: srpc.s.OpenScene.Request, ui: WsClient) -> None:
     return None
 
 
+async def scene_info(scene_iddesc: common.IdDesc, modified: bool = True) -> srpc.s.ListScenes.Response.Data:
+
+    if not modified:
+        return srpc.s.ListScenes.Response.Data(scene_iddesc.id, scene_iddesc.name, scene_iddesc.desc)
+
+    scene = await storage.get_scene(scene_iddesc.id)
+    return srpc.s.ListScenes.Response.Data(scene.id, scene.name, scene.desc, scene.modified)
+
+
 async def list_scenes_cb(req: srpc.s.ListScenes.Request, ui: WsClient) -> srpc.s.ListScenes.Response:
 
     resp = srpc.s.ListScenes.Response()
-    resp.data = []
+    items, resp.next_cursor = page((await storage.get_scenes()).items, req.args.cursor, req.args.page_size)
+    tasks = [asyncio.ensure_future(scene_info(item, req.args.modified)) for item in items]
 
-    async for scene in scenes():
-        resp.data.append(resp.Data(scene.id, scene.name, scene.desc, scene.modified))
+    try:
+        if req.args.stream:
+            resp.data = []
+            for task in asyncio.as_completed(tasks):
+                await notif.event(ui, sevts.s.SceneListed(await task))
+        else:
+            resp.data = await asyncio.gather(*tasks)
+    finally:
+        # when a task fails (or the RPC is cancelled), the remaining ones are of no use
+        for task in tasks:
+            task.cancel()
 
     return resp
 
@@ -206,6 +223,7 @@ async def update_object_parameters_cb(req: srpc.s.UpdateObjectParameters.Request
     if req.dry_run:
         return None
 
+    obj = glob.SCENE.object_mut(obj.id)
     obj.parameters = req.args.parameters
     glob.SCENE.update_modified()
 
@@ -303,6 +321,8 @@ async def remove_from_scene_cb(req: srpc.s.RemoveFromScene.Request, ui: WsClient
     if req.args.id in glob.OBJECTS_WITH_UPDATED_POSE:
         glob.OBJECTS_WITH_UPDATED_POSE.remove(req.args.id)
 
+    remove_sampler(req.args.id)
+
     evt = sevts.s.SceneObjectChanged(obj)
     evt.change_type = Event.Type.REMOVE
     asyncio.ensure_future(notif.broadcast_event(evt))
@@ -368,17 +388,16 @@ async def update_object_pose_using_robot_cb(req: srpc.o.UpdateObjectPoseUsingRob
 
     position_delta = position_delta.rotated(new_pose.orientation)
 
-    assert scene_object.pose
-
-    scene_object.pose.position.x = new_pose.position.x - position_delta.x
-    scene_object.pose.position.y = new_pose.position.y - position_delta.y
-    scene_object.pose.position.z = new_pose.position.z - position_delta.z
-
-    scene_object.pose.orientation.set_from_quaternion(
-        new_pose.orientation.as_quaternion() * quaternion.quaternion(0, 1, 0, 0)
+    obj_pose = common.Pose(
+        common.Position(
+            new_pose.position.x - position_delta.x,
+            new_pose.position.y - position_delta.y,
+            new_pose.position.z - position_delta.z,
+        )
     )
+    obj_pose.orientation.set_from_quaternion(new_pose.orientation.as_quaternion() * quaternion.quaternion(0, 1, 0, 0))
 
-    asyncio.ensure_future(update_scene_object_pose(scene_object))
+    asyncio.ensure_future(update_scene_object_pose(scene_object.id, obj_pose))
     return None
 
 
@@ -398,7 +417,7 @@ async def update_object_pose_cb(req: srpc.s.UpdateObjectPose.Request, ui: WsClie
     if req.dry_run:
         return
 
-    asyncio.ensure_future(update_scene_object_pose(obj, req.args.pose))
+    asyncio.ensure_future(update_scene_object_pose(obj.id, req.args.pose))
     return None
 
 
@@ -423,6 +442,7 @@ async def rename_object_cb(req: srpc.s.RenameObject.Request, ui: WsClient) -> No
     if req.dry_run:
         return None
 
+    target_obj = glob.SCENE.object_mut(target_obj.id)
     target_obj.name = req.args.new_name
 
     glob.SCENE.update_modified()
@@ -15,6 +15,7 @@ from arcor2_arserver import notifications as notif
 from arcor2_arserver.clients import persistent_storage as storage
 from arcor2_arserver.object_types.data import ObjectTypeData
 from arcor2_arserver.objects_actions import get_object_types
+from arcor2_arserver.robot import remove_samplers
 from arcor2_arserver_data.events.common import ShowMainScreen
 from arcor2_arserver_data.events.scene import SceneClosed, SceneObjectChanged, SceneState
 
@@ -22,12 +23,10 @@ from arcor2_arserver_data.events.scene import SceneClosed, SceneObjectChanged, S
 _scene_state: SceneState.Data.StateEnum = SceneState.Data.StateEnum.Stopped
 
 
-async def update_scene_object_pose(
-    obj: SceneObject, pose: Optional[Pose] = None, obj_inst: Optional[GenericWithPose] = None
-) -> None:
-    """Performs all necessary actions when pose of an object is updated.
+async def update_scene_object_pose(obj_id: str, pose: Pose, obj_inst: Optional[GenericWithPose] = None) -> None:
+    """Updates pose of an object and performs all necessary actions.
 
-    :param obj:
+    :param obj_id:
     :param pose:
     :param obj_inst:
     :return:
@@ -35,13 +34,8 @@ async def update_scene_object_pose(
 
     assert glob.SCENE
 
-    if pose:
-        # SceneObject pose was not updated before
-        obj.pose = pose
-    else:
-        # SceneObject pose was already updated
-        pose = obj.pose
-
+    obj = glob.SCENE.object_mut(obj_id)
+    obj.pose = pose
     glob.SCENE.update_modified()
 
     evt = SceneObjectChanged(obj)
@@ -57,8 +51,6 @@ async def update_scene_object_pose(
             assert isinstance(inst, GenericWithPose)
             obj_inst = inst
 
-        assert pose is not None
-
         # Object pose is property that might call scene service - that's why it has to be called using executor.
         await hlp.run_in_executor(setattr, obj_inst, "pose", pose)
 
@@ -287,6 +279,7 @@ async def stop_scene(message: Optional[str] = None) -> None:
         await set_scene_state(SceneState.Data.StateEnum.Stopped)
 
     glob.SCENE_OBJECT_INSTANCES.clear()
+    remove_samplers()
 
 
 async def start_scene() -> None:
@@ -23,8 +23,10 @@ import arcor2_arserver
 import arcor2_arserver_data
 import arcor2_execution_data
 from arcor2 import action as action_mod
+from arcor2 import aio_rest
 from arcor2 import ws_server
 from arcor2.data import compile_json_schemas, events, rpc
+from arcor2.data.serialization import from_dict, to_json
 from arcor2.exceptions import Arcor2Exception
 from arcor2.parameter_plugins.utils import known_parameter_types
 from arcor2_arserver import events as server_events
@@ -60,11 +62,10 @@ async def handle_manager_incoming_messages(manager_client) -> None:
 
             if "event" in msg:
 
-                if glob.INTERFACES:
-                    await asyncio.gather(*[ws_server.send_json_to_client(intf, message) for intf in glob.INTERFACES])
+                notif.broadcast_message(message)
 
                 try:
-                    evt = event_mapping[msg["event"]].from_dict(msg)
+                    evt = from_dict(event_mapping[msg["event"]], msg, exe.MANAGER_VALIDATION)
                 except ValidationError as e:
                     glob.logger.error("Invalid event: {}, error: {}".format(msg, e))
                     continue
@@ -110,7 +111,7 @@ async def handle_manager_incoming_messages(manager_client) -> None:
 
                 # TODO handle potential errors
                 rpc_cls = rpc_mapping[msg["response"]]
-                resp = rpc_cls.Response.from_dict(msg)
+                resp = from_dict(rpc_cls.Response, msg, exe.MANAGER_VALIDATION)
                 exe.MANAGER_RPC_RESPONSES[resp.id].put_nowait(resp)
 
     except websockets.exceptions.ConnectionClosed:
@@ -153,6 +154,7 @@ async def _initialize_server() -> None:
         rpc_dict=RPC_DICT,
         event_dict=EVENT_DICT,
         verbose=glob.VERBOSE,
+        flush=notif.flush,
     )
 
     glob.logger.info("Server initialized.")
@@ -178,13 +180,13 @@ async def register(websocket: WsClient) -> None:
     elif glob.PACKAGE_INFO:
 
         # this can't be done in parallel - ui expects this order of events
-        await websocket.send(events.PackageState(glob.PACKAGE_STATE).to_json())
-        await websocket.send(events.PackageInfo(glob.PACKAGE_INFO).to_json())
+        await websocket.send(to_json(events.PackageState(glob.PACKAGE_STATE)))
+        await websocket.send(to_json(events.PackageInfo(glob.PACKAGE_INFO)))
 
         if glob.ACTION_STATE:
-            await websocket.send(events.ActionState(glob.ACTION_STATE).to_json())
+            await websocket.send(to_json(events.ActionState(glob.ACTION_STATE)))
         if glob.CURRENT_ACTION:
-            await websocket.send(events.CurrentAction(glob.CURRENT_ACTION).to_json())
+            await websocket.send(to_json(events.CurrentAction(glob.CURRENT_ACTION)))
     else:
         assert glob.MAIN_SCREEN
         await notif.event(websocket, evts.c.ShowMainScreen(glob.MAIN_SCREEN))
@@ -193,13 +195,19 @@ async def register(websocket: WsClient) -> None:
 async def unregister(websocket: WsClient) -> None:
     glob.logger.info("Unregistering ui")  # TODO print out some identifier
     glob.INTERFACES.remove(websocket)
+    notif.forget_interface(websocket)
 
-    for registered_uis in glob.ROBOT_JOINTS_REGISTERED_UIS.values():
-        if websocket in registered_uis:
-            registered_uis.remove(websocket)
-    for registered_uis in glob.ROBOT_EEF_REGISTERED_UIS.values():
-        if websocket in registered_uis:
-            registered_uis.remove(websocket)
+    for reg_dict in (
+        glob.ROBOT_JOINTS_REGISTERED_UIS,
+        glob.ROBOT_EEF_REGISTERED_UIS,
+        glob.ROBOT_JOINTS_DELTA_UIS,
+        glob.ROBOT_EEF_DELTA_UIS,
+    ):
+        for registered_uis in reg_dict.values():
+            registered_uis.discard(websocket)
+
+    for periods in glob.ROBOT_STREAM_PERIODS.values():
+        periods.pop(websocket, None)
 
 
 async def system_info_cb(req: srpc.c.SystemInfo.Request, ui: WsClient) -> srpc.c.SystemInfo.Response:
@@ -210,11 +218,19 @@ async def system_info_cb(req: srpc.c.SystemInfo.Request, ui: WsClient) -> srpc.c
         arcor2_arserver_data.version(),
         known_parameter_types(),
         {key for key in RPC_DICT.keys()},
+        srpc_callbacks.robot.robot_events_stats(),
     )
     return resp
 
 
-RPC_DICT: ws_server.RPC_DICT_TYPE = {srpc.c.SystemInfo.__name__: (srpc.c.SystemInfo, system_info_cb)}
+async def set_event_batching_cb(req: srpc.c.SetEventBatching.Request, ui: WsClient) -> None:
+    notif.set_batching(ui, req.args.enabled)
+
+
+RPC_DICT: ws_server.RPC_DICT_TYPE = {
+    srpc.c.SystemInfo.__name__: (srpc.c.SystemInfo, system_info_cb),
+    srpc.c.SetEventBatching.__name__: (srpc.c.SetEventBatching, set_event_batching_cb),
+}
 
 # discovery of RPC callbacks
 # TODO refactor it into arcor2 package (to be used by arcor2_execution)
@@ -242,7 +258,11 @@ EVENT_DICT: ws_server.EVENT_DICT_TYPE = {}
 
 async def aio_main() -> None:
 
-    await asyncio.gather(exe.project_manager_client(handle_manager_incoming_messages), _initialize_server())
+    try:
+        await asyncio.gather(exe.project_manager_client(handle_manager_incoming_messages), _initialize_server())
+    finally:
+        # aiorun cancels the task on shutdown - close connections to other services before the loop goes away
+        await aio_rest.close()
 
 
 def print_openapi_models() -> None:
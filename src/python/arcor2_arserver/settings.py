@@ -11,3 +11,6 @@ URDF_PATH = os.path.join(DATA_PATH, "urdf")
 
 OBJECT_TYPE_PATH = tempfile.mkdtemp()
 OBJECT_TYPE_MODULE = "arcor2_object_types"
+
+# persistent cache of analyzed ObjectTypes (see arcor2_arserver.object_types.cache)
+OBJECT_TYPE_CACHE_PATH = os.getenv("ARCOR2_ARSERVER_CACHE_PATH", os.path.join(DATA_PATH, "cache", "object_types"))
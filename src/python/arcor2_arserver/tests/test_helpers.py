@@ -0,0 +1,32 @@
+import pytest
+
+from arcor2.data.common import IdDesc
+from arcor2.exceptions import Arcor2Exception
+from arcor2_arserver.helpers import page
+
+
+def test_page() -> None:
+
+    items = [IdDesc(item_id, item_id, "") for item_id in ("d", "a", "c", "b", "e")]
+
+    assert page(items) == (items, None)
+
+    ids, cursor = page(items, page_size=2)
+    assert [item.id for item in ids] == ["a", "b"]
+    assert cursor == "b"
+
+    ids, cursor = page(items, cursor, 2)
+    assert [item.id for item in ids] == ["c", "d"]
+    assert cursor == "d"
+
+    ids, cursor = page(items, cursor, 2)
+    assert [item.id for item in ids] == ["e"]
+    assert cursor is None
+
+    # item used as a cursor was removed in the meantime
+    ids, cursor = page([item for item in items if item.id != "b"], "b")
+    assert [item.id for item in ids] == ["c", "d", "e"]
+    assert cursor is None
+
+    with pytest.raises(Arcor2Exception):
+        page(items, page_size=0)
@@ -0,0 +1,111 @@
+import asyncio
+from typing import AsyncIterator, Iterator
+
+import pytest
+
+from arcor2.cached import CachedScene
+from arcor2.data.object_type import ObjectType
+from arcor2.data.rpc.common import IdArgs
+from arcor2.object_types.abstract import Generic
+from arcor2_arserver import globals as glob
+from arcor2_arserver import objects_actions as osa
+from arcor2_arserver import settings
+from arcor2_arserver.object_types.data import ObjectTypeData
+from arcor2_arserver.object_types.source import prepare_object_types_dir
+from arcor2_arserver.rpc import objects as rpc_objects
+from arcor2_arserver_data import rpc as srpc
+from arcor2_arserver_data.objects import ObjectTypeMeta
+
+
+@pytest.fixture()
+def object_types() -> Iterator[None]:
+
+    glob.OBJECT_TYPES.clear()
+    glob.OBJECT_TYPES[Generic.__name__] = ObjectTypeData(
+        ObjectTypeMeta(Generic.__name__, built_in=True, abstract=True), Generic, cache_key=Generic.__name__
+    )
+    glob.OBJECT_TYPES["Disabled"] = ObjectTypeData(ObjectTypeMeta("Disabled", disabled=True))
+    osa.object_types_changed()
+
+    yield
+
+    glob.OBJECT_TYPES.clear()
+    osa.object_types_changed()
+
+
+def test_memoized(object_types: None) -> None:
+
+    version = osa.object_types_version()
+
+    types_dict = osa.get_types_dict()
+    assert types_dict == {Generic.__name__: Generic}
+    assert osa.get_types_dict() is types_dict
+
+    valid = osa.valid_object_types()
+    assert valid.keys() == {Generic.__name__}
+    assert osa.valid_object_types() is valid
+
+    assert osa.object_types_version() == version
+
+
+def test_changed(object_types: None) -> None:
+
+    version = osa.object_types_version()
+    types_dict = osa.get_types_dict()
+    valid = osa.valid_object_types()
+
+    glob.OBJECT_TYPES["Disabled"] = ObjectTypeData(
+        ObjectTypeMeta("Disabled", base=Generic.__name__), Generic, cache_key="Disabled"
+    )
+    osa.object_types_changed()
+
+    assert osa.object_types_version() == version + 1
+    assert osa.get_types_dict() is not types_dict
+    assert osa.get_types_dict().keys() == {Generic.__name__, "Disabled"}
+    assert osa.valid_object_types() is not valid
+    assert osa.valid_object_types().keys() == {Generic.__name__, "Disabled"}
+
+
+def test_rpc_add_and_remove(object_types: None, monkeypatch, tmp_path) -> None:
+
+    monkeypatch.setattr(settings, "OBJECT_TYPE_PATH", str(tmp_path))
+    prepare_object_types_dir(settings.OBJECT_TYPE_PATH, settings.OBJECT_TYPE_MODULE)
+
+    async def update_object_type(obj_type: ObjectType) -> None:
+        pass
+
+    async def delete_object_type(obj_type_id: str) -> None:
+        pass
+
+    async def scenes() -> AsyncIterator[CachedScene]:
+        return
+        yield
+
+    monkeypatch.setattr(rpc_objects.storage, "update_object_type", update_object_type)
+    monkeypatch.setattr(rpc_objects.storage, "delete_object_type", delete_object_type)
+    monkeypatch.setattr(rpc_objects, "scenes", scenes)
+
+    obj_type = "MemoizationTestType"
+    version = osa.object_types_version()
+    assert obj_type not in osa.get_types_dict()
+    assert obj_type not in osa.valid_object_types()
+
+    asyncio.run(
+        rpc_objects.new_object_type_cb(
+            srpc.o.NewObjectType.Request(1, ObjectTypeMeta(obj_type, base=Generic.__name__)), None  # type: ignore
+        )
+    )
+
+    assert osa.object_types_version() > version
+    assert issubclass(osa.get_types_dict()[obj_type], Generic)
+    assert obj_type in osa.valid_object_types()
+
+    version = osa.object_types_version()
+
+    asyncio.run(
+        rpc_objects.delete_object_type_cb(srpc.o.DeleteObjectType.Request(2, IdArgs(obj_type)), None)  # type: ignore
+    )
+
+    assert osa.object_types_version() > version
+    assert obj_type not in osa.get_types_dict()
+    assert obj_type not in osa.valid_object_types()
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from arcor2.exceptions import Arcor2Exception
+from arcor2_arserver.periodic import Periodic, Subsampler
+
+
+def test_periodic() -> None:
+
+    period = 0.05
+    scheduler = Periodic(period)
+
+    async def run() -> None:
+
+        deadlines = []
+
+        async for deadline in scheduler.ticks():
+
+            deadlines.append(deadline)
+
+            if len(deadlines) == 2:
+                await asyncio.sleep(0.13)  # overrun, one tick should be skipped
+            elif len(deadlines) == 5:
+                break
+
+        start = deadlines[0]
+        assert [round((dl - start) / period, 6) for dl in deadlines] == [0, 1, 3, 4, 5]
+
+    asyncio.run(run())
+
+    assert scheduler.stats.ticks == 5
+    assert scheduler.stats.overruns == 1
+    assert scheduler.stats.skipped == 1
+    assert scheduler.stats.max_jitter > 0.0
+
+
+def test_periodic_invalid() -> None:
+
+    with pytest.raises(Arcor2Exception):
+        Periodic(0)
+
+
+def test_subsampler() -> None:
+
+    tick = 1 / 30
+    sub = Subsampler(0.5)
+
+    due = [idx for idx in range(61) if sub.due(idx * tick, tick)]
+    assert due == [0, 15, 30, 45, 60]
@@ -0,0 +1,290 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List
+
+import pytest
+
+from arcor2.cached import CachedProject, CachedScene, UpdateableCachedProject
+from arcor2.data.common import (
+    Action,
+    ActionParameter,
+    ActionPoint,
+    Flow,
+    IdDesc,
+    IdDescList,
+    Joint,
+    NamedOrientation,
+    Orientation,
+    Position,
+    Project,
+    ProjectConstant,
+    ProjectRobotJoints,
+    Scene,
+    SceneObject,
+)
+from arcor2.object_types.abstract import Generic
+from arcor2_arserver import globals as glob
+from arcor2_arserver import objects_actions
+from arcor2_arserver import project as proj
+from arcor2_arserver.object_types.data import ObjectTypeData
+from arcor2_arserver.rpc import project as rpc_proj
+from arcor2_arserver_data.objects import ObjectAction, ObjectTypeMeta
+
+
+class MyType(Generic):
+    pass
+
+
+@pytest.fixture()
+def checked(monkeypatch) -> Iterator[List[str]]:
+    """IDs of actions for which check_action_params was really called."""
+
+    glob.OBJECT_TYPES.clear()
+    glob.OBJECT_TYPES[MyType.__name__] = ObjectTypeData(
+        ObjectTypeMeta(MyType.__name__),
+        MyType,
+        {"act": ObjectAction("act"), "out": ObjectAction("out")},
+        cache_key=MyType.__name__,
+    )
+    objects_actions.object_types_changed()
+    proj._action_problems.clear()
+    rpc_proj.PROJECTS_INFO.clear()
+
+    calls: List[str] = []
+
+    def check_action_params(scene: CachedScene, project: CachedProject, action: Action, object_action) -> None:
+        calls.append(action.id)
+
+    monkeypatch.setattr(proj, "check_action_params", check_action_params)
+
+    yield calls
+
+    glob.OBJECT_TYPES.clear()
+    objects_actions.object_types_changed()
+    proj._action_problems.clear()
+    rpc_proj.PROJECTS_INFO.clear()
+
+
+def scene() -> Scene:
+    return Scene("s1", "s1", objects=[SceneObject("obj", "obj", MyType.__name__)])
+
+
+def project() -> Project:
+
+    project = Project("p1", "p1", "s1")
+    project.constants.append(ProjectConstant("c1", "c1", "integer", "1"))
+
+    ap = ActionPoint("ap1", "ap1", Position())
+    ap.orientations.append(NamedOrientation("o1", "o1", Orientation()))
+    ap.robot_joints.append(ProjectRobotJoints("j1", "j1", "robot", [Joint("j", 0.0)], True))
+
+    ap.actions.append(Action("a_out", "a_out", "obj/out", flows=[Flow(outputs=["res"])]))
+    ap.actions.append(
+        Action("a_const", "a_const", "obj/act", [ActionParameter("param", ActionParameter.TypeEnum.CONSTANT, "c1")])
+    )
+    ap.actions.append(
+        Action(
+            "a_link", "a_link", "obj/act", [ActionParameter("param", ActionParameter.TypeEnum.LINK, "a_out/default/0")]
+        )
+    )
+    ap.actions.append(Action("a_pose", "a_pose", "obj/act", [ActionParameter("param", "pose", json.dumps("o1"))]))
+    ap.actions.append(Action("a_joints", "a_joints", "obj/act", [ActionParameter("param", "joints", json.dumps("j1"))]))
+    project.action_points.append(ap)
+
+    return project
+
+
+ALL_ACTIONS = {"a_out", "a_const", "a_link", "a_pose", "a_joints"}
+
+
+def test_cached_result_reused(checked: List[str]) -> None:
+
+    cached_scene = CachedScene(scene())
+    cached_project = UpdateableCachedProject(project())
+
+    assert not proj.project_problems(cached_scene, cached_project)
+    assert set(checked) == ALL_ACTIONS
+
+    checked.clear()
+    assert not proj.project_problems(cached_scene, cached_project)
+    assert not checked
+
+    # an equal project (e.g. loaded again from the storage) is not checked again either
+    assert not proj.project_problems(CachedScene(scene()), UpdateableCachedProject(project()))
+    assert not checked
+
+
+def test_problem_is_remembered(checked: List[str], monkeypatch) -> None:
+    def check_action_params(scene: CachedScene, project: CachedProject, action: Action, object_action) -> None:
+        checked.append(action.id)
+        raise proj.Arcor2Exception(f"{action.id} is wrong.")
+
+    monkeypatch.setattr(proj, "check_action_params", check_action_params)
+
+    cached_scene = CachedScene(scene())
+    cached_project = UpdateableCachedProject(project())
+
+    problems = proj.project_problems(cached_scene, cached_project)
+    assert len(problems) == len(ALL_ACTIONS)
+
+    checked.clear()
+    assert proj.project_problems(cached_scene, cached_project) == problems
+    assert not checked
+
+
+def test_invalidated_by_constant(checked: List[str]) -> None:
+
+    cached_scene = CachedScene(scene())
+    cached_project = UpdateableCachedProject(project())
+    proj.project_problems(cached_scene, cached_project)
+    checked.clear()
+
+    cached_project.upsert_constant(ProjectConstant("c1", "c1", "integer", "2"))
+    proj.project_problems(cached_scene, cached_project)
+    assert checked == ["a_const"]
+
+
+def test_invalidated_by_orientation(checked: List[str]) -> None:
+
+    cached_scene = CachedScene(scene())
+    cached_project = UpdateableCachedProject(project())
+    proj.project_problems(cached_scene, cached_project)
+    checked.clear()
+
+    cached_project.update_orientation("o1", Orientation(0, 1, 0, 0))
+    proj.project_problems(cached_scene, cached_project)
+    assert checked == ["a_pose"]
+
+
+def test_invalidated_by_joints(checked: List[str]) -> None:
+
+    cached_scene = CachedScene(scene())
+    cached_project = UpdateableCachedProject(project())
+    proj.project_problems(cached_scene, cached_project)
+    checked.clear()
+
+    cached_project.update_joints("j1", [Joint("j", 1.0)])
+    proj.project_problems(cached_scene, cached_project)
+    assert checked == ["a_joints"]
+
+
+def test_invalidated_by_linked_flow(checked: List[str]) -> None:
+
+    cached_scene = CachedScene(scene())
+    cached_project = UpdateableCachedProject(project())
+    proj.project_problems(cached_scene, cached_project)
+    checked.clear()
+
+    cached_project.upsert_action("ap1", Action("a_out", "a_out", "obj/out", flows=[Flow(outputs=["other"])]))
+    proj.project_problems(cached_scene, cached_project)
+    assert checked == ["a_out", "a_link"]  # the modified action itself and the one linked to it
+
+
+def test_invalidated_by_object_types(checked: List[str]) -> None:
+
+    cached_scene = CachedScene(scene())
+    cached_project = UpdateableCachedProject(project())
+    proj.project_problems(cached_scene, cached_project)
+    checked.clear()
+
+    objects_actions.object_types_changed()
+    proj.project_problems(cached_scene, cached_project)
+    assert set(checked) == ALL_ACTIONS
+
+
+def test_project_info(checked: List[str], monkeypatch) -> None:
+
+    now = datetime.now(tz=timezone.utc)
+
+    stored_project = project()
+    stored_project.modified = now
+    stored_scene = scene()
+    stored_scene.modified = now
+
+    async def get_project(project_id: str) -> Project:
+        assert project_id == stored_project.id
+        return stored_project
+
+    async def get_scene(scene_id: str) -> Scene:
+        assert scene_id == stored_scene.id
+        return stored_scene
+
+    monkeypatch.setattr(rpc_proj.storage, "get_project", get_project)
+    monkeypatch.setattr(rpc_proj.storage, "get_scene", get_scene)
+
+    validations: List[str] = []
+
+    def project_problems(scene: CachedScene, project: CachedProject) -> List[str]:
+        validations.append(project.id)
+        return []
+
+    monkeypatch.setattr(rpc_proj, "project_problems", project_problems)
+
+    def project_info() -> rpc_proj.srpc.p.ListProjects.Response.Data:
+        scenes: Dict[str, CachedScene] = {}
+        return asyncio.run(rpc_proj.project_info(stored_project.id, asyncio.Lock(), scenes))
+
+    pd = project_info()
+    assert pd.valid
+    assert validations == ["p1"]
+
+    assert project_info() is pd
+    assert validations == ["p1"]
+
+    stored_project.modified = now + timedelta(seconds=1)
+    pd2 = project_info()
+    assert pd2 is not pd
+    assert validations == ["p1"] * 2
+    assert project_info() is pd2
+
+    stored_scene.modified = now + timedelta(seconds=1)
+    pd3 = project_info()
+    assert pd3 is not pd2
+    assert validations == ["p1"] * 3
+    assert project_info() is pd3
+
+    objects_actions.object_types_changed()
+    pd4 = project_info()
+    assert pd4 is not pd3
+    assert validations == ["p1"] * 4
+    assert project_info() is pd4
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_list_projects_cancels_remaining(monkeypatch, stream: bool) -> None:
+
+    cancelled: List[str] = []
+
+    async def get_projects() -> IdDescList:
+        return IdDescList([IdDesc("bad", "bad", None), IdDesc("slow1", "slow1", None), IdDesc("slow2", "slow2", None)])
+
+    async def project_info(
+        project_id: str, scenes_lock: asyncio.Lock, scenes: Dict[str, CachedScene], validate: bool = True
+    ) -> rpc_proj.srpc.p.ListProjects.Response.Data:
+
+        if project_id == "bad":
+            raise proj.Arcor2Exception("Failed to get the project.")
+
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(project_id)
+            raise
+
+        raise AssertionError("Should have been cancelled.")
+
+    monkeypatch.setattr(rpc_proj.storage, "get_projects", get_projects)
+    monkeypatch.setattr(rpc_proj, "project_info", project_info)
+
+    req = rpc_proj.srpc.p.ListProjects.Request(1, rpc_proj.srpc.p.ListProjects.Request.Args(stream=stream))
+
+    async def run() -> None:
+
+        with pytest.raises(proj.Arcor2Exception):
+            await rpc_proj.list_projects_cb(req, None)  # type: ignore
+
+        await asyncio.sleep(0)  # let the cancelled tasks finish
+        assert sorted(cancelled) == ["slow1", "slow2"]
+
+    asyncio.run(run())
@@ -0,0 +1,248 @@
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import List, Set
+
+import quaternion
+
+from arcor2.data.common import Joint, Orientation, Pose, Position
+from arcor2.data.serialization import to_json
+from arcor2.object_types.abstract import Robot
+from arcor2_arserver import globals as glob
+from arcor2_arserver import notifications as notif
+from arcor2_arserver import objects_actions  # noqa: F401 (has to be imported before robot due to a circular import)
+from arcor2_arserver.robot import (
+    STREAM_DECIMALS,
+    DeltaEncoder,
+    Frame,
+    RobotSampler,
+    _samplers,
+    eef_values,
+    joints_values,
+    remove_sampler,
+    remove_samplers,
+    sampler,
+)
+from arcor2_arserver.rpc import robot as rpc_robot
+from arcor2_arserver.rpc.robot import DELTA_ENCODERS, RegEnum, _eef_frame, _joints_frame, delta_stream
+from arcor2_arserver_data import rpc as srpc
+
+
+class MyRobot(Robot):
+    def __init__(self) -> None:
+        super().__init__("id", "name", Pose())
+        self.calls: Counter = Counter()
+
+    def get_end_effectors_ids(self) -> Set[str]:
+        self.calls["eefs"] += 1
+        return {"eef1", "eef2"}
+
+    def get_end_effector_pose(self, end_effector: str) -> Pose:
+        self.calls["pose"] += 1
+        return Pose()
+
+    def robot_joints(self) -> List[Joint]:
+        self.calls["joints"] += 1
+        return [Joint("j1", 0.0)]
+
+    def grippers(self) -> Set[str]:
+        return set()
+
+    def suctions(self) -> Set[str]:
+        return set()
+
+
+def test_sampler() -> None:
+
+    robot = MyRobot()
+    smp = RobotSampler(robot)
+
+    async def run() -> None:
+
+        state = await smp.sample()
+        assert state.joints == [Joint("j1", 0.0)]
+        assert state.eef_poses is not None
+        assert state.eef_poses.keys() == {"eef1", "eef2"}
+        assert robot.calls == {"eefs": 1, "pose": 2, "joints": 1}
+
+        # concurrent consumers share one snapshot
+        states = await asyncio.gather(*[smp.sample(max_age=10) for _ in range(5)])
+        assert all(st is state for st in states)
+        assert robot.calls == {"eefs": 1, "pose": 2, "joints": 1}
+
+        # missing part is sampled, end effectors are not obtained again
+        state = await smp.sample(joints=False, eef=True)
+        assert state.joints is None
+        state = await smp.sample(joints=True, eef=False, max_age=10)
+        assert state.joints is not None
+        assert robot.calls == {"eefs": 1, "pose": 4, "joints": 2}
+
+        # cached end effectors can't be modified by a consumer
+        assert isinstance(await smp.end_effectors(), frozenset)
+
+    asyncio.run(run())
+
+
+def test_samplers_pruned() -> None:
+
+    robot = MyRobot()
+    glob.SCENE_OBJECT_INSTANCES[robot.id] = robot
+
+    async def run() -> None:
+
+        smp = await sampler(robot.id)
+        assert await sampler(robot.id) is smp
+
+        remove_sampler(robot.id)
+        assert not _samplers
+        smp = await sampler(robot.id)
+        assert await sampler(robot.id) is smp
+
+        remove_samplers()
+        assert not _samplers
+
+    try:
+        asyncio.run(run())
+    finally:
+        glob.SCENE_OBJECT_INSTANCES.clear()
+        remove_samplers()
+
+
+def test_delta_encoder() -> None:
+
+    enc = DeltaEncoder(epsilon=0.01, keyframe_period=10)
+
+    frame = enc.encode({"j1": (0.0,), "j2": (0.0,), "j3": (0.0,)}, now=0)
+    assert frame is not None
+    assert (frame.seq, frame.base, frame.items) == (1, None, ["j1", "j2", "j3"])
+
+    # no significant change, nothing to send
+    assert enc.encode({"j1": (0.005,), "j2": (0.0,), "j3": (0.0,)}, now=1) is None
+
+    frame = enc.encode({"j1": (0.5,), "j2": (0.0,), "j3": (0.0,)}, now=2)
+    assert frame is not None
+    assert (frame.seq, frame.base, frame.items) == (2, 1, ["j1"])
+
+    assert enc.encode({"j1": (0.5,), "j2": (0.0,), "j3": (0.0,)}, now=3) is None
+
+    # delta is relative to the keyframe, not to the previous delta
+    frame = enc.encode({"j1": (0.5,), "j2": (0.1,), "j3": (0.0,)}, now=4)
+    assert frame is not None
+    assert (frame.seq, frame.base, frame.items) == (3, 1, ["j1", "j2"])
+
+    # everything changed - keyframe is not bigger than delta
+    frame = enc.encode({"j1": (0.5,), "j2": (0.1,), "j3": (0.1,)}, now=5)
+    assert frame is not None
+    assert (frame.seq, frame.base) == (4, None)
+
+    # periodic keyframe
+    frame = enc.encode({"j1": (0.5,), "j2": (0.1,), "j3": (0.1,)}, now=15)
+    assert frame is not None
+    assert (frame.seq, frame.base) == (5, None)
+
+    enc.request_keyframe()
+    frame = enc.encode({"j1": (0.5,), "j2": (0.1,), "j3": (0.1,)}, now=16)
+    assert frame is not None
+    assert (frame.seq, frame.base) == (6, None)
+
+
+def test_eef_frame_quantized() -> None:
+
+    ori = Orientation()
+    ori.set_from_quaternion(quaternion.from_euler_angles(0.3, -1.2, 2.1))
+    values = eef_values({"eef": Pose(Position(0.123456789, -1.0 / 3, 2.0 / 7), ori)})
+
+    evt = json.loads(to_json(_eef_frame("robot", values, Frame(1, None, ["eef"]))))
+    pose = evt["data"]["end_effectors"][0]["pose"]
+    serialized = [*pose["position"].values(), *pose["orientation"].values()]
+
+    assert serialized == [round(val, STREAM_DECIMALS) for val in values["eef"]]
+
+
+class Client:
+    def __init__(self) -> None:
+        self.frames: List[str] = []
+
+    async def send(self, data: str) -> None:
+        self.frames.append(data)
+
+
+def test_delta_stream_keyframes() -> None:
+
+    client = Client()
+    ui = client  # type: ignore
+    encoder = DELTA_ENCODERS[("robot", RegEnum.JOINTS, 1.0)] = DeltaEncoder(epsilon=0.01, keyframe_period=1000)
+
+    def stream(*vals: float) -> None:
+        joints = [Joint(f"j{idx}", val) for idx, val in enumerate(vals)]
+        delta_stream("robot", RegEnum.JOINTS, 1.0, {ui}, joints_values(joints), _joints_frame)
+
+    async def run() -> None:
+
+        glob.INTERFACES.add(ui)
+
+        try:
+            stream(0, 0)  # keyframe 1
+            stream(1, 0)  # delta 2, relative to keyframe 1
+            encoder.request_keyframe()
+            stream(1, 1)  # keyframe 3, delta 2 is obsolete
+
+            notif._queue(ui).max_size = 1
+            stream(1, 2)  # delta 4 is dropped rather than keyframe 3
+
+            await asyncio.sleep(0.1)
+        finally:
+            glob.INTERFACES.discard(ui)
+            notif.forget_interface(ui)
+            DELTA_ENCODERS.clear()
+
+    asyncio.run(run())
+
+    assert [(evt["data"]["seq"], evt["data"].get("base")) for evt in map(json.loads, client.frames)] == [(3, None)]
+
+
+def test_stream_rate(monkeypatch) -> None:
+    class TimedClient(Client):
+        def __init__(self) -> None:
+            super().__init__()
+            self.times: List[float] = []
+
+        async def send(self, data: str) -> None:
+            await super().send(data)
+            self.times.append(time.monotonic())
+
+    client = TimedClient()
+    ui = client  # type: ignore
+    robot = MyRobot()
+
+    monkeypatch.setattr(rpc_robot, "scene_started", lambda: True)
+
+    def request(send: bool) -> srpc.r.RegisterForRobotEvent.Request:
+        return srpc.r.RegisterForRobotEvent.Request(
+            1, srpc.r.RegisterForRobotEvent.Request.Args(robot.id, RegEnum.JOINTS, send, rate=30)
+        )
+
+    async def run() -> None:
+
+        glob.INTERFACES.add(ui)
+        glob.SCENE_OBJECT_INSTANCES[robot.id] = robot
+
+        try:
+            await rpc_robot.register(request(True), ui, glob.ROBOT_JOINTS_REGISTERED_UIS, glob.ROBOT_JOINTS_DELTA_UIS)
+            await asyncio.sleep(1)
+            superseded = notif._queue(ui).superseded
+            await rpc_robot.register(request(False), ui, glob.ROBOT_JOINTS_REGISTERED_UIS, glob.ROBOT_JOINTS_DELTA_UIS)
+        finally:
+            glob.INTERFACES.discard(ui)
+            notif.forget_interface(ui)
+            glob.SCENE_OBJECT_INSTANCES.clear()
+            remove_samplers()
+
+        # the stream is not limited by the rate of the event queue
+        assert all(json.loads(frame)["event"] == "RobotJoints" for frame in client.frames)
+        rate = (len(client.times) - 1) / (client.times[-1] - client.times[0])
+        assert rate > 28
+        assert superseded == 0
+
+    asyncio.run(run())
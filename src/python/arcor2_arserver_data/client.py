@@ -2,12 +2,13 @@ import json
 import time
 import uuid
 from queue import Empty, Queue
-from typing import Dict, Optional, Type, TypeVar
+from typing import Any, Dict, Optional, Type, TypeVar
 
 import websocket
 from dataclasses_jsonschema import ValidationError
 
 from arcor2.data import events, rpc
+from arcor2.data.serialization import ValidationMode, from_dict
 from arcor2.exceptions import Arcor2Exception
 from arcor2.logging import get_logger
 from arcor2_arserver_data import rpc as srpc
@@ -37,6 +38,8 @@ class ARServer:
         ws_connection_str: str = "ws://0.0.0.0:6789",
         timeout: float = 3.0,
         event_mapping: Optional[Dict[str, Type[events.Event]]] = None,
+        validation: ValidationMode = ValidationMode.FULL,
+        event_batching: bool = False,
     ):
 
         self._ws = websocket.WebSocket()
@@ -46,6 +49,7 @@ class ARServer:
             event_mapping = {}
 
         self.event_mapping = event_mapping
+        self.validation = validation
 
         start_time = time.monotonic()
         while time.monotonic() < start_time + timeout:
@@ -69,6 +73,10 @@ class ARServer:
 
         self._supported_rpcs = system_info.supported_rpc_requests
 
+        if event_batching and srpc.c.SetEventBatching.__name__ in self._supported_rpcs:
+            if not self._call_rpc(srpc.c.SetEventBatching.Request(uid()), srpc.c.SetEventBatching.Response).result:
+                raise ARServerClientException("Failed to enable batching of events.")
+
     def call_rpc(self, req: rpc.common.RPC.Request, resp_type: Type[RR]) -> RR:
 
         if req.request not in self._supported_rpcs:
@@ -83,17 +91,19 @@ class ARServer:
         # wait for RPC response, put any incoming event into the queue
         while True:
             try:
-                recv_dict = json.loads(self._ws.recv())
+                recv_dict = self._recv()
             except websocket.WebSocketTimeoutException:
                 raise ARServerClientException("RPC timeouted.")
 
-            if "response" in recv_dict:
+            if recv_dict is None:
+                continue
+            elif "response" in recv_dict:
                 break
             elif "event" in recv_dict:
-                self._event_queue.put(self.event_mapping[recv_dict["event"]].from_dict(recv_dict))
+                self._event_queue.put(from_dict(self.event_mapping[recv_dict["event"]], recv_dict, self.validation))
 
         try:
-            resp = resp_type.from_dict(recv_dict)
+            resp = from_dict(resp_type, recv_dict, self.validation)
         except ValidationError as e:
             self._logger.error(f"Request: {req.to_dict()}, response: {recv_dict}.")
             raise ARServerClientException("RPC response validation failed.") from e
@@ -109,23 +119,47 @@ class ARServer:
         :return:
         """
 
-        try:
-            evt = self._event_queue.get_nowait()
-        except Empty:
+        while True:
+
+            try:
+                evt = self._event_queue.get_nowait()
+                break
+            except Empty:
+                pass
+
             try:
-                recv_dict = json.loads(self._ws.recv())
+                recv_dict = self._recv()
             except websocket.WebSocketTimeoutException:
                 raise ARServerClientException("Timeouted.")
 
+            if recv_dict is None:
+                continue
+
             if "event" not in recv_dict:
                 raise ARServerClientException(f"Expected event, got: {recv_dict}")
-            evt = self.event_mapping[recv_dict["event"]].from_dict(recv_dict)
+            evt = from_dict(self.event_mapping[recv_dict["event"]], recv_dict, self.validation)
+            break
 
         if drop_everything_until and not isinstance(evt, drop_everything_until):
             return self.get_event(drop_everything_until)
 
         return evt
 
+    def _recv(self) -> Optional[Dict[str, Any]]:
+        """Receives one message.
+
+        :return: The message or None if it was a batch of events (those are put into the queue).
+        """
+
+        data = json.loads(self._ws.recv())
+
+        if isinstance(data, list):
+            for evt in data:
+                self._event_queue.put(from_dict(self.event_mapping[evt["event"]], evt, self.validation))
+            return None
+
+        return data
+
     def close(self) -> None:
         self._ws.close()
 
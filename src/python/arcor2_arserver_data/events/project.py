@@ -4,6 +4,7 @@ from dataclasses_jsonschema import JsonSchemaMixin
 
 from arcor2.data import common
 from arcor2.data.events import Event
+from arcor2_arserver_data.rpc.project import ListProjects
 
 
 @dataclass
@@ -22,6 +23,13 @@ class OpenProject(Event):
     data: Data
 
 
+@dataclass
+class ProjectListed(Event):
+    """Item of streamed ListProjects."""
+
+    data: ListProjects.Response.Data
+
+
 @dataclass
 class ProjectSaved(Event):
     pass
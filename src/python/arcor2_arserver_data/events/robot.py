@@ -12,7 +12,9 @@ class RobotJoints(Event):
     @dataclass
     class Data(JsonSchemaMixin):
         robot_id: str
-        joints: List[common.Joint]
+        joints: List[common.Joint]  # only changed joints when 'base' is set
+        seq: Optional[int] = None  # number of the frame (delta streams only)
+        base: Optional[int] = None  # seq of the keyframe that the delta is relative to
 
     data: Data
 
@@ -27,7 +29,9 @@ class RobotEef(Event):
             pose: common.Pose
 
         robot_id: str
-        end_effectors: List[EefPose] = field(default_factory=list)
+        end_effectors: List[EefPose] = field(default_factory=list)  # only changed ones when 'base' is set
+        seq: Optional[int] = None  # number of the frame (delta streams only)
+        base: Optional[int] = None  # seq of the keyframe that the delta is relative to
 
     data: Data
 
@@ -5,6 +5,7 @@ from dataclasses_jsonschema import JsonSchemaMixin
 
 from arcor2.data import common
 from arcor2.data.events import Event
+from arcor2_arserver_data.rpc.scene import ListScenes
 
 
 @dataclass
@@ -21,6 +22,13 @@ class SceneChanged(Event):
     data: common.BareScene
 
 
+@dataclass
+class SceneListed(Event):
+    """Item of streamed ListScenes."""
+
+    data: ListScenes.Response.Data
+
+
 @dataclass
 class SceneSaved(Event):
     pass
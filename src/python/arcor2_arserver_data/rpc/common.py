@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set
 
 from arcor2_calibration_data import MarkerCorners
 from dataclasses_jsonschema import JsonSchemaMixin
@@ -11,6 +11,27 @@ from arcor2.data.rpc.common import RPC
 # ----------------------------------------------------------------------------------------------------------------------
 
 
+@dataclass
+class ListArgs(JsonSchemaMixin):
+    """Common arguments of RPCs listing projects/scenes."""
+
+    cursor: Optional[str] = field(
+        default=None, metadata=dict(description="Listing continues after the item with this ID (see next_cursor).")
+    )
+    page_size: Optional[int] = field(
+        default=None, metadata=dict(description="Max. number of items. When not set, all items are listed.")
+    )
+    stream: bool = field(
+        default=False,
+        metadata=dict(
+            description="Items are sent as events as soon as they are ready, the response then has an empty list."
+        ),
+    )
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+
 class SystemInfo(RPC):
     @dataclass
     class Request(RPC.Request):
@@ -24,6 +45,10 @@ class SystemInfo(RPC):
             api_version: str
             supported_parameter_types: Set[str] = field(default_factory=set)
             supported_rpc_requests: Set[str] = field(default_factory=set)
+            robot_streams: Dict[str, Dict[str, float]] = field(
+                default_factory=dict,
+                metadata=dict(description="Statistics of schedulers of running robot streams (key: robot_id)."),
+            )
 
         data: Optional[Data] = None
 
@@ -31,6 +56,26 @@ class SystemInfo(RPC):
 # ----------------------------------------------------------------------------------------------------------------------
 
 
+class SetEventBatching(RPC):
+    """When enabled, events might be sent in batches (JSON array of events
+    in one frame)."""
+
+    @dataclass
+    class Request(RPC.Request):
+        @dataclass
+        class Args(JsonSchemaMixin):
+            enabled: bool = True
+
+        args: Args = field(default_factory=Args)
+
+    @dataclass
+    class Response(RPC.Response):
+        pass
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+
+
 class Calibration(RPC):
     @dataclass
     class Request(RPC.Request):
@@ -6,6 +6,7 @@ from dataclasses_jsonschema import JsonSchemaMixin
 
 from arcor2.data.common import ActionParameter, Flow, IdDesc, Joint, Orientation, Position, ProjectLogicIf
 from arcor2.data.rpc.common import RPC, IdArgs, RobotArg
+from arcor2_arserver_data.rpc.common import ListArgs
 
 
 class NewProject(RPC):
@@ -76,7 +77,13 @@ class OpenProject(RPC):
 class ListProjects(RPC):
     @dataclass
     class Request(RPC.Request):
-        pass
+        @dataclass
+        class Args(ListArgs):
+            validate: bool = field(
+                default=True, metadata=dict(description="When false, valid, executable and problems are not set.")
+            )
+
+        args: Args = field(default_factory=Args)
 
     @dataclass
     class Response(RPC.Response):
@@ -89,6 +96,9 @@ class ListProjects(RPC):
             modified: Optional[datetime] = None
 
         data: Optional[List[Data]] = None
+        next_cursor: Optional[str] = field(
+            default=None, metadata=dict(description="Cursor of the next page, not set for the last one.")
+        )
 
 
 # ----------------------------------------------------------------------------------------------------------------------
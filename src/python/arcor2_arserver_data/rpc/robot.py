@@ -119,6 +119,8 @@ class RegisterForRobotEvent(RPC):
             robot_id: str
             what: RegisterEnum
             send: bool
+            delta: bool = False  # send only changes (see 'seq' and 'base' of the events)
+            rate: Optional[float] = None  # requested rate of events (Hz), server's default when not set
 
         args: Args
 
@@ -6,6 +6,7 @@ from dataclasses_jsonschema import JsonSchemaMixin
 
 from arcor2.data.common import IdDesc, Parameter, Pose
 from arcor2.data.rpc.common import RPC, IdArgs
+from arcor2_arserver_data.rpc.common import ListArgs
 
 
 @dataclass
@@ -119,7 +120,13 @@ class OpenScene(RPC):
 class ListScenes(RPC):
     @dataclass
     class Request(RPC.Request):
-        pass
+        @dataclass
+        class Args(ListArgs):
+            modified: bool = field(
+                default=True, metadata=dict(description="When false, modified is not set (scenes are not loaded).")
+            )
+
+        args: Args = field(default_factory=Args)
 
     @dataclass
     class Response(RPC.Response):
@@ -128,6 +135,9 @@ class ListScenes(RPC):
             modified: Optional[datetime] = None
 
         data: Optional[List[Data]] = None
+        next_cursor: Optional[str] = field(
+            default=None, metadata=dict(description="Cursor of the next page, not set for the last one.")
+        )
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -6,7 +6,7 @@ import os
 import zipfile
 from datetime import datetime, timezone
 from io import BytesIO
-from typing import Set
+from typing import List, Set
 
 import humps
 from flask import request, send_file
@@ -32,29 +32,32 @@ logger = get_logger("Build")
 app = create_app(__name__)
 
 
-def get_base(
-    object_types: Set[str], written_types: Set[str], obj_type: ObjectType, zf: zipfile.ZipFile, ot_path: str
+def get_bases(
+    object_types: Set[str], written_types: Set[str], obj_types: List[ObjectType], zf: zipfile.ZipFile, ot_path: str
 ) -> None:
+    """Writes ancestors of given ObjectTypes. Each level of the inheritance
+    hierarchy is obtained using one (bulk) request."""
 
-    base = base_from_source(obj_type.source, obj_type.id)
+    while obj_types:
 
-    if not base:
-        return
+        bases: Set[str] = set()
 
-    if base in written_types:
-        return
+        for obj_type in obj_types:
 
-    if base not in object_types and base not in built_in_types_names():
+            base = base_from_source(obj_type.source, obj_type.id)
 
-        logger.debug(f"Getting {base} as base of {obj_type.id}.")
-        base_obj_type = ps.get_object_type(base)
+            if not base or base in written_types or base in object_types or base in built_in_types_names():
+                continue
 
-        zf.writestr(os.path.join(ot_path, humps.depascalize(base_obj_type.id)) + ".py", base_obj_type.source)
-        object_types.add(base)
-        written_types.add(base)
+            logger.debug(f"Getting {base} as base of {obj_type.id}.")
+            bases.add(base)
 
-        # try to get base of the base
-        get_base(object_types, written_types, base_obj_type, zf, ot_path)
+        obj_types = ps.get_object_types(bases)
+
+        for base_obj_type in obj_types:
+            zf.writestr(os.path.join(ot_path, humps.depascalize(base_obj_type.id)) + ".py", base_obj_type.source)
+            object_types.add(base_obj_type.id)
+            written_types.add(base_obj_type.id)
 
 
 def _publish(project_id: str, package_name: str) -> RespT:
@@ -80,21 +83,21 @@ def _publish(project_id: str, package_name: str) -> RespT:
             zf.writestr(os.path.join(data_path, "scene.json"), scene.to_json())
 
             obj_types = set(cached_scene.object_types)
-            obj_types_with_models: Set[str] = set()
             written_types: Set[str] = set()
 
-            for scene_obj in scene.objects:
-
-                if scene_obj.type in written_types:
-                    continue
+            logger.debug("Getting scene object types.")
+            scene_obj_types = ps.get_object_types(scene_obj.type for scene_obj in scene.objects)
 
-                logger.debug(f"Getting scene object type {scene_obj.type}.")
-                obj_type = ps.get_object_type(scene_obj.type)
+            logger.debug("Getting models.")
+            models = {
+                model.id: model
+                for model in ps.get_models(obj_type.model for obj_type in scene_obj_types if obj_type.model)
+            }
 
-                if obj_type.model and obj_type.id not in obj_types_with_models:
-                    obj_types_with_models.add(obj_type.id)
+            for obj_type in scene_obj_types:
 
-                    model = ps.get_model(obj_type.model.id, obj_type.model.type)
+                if obj_type.model:
+                    model = models[obj_type.model.id]
                     obj_model = ObjectModel(obj_type.model.type, **{model.type().value.lower(): model})  # type: ignore
 
                     zf.writestr(
@@ -102,10 +105,10 @@ def _publish(project_id: str, package_name: str) -> RespT:
                     )
 
                 zf.writestr(os.path.join(ot_path, humps.depascalize(obj_type.id)) + ".py", obj_type.source)
-                written_types.add(scene_obj.type)
+                written_types.add(obj_type.id)
 
-                # handle inheritance
-                get_base(obj_types, written_types, obj_type, zf, ot_path)
+            # handle inheritance
+            get_bases(obj_types, written_types, scene_obj_types, zf, ot_path)
 
         except Arcor2Exception as e:
             logger.exception("Failed to get something from the project service.")
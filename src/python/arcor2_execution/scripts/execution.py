@@ -13,7 +13,7 @@ import tempfile
 import time
 import zipfile
 from datetime import datetime, timezone
-from typing import Awaitable, List, Optional, Set, Union
+from typing import Dict, List, Optional, Union
 
 import websockets
 from aiologger.levels import LogLevel
@@ -27,6 +27,7 @@ from arcor2 import ws_server
 from arcor2.data import common, compile_json_schemas
 from arcor2.data import rpc as arcor2_rpc
 from arcor2.data.events import ActionState, CurrentAction, Event, PackageInfo, PackageState, ProjectException
+from arcor2.data.serialization import ValidationMode, from_dict, to_json, validation_mode
 from arcor2.exceptions import Arcor2Exception
 from arcor2.helpers import port_from_url
 from arcor2.logging import get_aiologger
@@ -47,12 +48,15 @@ ACTION_EVENT: Optional[ActionState] = None
 ACTION_ARGS_EVENT: Optional[CurrentAction] = None
 TASK = None
 
-CLIENTS: Set = set()
+CLIENTS: Dict[WsClient, ws_server.EventQueue] = {}
 
 MAIN_SCRIPT_NAME = "script.py"
 
 EVENT_MAPPING = {evt.__name__: evt for evt in EVENTS}
 
+# the main script is generated by us, so the events it prints out are not validated by default
+SCRIPT_VALIDATION = validation_mode("ARCOR2_EXECUTION_SCRIPT_VALIDATION", ValidationMode.TRUSTED)
+
 
 def process_running() -> bool:
 
@@ -105,7 +109,7 @@ async def read_proc_stdout() -> None:
             continue
 
         try:
-            evt = EVENT_MAPPING[data["event"]].from_dict(data)
+            evt = from_dict(EVENT_MAPPING[data["event"]], data, SCRIPT_VALIDATION)
         except ValidationError as e:
             logger.error("Invalid event: {}, error: {}".format(data, e))
             continue
@@ -395,28 +399,29 @@ async def _version_cb(req: arcor2_rpc.common.Version.Request, ui: WsClient) -> a
 
 
 async def send_to_clients(event: events.Event) -> None:
+    """Queues the event for all clients (each client has its own writer
+    task, so a slow one does not delay the others)."""
 
     if CLIENTS:
-        data = event.to_json()
-        await asyncio.wait([client.send(data) for client in CLIENTS])
+        data = to_json(event)
+        for queue in CLIENTS.values():
+            queue.put(data)
 
 
 async def register(websocket: WsClient) -> None:
 
     logger.info("Registering new client")
-    CLIENTS.add(websocket)
+    queue = CLIENTS[websocket] = ws_server.EventQueue(websocket, window=0, max_rate=None)
 
-    tasks: List[Awaitable] = [websocket.send(PACKAGE_STATE_EVENT.to_json())]
+    await queue.send_now(to_json(PACKAGE_STATE_EVENT))
 
     if PACKAGE_INFO_EVENT:
-        tasks.append(websocket.send(PACKAGE_INFO_EVENT.to_json()))
-
-    await asyncio.gather(*tasks)
+        await queue.send_now(to_json(PACKAGE_INFO_EVENT))
 
 
 async def unregister(websocket: WsClient) -> None:
     logger.info("Unregistering client")
-    CLIENTS.remove(websocket)
+    CLIENTS.pop(websocket).close()
 
 
 RPC_DICT: ws_server.RPC_DICT_TYPE = {
@@ -2,10 +2,11 @@
 
 import argparse
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Dict, List, Optional
 
 import humps
-from flask import jsonify, request
+from dataclasses_jsonschema import JsonSchemaMixin
+from flask import Response, jsonify, request
 
 from arcor2.data import common, object_type
 from arcor2.flask import RespT, create_app, run_app
@@ -22,6 +23,18 @@ CYLINDERS: Dict[str, object_type.Cylinder] = {}
 SPHERES: Dict[str, object_type.Sphere] = {}
 
 
+def conditional(obj: JsonSchemaMixin, modified: Optional[datetime] = None) -> Response:
+    """Response with validators (ETag, Last-Modified), answering conditional
+    requests with 304 Not Modified."""
+
+    resp = jsonify(obj.to_dict())
+    resp.add_etag()
+    if modified:
+        resp.last_modified = modified
+    resp.make_conditional(request)  # modifies the response in place
+    return resp
+
+
 @app.route("/project", methods=["PUT"])
 def put_project() -> RespT:
     """Add or update project.
@@ -72,7 +85,7 @@ def get_project(id: str) -> RespT:
     """
 
     try:
-        return jsonify(PROJECTS[id].to_dict())
+        return conditional(PROJECTS[id], PROJECTS[id].modified)
     except KeyError:
         return "Not found", 404
 
@@ -180,7 +193,7 @@ def get_scene(id: str) -> RespT:
     """
 
     try:
-        return jsonify(SCENES[id].to_dict())
+        return conditional(SCENES[id], SCENES[id].modified)
     except KeyError:
         return "Not found", 404
 
@@ -286,7 +299,7 @@ def get_object_type(id: str) -> RespT:
     """
 
     try:
-        return jsonify(OBJECT_TYPES[id].to_dict())
+        return conditional(OBJECT_TYPES[id])
     except KeyError:
         return "Not found", 404
 
@@ -344,6 +357,39 @@ def get_object_types() -> RespT:
     return jsonify(ret.to_dict())
 
 
+def _ids() -> List[str]:
+    return [id for id in request.args.get("ids", default="").split(",") if id]
+
+
+@app.route("/bulk/object_types", methods=["GET"])
+def get_object_types_bulk() -> RespT:
+    """Gets many object types at once.
+    ---
+    get:
+        tags:
+        - ObjectType
+        summary: Gets object types by their ids, unknown ids are skipped.
+        parameters:
+            - name: ids
+              in: query
+              description: comma-separated IDs
+              required: true
+              schema:
+                type: string
+        responses:
+            '200':
+              description: Success
+              content:
+                application/json:
+                  schema:
+                    type: array
+                    items:
+                      $ref: ObjectType
+    """
+
+    return jsonify([OBJECT_TYPES[id].to_dict() for id in _ids() if id in OBJECT_TYPES])
+
+
 @app.route("/models/box", methods=["PUT"])
 def put_box() -> RespT:
     """Add or update box.
@@ -393,7 +439,7 @@ def get_box(id: str) -> RespT:
     """
 
     try:
-        return jsonify(BOXES[id].to_dict())
+        return conditional(BOXES[id])
     except KeyError:
         return "Not found", 404
 
@@ -446,7 +492,7 @@ def get_cylinder(id: str) -> RespT:
     """
 
     try:
-        return jsonify(CYLINDERS[id].to_dict())
+        return conditional(CYLINDERS[id])
     except KeyError:
         return "Not found", 404
 
@@ -499,7 +545,7 @@ def get_sphere(id: str) -> RespT:
     """
 
     try:
-        return jsonify(SPHERES[id].to_dict())
+        return conditional(SPHERES[id])
     except KeyError:
         return "Not found", 404
 
@@ -538,6 +584,45 @@ def delete_model(id: str) -> RespT:
     return "ok", 200
 
 
+@app.route("/bulk/models", methods=["GET"])
+def get_models_bulk() -> RespT:
+    """Gets many models at once.
+    ---
+    get:
+        tags:
+            - Models
+        summary: Gets models by their ids, unknown ids are skipped.
+        parameters:
+            - name: ids
+              in: query
+              description: comma-separated IDs
+              required: true
+              schema:
+                type: string
+        responses:
+            200:
+              description: Ok
+              content:
+                application/json:
+                    schema:
+                        type: array
+                        items:
+                            $ref: ObjectModel
+    """
+
+    ret: List[object_type.ObjectModel] = []
+
+    for id in _ids():
+        if id in BOXES:
+            ret.append(object_type.ObjectModel(object_type.Model3dType.BOX, box=BOXES[id]))
+        elif id in CYLINDERS:
+            ret.append(object_type.ObjectModel(object_type.Model3dType.CYLINDER, cylinder=CYLINDERS[id]))
+        elif id in SPHERES:
+            ret.append(object_type.ObjectModel(object_type.Model3dType.SPHERE, sphere=SPHERES[id]))
+
+    return jsonify([obj_model.to_dict() for obj_model in ret])
+
+
 def main() -> None:
 
     parser = argparse.ArgumentParser(description=PROJECT_SERVICE_NAME)
@@ -558,6 +643,7 @@ def main() -> None:
             object_type.Box,
             object_type.Cylinder,
             object_type.Sphere,
+            object_type.ObjectModel,
         ],
         args.swagger,
     )